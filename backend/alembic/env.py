@@ -7,18 +7,21 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# Add your app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+# Make the backend directory (which holds the app package) importable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Import your Base and models
+from app.core.config import settings
 from app.core.database import Base
-from app.models.user import User
-from app.models.school import School, TrainingSession
+from app import models  # noqa: F401  (registers every table on Base)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the database the app uses; ConfigParser needs "%" escaped
+config.set_main_option("sqlalchemy.url", settings.DB_URL.replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
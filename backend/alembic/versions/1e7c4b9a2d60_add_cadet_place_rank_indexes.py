@@ -0,0 +1,42 @@
+"""Add cadet list indexes for a place and rank filter together
+
+Revision ID: 1e7c4b9a2d60
+Revises: f6c2a8d1e4b9
+Create Date: 2026-10-19 10:12:48.206415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e7c4b9a2d60'
+down_revision: Union[str, Sequence[str], None] = 'f6c2a8d1e4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (district or school_id, rank, sort) for GET /cadets with both filters;
+# see app.models.cadet.cadet_list_indexes
+LIST_INDEXES = [
+    ('ix_cadets_district_rank_cadet_number', ('district', 'rank', 'cadet_number')),
+    ('ix_cadets_district_rank_full_name_en', ('district', 'rank', 'full_name_en')),
+    ('ix_cadets_district_rank_gender', ('district', 'rank', 'gender')),
+    ('ix_cadets_district_rank_school_id', ('district', 'rank', 'school_id')),
+    ('ix_cadets_school_id_rank_cadet_number', ('school_id', 'rank', 'cadet_number')),
+    ('ix_cadets_school_id_rank_full_name_en', ('school_id', 'rank', 'full_name_en')),
+    ('ix_cadets_school_id_rank_gender', ('school_id', 'rank', 'gender')),
+    ('ix_cadets_school_id_rank_district', ('school_id', 'rank', 'district')),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in LIST_INDEXES:
+        op.create_index(name, 'cadets', list(columns), unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(LIST_INDEXES):
+        op.drop_index(name, table_name='cadets')
@@ -0,0 +1,38 @@
+"""Add school_stats summary table
+
+Revision ID: 3f1a7c2d9b41
+Revises: 9c164d20ec87
+Create Date: 2026-10-17 10:12:04.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a7c2d9b41'
+down_revision: Union[str, Sequence[str], None] = '9c164d20ec87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'school_stats',
+        sa.Column('district', sa.String(length=100), nullable=False),
+        sa.Column('total_schools', sa.Integer(), nullable=False),
+        sa.Column('active_schools', sa.Integer(), nullable=False),
+        sa.Column('total_sessions', sa.Integer(), nullable=False),
+        sa.Column('districts_covered', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('district')
+    )
+    # Populate with: python manage.py rebuild-stats
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('school_stats')
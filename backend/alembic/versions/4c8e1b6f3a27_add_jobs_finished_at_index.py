@@ -0,0 +1,27 @@
+"""Add jobs finished_at index for expiring finished jobs
+
+Revision ID: 4c8e1b6f3a27
+Revises: 7a9d3f5b2e18
+Create Date: 2026-10-19 17:48:21.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1b6f3a27'
+down_revision: Union[str, Sequence[str], None] = '7a9d3f5b2e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_jobs_finished_at', 'jobs', ['finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_finished_at', table_name='jobs')
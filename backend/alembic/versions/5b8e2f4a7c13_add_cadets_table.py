@@ -0,0 +1,92 @@
+"""Add cadets table with list-query indexes
+
+Revision ID: 5b8e2f4a7c13
+Revises: 3f1a7c2d9b41
+Create Date: 2026-10-18 09:41:27.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f4a7c13'
+down_revision: Union[str, Sequence[str], None] = '3f1a7c2d9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One index per supported GET /cadets sort, and per (filter, sort) pair;
+# see app.models.cadet.cadet_list_indexes
+LIST_INDEXES = [
+    ('ix_cadets_full_name_en', ('full_name_en',)),
+    ('ix_cadets_rank', ('rank',)),
+    ('ix_cadets_gender', ('gender',)),
+    ('ix_cadets_school_id', ('school_id',)),
+    ('ix_cadets_district', ('district',)),
+    ('ix_cadets_district_cadet_number', ('district', 'cadet_number')),
+    ('ix_cadets_district_full_name_en', ('district', 'full_name_en')),
+    ('ix_cadets_district_rank', ('district', 'rank')),
+    ('ix_cadets_district_gender', ('district', 'gender')),
+    ('ix_cadets_district_school_id', ('district', 'school_id')),
+    ('ix_cadets_rank_cadet_number', ('rank', 'cadet_number')),
+    ('ix_cadets_rank_full_name_en', ('rank', 'full_name_en')),
+    ('ix_cadets_rank_gender', ('rank', 'gender')),
+    ('ix_cadets_rank_school_id', ('rank', 'school_id')),
+    ('ix_cadets_rank_district', ('rank', 'district')),
+    ('ix_cadets_school_id_cadet_number', ('school_id', 'cadet_number')),
+    ('ix_cadets_school_id_full_name_en', ('school_id', 'full_name_en')),
+    ('ix_cadets_school_id_rank', ('school_id', 'rank')),
+    ('ix_cadets_school_id_gender', ('school_id', 'gender')),
+    ('ix_cadets_school_id_district', ('school_id', 'district')),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cadets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cadet_number', sa.String(length=50), nullable=False),
+        sa.Column('full_name_en', sa.String(length=150), nullable=False),
+        sa.Column('full_name_np', sa.String(length=150), nullable=True),
+        sa.Column('rank', sa.String(length=50), nullable=False),
+        sa.Column('gender', sa.String(length=10), nullable=False),
+        sa.Column('phone', sa.String(length=30), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('district', sa.String(length=100), nullable=False),
+        sa.Column('school_id', sa.Integer(), nullable=False),
+        sa.Column('training_session_id', sa.Integer(), nullable=True),
+        sa.Column('passout_year', sa.Integer(), nullable=True),
+        sa.Column('guardian_name', sa.String(length=100), nullable=True),
+        sa.Column('guardian_contact', sa.String(length=30), nullable=True),
+        sa.Column('relation', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ),
+        sa.ForeignKeyConstraint(['training_session_id'], ['training_sessions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cadets_id'), 'cadets', ['id'], unique=False)
+    op.create_index(op.f('ix_cadets_cadet_number'), 'cadets', ['cadet_number'], unique=True)
+    op.create_index(op.f('ix_cadets_training_session_id'), 'cadets', ['training_session_id'], unique=False)
+    for name, columns in LIST_INDEXES:
+        op.create_index(name, 'cadets', list(columns), unique=False)
+
+    op.add_column(
+        'school_stats',
+        sa.Column('total_cadets', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('school_stats', 'total_cadets')
+    for name, _ in reversed(LIST_INDEXES):
+        op.drop_index(name, table_name='cadets')
+    op.drop_index(op.f('ix_cadets_training_session_id'), table_name='cadets')
+    op.drop_index(op.f('ix_cadets_cadet_number'), table_name='cadets')
+    op.drop_index(op.f('ix_cadets_id'), table_name='cadets')
+    op.drop_table('cadets')
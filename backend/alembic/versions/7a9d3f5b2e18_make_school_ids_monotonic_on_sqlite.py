@@ -0,0 +1,50 @@
+"""Make school and training session ids monotonic (SQLite only)
+
+Revision ID: 7a9d3f5b2e18
+Revises: 1e7c4b9a2d60
+Create Date: 2026-10-19 15:37:04.518327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a9d3f5b2e18'
+down_revision: Union[str, Sequence[str], None] = '1e7c4b9a2d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Live table -> archive table that keeps its ids
+ARCHIVED_TABLES = [
+    ('schools', 'schools_archive'),
+    ('training_sessions', 'training_sessions_archive'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # AUTO_INCREMENT elsewhere already never reuses an id
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, archive in ARCHIVED_TABLES:
+        # SQLite cannot add AUTOINCREMENT in place
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        # Start past the ids already archived, not just past the live ones
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) "
+            f"SELECT '{table}', COALESCE(MAX(id), 0) "
+            f"FROM (SELECT id FROM {table} UNION ALL SELECT id FROM {archive})"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, _ in reversed(ARCHIVED_TABLES):
+        with op.batch_alter_table(table, recreate='always'):
+            pass
@@ -0,0 +1,37 @@
+"""Add ngram FULLTEXT index for school search (MySQL only)
+
+Revision ID: 8d2c6e1f0a57
+Revises: 5b8e2f4a7c13
+Create Date: 2026-10-18 11:05:52.240913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2c6e1f0a57'
+down_revision: Union[str, Sequence[str], None] = '5b8e2f4a7c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ['name', 'principal_name', 'area_name', 'municipality']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other backends search through the in-process trigram index instead
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.create_index(
+        'ft_schools_search', 'schools', SEARCH_COLUMNS, unique=False,
+        mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_schools_search', table_name='schools')
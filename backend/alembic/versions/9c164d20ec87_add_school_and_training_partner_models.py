@@ -1,5 +1,7 @@
 """Add school and training partner models
 
+Baseline schema: users, schools and training_sessions.
+
 Revision ID: 9c164d20ec87
 Revises: 
 Create Date: 2025-09-03 10:55:56.876513
@@ -20,13 +22,75 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cadet_number', sa.String(length=50), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('contact_number', sa.String(length=30), nullable=True),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('district', sa.String(length=100), nullable=True),
+        sa.Column('role', sa.String(length=50), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cadet_number', name='uq_users_cadet_number'),
+        sa.UniqueConstraint('username', name='uq_users_username'),
+        sa.UniqueConstraint('email', name='uq_users_email')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_cadet_number'), 'users', ['cadet_number'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+
+    op.create_table(
+        'schools',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('district', sa.String(length=100), nullable=False),
+        sa.Column('municipality', sa.String(length=100), nullable=False),
+        sa.Column('ward_number', sa.Integer(), nullable=False),
+        sa.Column('area_name', sa.String(length=100), nullable=True),
+        sa.Column('official_email', sa.String(length=255), nullable=True),
+        sa.Column('phone_number', sa.String(length=20), nullable=False),
+        sa.Column('website', sa.String(length=255), nullable=True),
+        sa.Column('principal_name', sa.String(length=100), nullable=False),
+        sa.Column('principal_contact', sa.String(length=20), nullable=False),
+        sa.Column('teacher_name', sa.String(length=100), nullable=True),
+        sa.Column('teacher_contact', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_schools_id'), 'schools', ['id'], unique=False)
+    op.create_index(op.f('ix_schools_name'), 'schools', ['name'], unique=True)
+
+    op.create_table(
+        'training_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('school_id', sa.Integer(), nullable=True),
+        sa.Column('ncc_batch', sa.String(length=100), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('passout_date', sa.Date(), nullable=True),
+        sa.Column('division', sa.String(length=10), nullable=False),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_training_sessions_id'), 'training_sessions', ['id'], unique=False)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_index(op.f('ix_training_sessions_id'), table_name='training_sessions')
+    op.drop_table('training_sessions')
+    op.drop_index(op.f('ix_schools_name'), table_name='schools')
+    op.drop_index(op.f('ix_schools_id'), table_name='schools')
+    op.drop_table('schools')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_cadet_number'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
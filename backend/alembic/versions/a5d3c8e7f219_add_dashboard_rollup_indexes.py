@@ -0,0 +1,45 @@
+"""Add covering indexes for dashboard rollups
+
+Revision ID: a5d3c8e7f219
+Revises: e2a8f5c1d934
+Create Date: 2026-10-18 18:40:12.550918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d3c8e7f219'
+down_revision: Union[str, Sequence[str], None] = 'e2a8f5c1d934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every column the GET /dashboard/rollups GROUP BYs read, so they scan indexes only
+ROLLUP_INDEXES = [
+    ('ix_schools_district_municipality', 'schools', ['district', 'municipality', 'is_active']),
+    ('ix_training_sessions_school_rollup', 'training_sessions', ['school_id', 'ncc_batch', 'start_date', 'division']),
+    ('ix_training_sessions_batch_rollup', 'training_sessions', ['ncc_batch', 'start_date', 'division']),
+]
+# Left prefixes of the rollup indexes, which serve their lookups (and the school_id foreign key) too
+REPLACED_INDEXES = [
+    ('ix_training_sessions_school_id', 'training_sessions', ['school_id']),
+    ('ix_training_sessions_ncc_batch', 'training_sessions', ['ncc_batch']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in ROLLUP_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in REPLACED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REPLACED_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(ROLLUP_INDEXES):
+        op.drop_index(name, table_name=table)
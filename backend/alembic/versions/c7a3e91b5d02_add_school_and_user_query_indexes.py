@@ -0,0 +1,42 @@
+"""Add indexes for school, training session and user queries
+
+Revision ID: c7a3e91b5d02
+Revises: 8d2c6e1f0a57
+Create Date: 2026-10-18 14:22:09.631540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e91b5d02'
+down_revision: Union[str, Sequence[str], None] = '8d2c6e1f0a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# School listings filter by district and is_active, sessions are read per
+# school and matched by batch, users are listed by district and role
+QUERY_INDEXES = [
+    ('ix_schools_district_is_active', 'schools', ['district', 'is_active']),
+    ('ix_training_sessions_school_id', 'training_sessions', ['school_id']),
+    ('ix_training_sessions_ncc_batch', 'training_sessions', ['ncc_batch']),
+    ('ix_users_district_role', 'users', ['district', 'role']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in QUERY_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'mysql':
+        # InnoDB dropped its implicit index for the school_id foreign key when
+        # ix_training_sessions_school_id took over; the key needs one back
+        op.create_index('school_id', 'training_sessions', ['school_id'], unique=False)
+    for name, table, columns in reversed(QUERY_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,59 @@
+"""Add districts and municipalities reference tables
+
+Revision ID: d4b7e2a9c8f1
+Revises: b8f1d4e6a3c5
+Create Date: 2026-10-18 22:03:51.904417
+
+Seeds the twelve districts of Lumbini Province. Then run
+`python manage.py sync-geo` to normalize existing district and municipality
+names to them and register the municipalities already in use.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e2a9c8f1'
+down_revision: Union[str, Sequence[str], None] = 'b8f1d4e6a3c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LUMBINI_DISTRICTS = [
+    'Arghakhanchi', 'Banke', 'Bardiya', 'Dang', 'Eastern Rukum', 'Gulmi',
+    'Kapilvastu', 'Palpa', 'Parasi', 'Pyuthan', 'Rolpa', 'Rupandehi',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    districts = op.create_table(
+        'districts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('province', sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_districts_id', 'districts', ['id'])
+    op.create_table(
+        'municipalities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('district_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('ward_count', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['district_id'], ['districts.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('district_id', 'name', name='uq_municipalities_district_name')
+    )
+    op.create_index('ix_municipalities_id', 'municipalities', ['id'])
+    op.bulk_insert(districts, [{'name': name, 'province': 'Lumbini'} for name in LUMBINI_DISTRICTS])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_municipalities_id', table_name='municipalities')
+    op.drop_table('municipalities')
+    op.drop_index('ix_districts_id', table_name='districts')
+    op.drop_table('districts')
@@ -0,0 +1,72 @@
+"""Add archive tables for inactive schools; index live listings by is_active
+
+Revision ID: f6c2a8d1e4b9
+Revises: d4b7e2a9c8f1
+Create Date: 2026-10-18 23:26:14.730952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2a8d1e4b9'
+down_revision: Union[str, Sequence[str], None] = 'd4b7e2a9c8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'schools_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('district', sa.String(length=100), nullable=False),
+        sa.Column('municipality', sa.String(length=100), nullable=False),
+        sa.Column('ward_number', sa.Integer(), nullable=False),
+        sa.Column('area_name', sa.String(length=100), nullable=True),
+        sa.Column('official_email', sa.String(length=255), nullable=True),
+        sa.Column('phone_number', sa.String(length=20), nullable=False),
+        sa.Column('website', sa.String(length=255), nullable=True),
+        sa.Column('principal_name', sa.String(length=100), nullable=False),
+        sa.Column('principal_contact', sa.String(length=20), nullable=False),
+        sa.Column('teacher_name', sa.String(length=100), nullable=True),
+        sa.Column('teacher_contact', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_schools_archive_district', 'schools_archive', ['district'])
+    op.create_table(
+        'training_sessions_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('school_id', sa.Integer(), nullable=True),
+        sa.Column('ncc_batch', sa.String(length=100), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('passout_date', sa.Date(), nullable=True),
+        sa.Column('division', sa.String(length=10), nullable=False),
+        sa.ForeignKeyConstraint(['school_id'], ['schools_archive.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_training_sessions_archive_school_id', 'training_sessions_archive', ['school_id'])
+
+    # Live listings filter is_active = true alone or with a district; district-only
+    # filters are served by ix_schools_district_municipality
+    op.create_index('ix_schools_is_active_district', 'schools', ['is_active', 'district'])
+    op.drop_index('ix_schools_district_is_active', table_name='schools')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_schools_district_is_active', 'schools', ['district', 'is_active'])
+    op.drop_index('ix_schools_is_active_district', table_name='schools')
+    op.drop_index('ix_training_sessions_archive_school_id', table_name='training_sessions_archive')
+    op.drop_table('training_sessions_archive')
+    op.drop_index('ix_schools_archive_district', table_name='schools_archive')
+    op.drop_table('schools_archive')
@@ -1,14 +1,377 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import time
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager
+from typing import Optional, Tuple
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.read_your_writes import wrote_recently
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sync driver -> async driver used when ASYNC_DB_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def pool_options(url) -> dict:
+    """Pool sizing from Settings. SQLite uses its own pool classes, so it is left alone."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def async_url(url, override: str = settings.ASYNC_DB_URL):
+    if override:
+        return override
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+engine = create_engine(settings.DB_URL, pool_pre_ping=True, **pool_options(settings.DB_URL))
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_MODE == "async":
+    async_engine = create_async_engine(
+        async_url(settings.DB_URL), pool_pre_ping=True, **pool_options(settings.DB_URL)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+class Replica:
+    """One read replica: engine and session factory for the configured DB_MODE."""
+
+    def __init__(self, url: str):
+        self.url = url
+        if settings.DB_MODE == "async":
+            self.engine = create_async_engine(async_url(url, override=""), pool_pre_ping=True, **pool_options(url))
+            self.sessionmaker = async_sessionmaker(
+                self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+            sync_engine = self.engine.sync_engine
+        else:
+            self.engine = sync_engine = create_engine(url, pool_pre_ping=True, **pool_options(url))
+            self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
+        self.healthy = True
+        self.checked_at = 0.0
+        event.listen(sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # A lost connection takes the replica out of rotation until the next probe
+        if context.is_disconnect:
+            self.healthy = False
+
+    def _probe_sync(self):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    async def probe(self) -> bool:
+        self.checked_at = time.monotonic()
+        try:
+            if settings.DB_MODE == "async":
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            else:
+                await run_in_threadpool(self._probe_sync)
+            self.healthy = True
+        except Exception:
+            self.healthy = False
+        return self.healthy
+
+    def session(self):
+        if settings.DB_MODE == "async":
+            return self.sessionmaker()
+        return ThreadedSession(self.sessionmaker())
+
+    def status(self) -> dict:
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "healthy": self.healthy,
+        }
+
+
+class ReplicaSet:
+    """
+    Round-robin over healthy replicas. Each replica is probed with SELECT 1
+    when its last check is older than `check_interval`, inline on the
+    request that picks it; unhealthy replicas are skipped in between.
+    """
+
+    def __init__(self, urls, check_interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.check_interval = check_interval
+        self._turn = itertools.count()
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    async def pick(self) -> Optional[Replica]:
+        """A healthy replica, or None when all are down (reads then use the primary)."""
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turn) % len(self.replicas)]
+            if now - replica.checked_at >= self.check_interval:
+                await replica.probe()
+            if replica.healthy:
+                return replica
+        return None
+
+    def status(self) -> list:
+        return [replica.status() for replica in self.replicas]
+
+
+read_replicas = ReplicaSet(settings.DB_READ_URLS, settings.DB_REPLICA_CHECK_INTERVAL)
+
+
+class ThreadedSession:
+    """
+    AsyncSession-compatible facade over a sync Session (DB_MODE=sync).
+    Every database call runs in the threadpool, so routers are written once
+    against the AsyncSession API and both drivers can be benchmarked.
+    """
+
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, *args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.flush, *args, **kwargs)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def stream(self, statement, *args, **kwargs):
+        statement = statement.execution_options(stream_results=True)
+        result = await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+        return ThreadedResult(result)
+
+
+class ThreadedResult:
+    """Server-side cursor result for ThreadedSession.stream(); fetches happen in the threadpool."""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size=None):
+        parts = self._result.partitions(size)
+        while True:
+            part = await run_in_threadpool(next, parts, None)
+            if part is None:
+                break
+            yield part
+
+    async def close(self):
+        await run_in_threadpool(self._result.close)
+
+
+@asynccontextmanager
+async def open_session(read_only: bool = False):
+    """
+    Session for the configured DB_MODE. Use directly when the session must
+    outlive the request dependency, e.g. inside a streaming response body.
+    `read_only` sessions go to a read replica when one is configured and up.
+    """
+    replica = await read_replicas.pick() if read_only and read_replicas else None
+    if replica is not None:
+        db = replica.session()
+    elif AsyncSessionLocal is not None:
+        db = AsyncSessionLocal()
+    else:
+        db = ThreadedSession(SessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db():
+    async with open_session() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """
+    Session for handlers that only read. Uses a replica (see DB_READ_URLS),
+    except for clients that wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    async with open_session(read_only=not wrote_recently(request)) as db:
+        yield db
+
+
+# --- Process lifecycle (called from the lifespan in app.main) ---
+
+def _engines() -> list:
+    """Every engine of this process; AsyncEngines as such, so their dispose is awaited."""
+    engines = [engine]
+    if async_engine is not None:
+        engines.append(async_engine)
+    engines.extend(replica.engine for replica in read_replicas.replicas)
+    return engines
+
+
+async def _dispose(target, close: bool) -> None:
+    if isinstance(target, AsyncEngine):
+        await target.dispose(close=close)
+    else:
+        await run_in_threadpool(target.dispose, close)
+
+
+async def reset_pools() -> None:
+    """
+    Forget pooled connections inherited from a parent process, without
+    closing them (they belong to the parent). Engines are built at import
+    but connect lazily, so this only matters when the app is imported
+    before forking (gunicorn preload_app); each worker then starts with
+    empty pools of its own.
+    """
+    for target in _engines():
+        await _dispose(target, close=False)
+
+
+async def dispose_pools() -> None:
+    """Close every pooled connection; the last step of shutdown."""
+    for target in _engines():
+        await _dispose(target, close=True)
+
+
+def _request_engine():
+    """The primary engine whose pool serves requests in this DB_MODE."""
+    return async_engine if async_engine is not None else engine
+
+
+def pool_capacity() -> Optional[int]:
+    """Connections the primary pool may open, or None for SQLite's own pool classes."""
+    if not pool_options(settings.DB_URL):
+        return None
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def threadpool_tokens() -> Optional[int]:
+    """
+    Size for the anyio threadpool, or None to keep its default (40).
+    In DB_MODE=sync every query runs on a pool thread, so more threads than
+    connections would only move the queue into the pool, where requests
+    fail after DB_POOL_TIMEOUT; with one token per connection they wait
+    for a thread instead. THREADPOOL_TOKENS overrides.
+    """
+    if settings.THREADPOOL_TOKENS > 0:
+        return settings.THREADPOOL_TOKENS
+    if settings.DB_MODE == "sync":
+        return pool_capacity()
+    return None
+
+
+async def prewarm_pool(count: int) -> int:
+    """
+    Open `count` primary connections (held together, so the pool keeps that
+    many distinct ones) and return them to the pool, so the first requests
+    do not pay for connection setup. Returns the number opened.
+    """
+    count = min(count, settings.DB_POOL_SIZE) if pool_options(settings.DB_URL) else min(count, 1)
+    if count <= 0:
+        return 0
+    target = _request_engine()
+    if isinstance(target, AsyncEngine):
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                connection = await stack.enter_async_context(target.connect())
+                await connection.execute(text("SELECT 1"))
+        return count
+
+    def warm():
+        with ExitStack() as stack:
+            for _ in range(count):
+                stack.enter_context(target.connect()).execute(text("SELECT 1"))
+    await run_in_threadpool(warm)
+    return count
+
+
+def pool_status() -> dict:
+    """Checked-in/out and overflow counts of the primary pool (what its class reports)."""
+    pool = _request_engine().pool
+    status = {"class": type(pool).__name__, "capacity": pool_capacity()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
+
+
+async def check_ready(timeout: float) -> Tuple[bool, dict]:
+    """
+    (ready, details) for /health/ready: the primary pool is not exhausted
+    and a connection answers SELECT 1 within `timeout` seconds.
+    """
+    status = pool_status()
+    capacity = status["capacity"]
+    if capacity is not None and status.get("checkedout", 0) >= capacity:
+        return False, {"pool": status, "error": "connection pool exhausted"}
+
+    target = _request_engine()
+
+    async def ping():
+        if isinstance(target, AsyncEngine):
+            async with target.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        else:
+            def ping_sync():
+                with target.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            await run_in_threadpool(ping_sync)
+
+    try:
+        await asyncio.wait_for(ping(), timeout)
+    except asyncio.TimeoutError:
+        return False, {"pool": status, "error": f"no connection within {timeout}s"}
+    except Exception as exc:
+        return False, {"pool": status, "error": type(exc).__name__}
+    return True, {"pool": status}
@@ -0,0 +1,173 @@
+"""
+Per-request instrumentation: latency, in-flight requests, and the SQL each
+request issues.
+
+MetricsMiddleware labels everything with the route template matching the
+path (e.g. /schools/{school_id}), so series stay bounded; paths matching
+no route share the "unmatched" label. SQLAlchemy cursor hooks attribute
+statement count and database time to the request running in the current
+context; this works for the async engine (greenlets inherit the task's
+context) and for DB_MODE=sync (the threadpool copies it).
+
+With N_PLUS_ONE_THRESHOLD > 0, a request that runs the same statement
+more than that many times is logged and counted, which is how N+1 loading
+shows up.
+"""
+import logging
+import time
+from collections import Counter as Tally
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import compile_path
+
+from app.core.config import settings
+from app.core.metrics import COUNT_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = registry.counter(
+    "http_requests_total", "Requests handled, by route and status.", ("method", "route", "status")
+)
+LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time until the response was fully sent.", ("method", "route")
+)
+IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled.", ("method", "route")
+)
+DB_STATEMENTS = registry.histogram(
+    "db_statements_per_request", "SQL statements executed per request.", ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+DB_TIME = registry.histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per request.", ("method", "route")
+)
+DB_UNATTRIBUTED = registry.counter(
+    "db_statements_outside_request_total", "SQL statements executed outside any request."
+)
+REPEATED_STATEMENTS = registry.counter(
+    "db_repeated_statement_total",
+    "Requests that repeated one statement more than N_PLUS_ONE_THRESHOLD times.", ("method", "route"),
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "shapes")
+
+    def __init__(self, track_shapes: bool):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Optional[Tally] = Tally() if track_shapes else None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Statistics of the request being handled in this context, if any."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        DB_UNATTRIBUTED.inc()
+        return
+    stats.statements += 1
+    started = getattr(context, "_instrumentation_started", None)
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+    if stats.shapes is not None:
+        # Bound parameters are placeholders, so the text is the statement's shape
+        stats.shapes[statement] += 1
+
+
+def install_sql_hooks() -> None:
+    """Listen on every Engine (sync, and the sync core of the async engine)."""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteTable:
+    """
+    Path -> route template, from the app's OpenAPI paths (full templates,
+    prefixes included, in routing order) plus the docs URLs. Built on first use.
+    """
+
+    def __init__(self):
+        self._patterns = None
+
+    def _build(self, app) -> list:
+        templates = list(app.openapi().get("paths", {}))
+        templates += [url for url in (app.openapi_url, app.docs_url, app.redoc_url) if url]
+        return [(compile_path(template)[0], template) for template in templates]
+
+    def resolve(self, scope) -> str:
+        if self._patterns is None:
+            self._patterns = self._build(scope["app"])
+        path = scope["path"]
+        for pattern, template in self._patterns:
+            if pattern.match(path):
+                return template
+        return UNMATCHED_ROUTE
+
+
+def _report_repeats(method: str, route: str, shapes: Tally) -> None:
+    statement, count = shapes.most_common(1)[0]
+    if count <= settings.N_PLUS_ONE_THRESHOLD:
+        return
+    REPEATED_STATEMENTS.inc(method, route)
+    logger.warning(
+        "Possible N+1: %s %s ran one statement %d times: %s",
+        method, route, count, " ".join(statement.split())[:300],
+    )
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so it adds no task or body buffering per request."""
+
+    def __init__(self, app):
+        self.app = app
+        self.routes = RouteTable()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.routes.resolve(scope)
+        stats = RequestStats(track_shapes=settings.N_PLUS_ONE_THRESHOLD > 0)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _current.set(stats)
+        IN_FLIGHT.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec(method, route)
+            _current.reset(token)
+            REQUESTS.inc(method, route, str(status_code))
+            LATENCY.observe(method, route, value=elapsed)
+            DB_STATEMENTS.observe(method, route, value=stats.statements)
+            DB_TIME.observe(method, route, value=stats.db_seconds)
+            if stats.shapes:
+                _report_repeats(method, route, stats.shapes)
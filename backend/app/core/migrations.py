@@ -0,0 +1,51 @@
+"""
+Startup check that the database schema is at the Alembic head.
+
+The app never creates or alters tables itself: run `alembic upgrade head`
+before starting it. The check reads the alembic_version table and compares
+it with the head of alembic/versions, without reflecting any other table.
+"""
+import logging
+from pathlib import Path
+from typing import Set
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the migration head this code expects."""
+
+
+def expected_heads() -> Set[str]:
+    return set(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+
+
+def current_heads(engine) -> Set[str]:
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def check_schema(engine, mode: str = "error") -> None:
+    """
+    Compare the database revision with the code's head. `mode` is "error"
+    (raise SchemaOutOfDate), "warn" (log only) or "off" (skip the query).
+    """
+    if mode == "off":
+        return
+    expected = expected_heads()
+    current = current_heads(engine)
+    if current == expected:
+        return
+    message = (
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+        f"expected {', '.join(sorted(expected))}; run `alembic upgrade head`"
+    )
+    if mode == "warn":
+        logger.warning(message)
+        return
+    raise SchemaOutOfDate(message)
@@ -0,0 +1,80 @@
+"""
+Read-your-writes stickiness for replica routing.
+
+After a client's successful write (any non-safe method answered below
+400), its reads go to the primary for READ_YOUR_WRITES_SECONDS, so it sees
+its own changes despite replica lag. The client is remembered in two ways:
+
+* in-process, by bearer token digest (or client address), which covers
+  API clients that ignore cookies;
+* with a short-lived cookie, which covers browsers whose next request is
+  served by another worker process.
+"""
+import time
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import token_digest
+
+COOKIE_NAME = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# client key -> True while its window lasts
+recent_writers = TTLCache(settings.READ_YOUR_WRITES_CLIENTS, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _header(headers, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def client_key(headers, client) -> str:
+    """Bearer token digest when present, else the client address."""
+    authorization = _header(headers, b"authorization")
+    if authorization:
+        return "token:" + token_digest(authorization)
+    return "addr:" + (client[0] if client else "")
+
+
+def wrote_recently(request) -> bool:
+    """True while the client that sent `request` should read from the primary."""
+    if settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    until = request.cookies.get(COOKIE_NAME)
+    if until:
+        try:
+            if float(until) > time.time():
+                return True
+        except ValueError:
+            pass
+    return client_key(request.scope["headers"], request.scope.get("client")) in recent_writers
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients after successful writes; pure ASGI, like MetricsMiddleware."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        window = settings.READ_YOUR_WRITES_SECONDS
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marked(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                recent_writers.set(client_key(scope["headers"], scope.get("client")), True)
+                cookie = (
+                    f"{COOKIE_NAME}={int(time.time()) + window}; Max-Age={window}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_marked)
@@ -0,0 +1,41 @@
+"""
+JSON response class used as the application default.
+
+Encodes with orjson when it is installed and with the stdlib encoder
+otherwise; both produce the same JSON as FastAPI's response-model path
+(ISO dates, Decimal as string, compact separators).
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse with a faster encoder. List endpoints return it directly
+    with plain dicts, skipping response-model validation; their declared
+    response_model still documents the payload in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
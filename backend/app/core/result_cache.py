@@ -0,0 +1,262 @@
+"""
+Tagged cache of rendered read responses.
+
+    entry = await result_cache.get_or_load(key, tags, load)  # load() -> CachedResponse
+    await result_cache.invalidate("district:Palpa", "school:7")
+
+RESULT_CACHE_BACKEND picks the store: "memory" (an LRU per process),
+"redis" (any Redis-protocol server at RESULT_CACHE_URL, shared by all
+workers; needs the redis package) or "off". Entries expire after
+RESULT_CACHE_TTL seconds and are tagged; invalidating a tag drops every
+entry carrying it. Concurrent misses on one key within a process share a
+single load (single-flight), so an invalidation does not stampede the
+database.
+
+With the memory backend a write only invalidates the copy of the worker
+that handled it; other workers can serve the old entry until it expires.
+Use redis when running several workers.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+LOOKUPS = registry.counter(
+    "result_cache_lookups_total", "Result cache lookups by outcome (hit, miss, coalesced).", ("result",)
+)
+INVALIDATIONS = registry.counter("result_cache_invalidations_total", "Tags invalidated in the result cache.")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A rendered JSON body with the validators computed for it."""
+    etag: str
+    body: bytes
+    last_modified: Optional[datetime] = None
+
+    def dumps(self) -> bytes:
+        last_modified = self.last_modified.isoformat() if self.last_modified else ""
+        return b"\n".join([self.etag.encode(), last_modified.encode(), self.body])
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        etag, last_modified, body = raw.split(b"\n", 2)
+        return cls(
+            etag=etag.decode(),
+            body=body,
+            last_modified=datetime.fromisoformat(last_modified.decode()) if last_modified else None,
+        )
+
+
+def cache_key(namespace: str, scope: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Key for a read: namespace, caller scope and query parameters in a canonical order."""
+    normalized = urlencode(sorted(params))
+    return f"{namespace}:{hashlib.sha1(f'{scope}|{normalized}'.encode()).hexdigest()}"
+
+
+class MemoryBackend:
+    """LRU with per-entry expiry and a tag -> keys index. Used from the event loop only."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._data.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        if key in self._data:
+            self._drop(key)
+        tags = tuple(tags)
+        self._data[key] = (value, time.monotonic() + self.ttl, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._drop(next(iter(self._data)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._drop(key)
+
+
+class RedisBackend:
+    """Entries as plain keys with EX; each tag is a set of entry keys expiring with its newest entry."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "nccaa:results:"):
+        if redis is None:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires the redis package")
+        self.client = redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def __len__(self):
+        return 0  # not tracked; see the server's own statistics
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, value, ex=self.ttl)
+            for tag in tags:
+                pipe.sadd(self.prefix + "tag:" + tag, key)
+                pipe.expire(self.prefix + "tag:" + tag, self.ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        tag_keys = [self.prefix + "tag:" + tag for tag in tags]
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = {self.prefix + key.decode() for found in members for key in found}
+        await self.client.delete(*keys, *tag_keys)
+
+
+class ResultCache:
+    """
+    Backend plus single-flight loading. Backend errors are logged and
+    treated as misses, so the cache can never fail a request.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            logger.warning("Result cache read failed", exc_info=True)
+            return None
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def get_or_load(self, key: str, tags: Iterable[str],
+                          load: Callable[[], Awaitable[CachedResponse]],
+                          bypass: bool = False,
+                          validate: Optional[Callable[[], Awaitable[None]]] = None) -> CachedResponse:
+        """
+        Cached entry for `key`, else the result of `load()`, stored under
+        `tags`. On a miss `validate()` runs first, before this request
+        starts or joins a load; it may raise (e.g. a 304 from cheap
+        validators) without affecting the other requests for `key`.
+        """
+        if bypass or not self.enabled:
+            if validate is not None:
+                await validate()
+            return await load()
+
+        entry = await self._get(key)
+        if entry is not None:
+            self.hits += 1
+            LOOKUPS.inc("hit")
+            return entry
+
+        if validate is not None:
+            await validate()
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            LOOKUPS.inc("coalesced")
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        LOOKUPS.inc("miss")
+        pending = self._loading[key] = asyncio.get_running_loop().create_future()
+        generation = self._generation
+        try:
+            entry = await load()
+        except BaseException as exc:
+            pending.set_exception(exc)
+            pending.exception()  # retrieved: waiters re-raise it, nobody else has to
+            raise
+        finally:
+            if self._loading.get(key) is pending:
+                del self._loading[key]
+        pending.set_result(entry)
+
+        if generation == self._generation:
+            try:
+                await self.backend.set(key, entry.dumps(), tags)
+            except Exception:
+                logger.warning("Result cache write failed", exc_info=True)
+        return entry
+
+    async def invalidate(self, *tags: str) -> None:
+        if not self.enabled or not tags:
+            return
+        self._generation += 1
+        INVALIDATIONS.inc(amount=len(tags))
+        try:
+            await self.backend.invalidate(tags)
+        except Exception:
+            logger.warning("Result cache invalidation failed", exc_info=True)
+
+    def stats(self) -> dict:
+        """Counters since start; hit_ratio counts coalesced lookups too, as they did not load."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": settings.RESULT_CACHE_BACKEND,
+            "size": len(self.backend) if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _backend():
+    if settings.RESULT_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.RESULT_CACHE_URL, settings.RESULT_CACHE_TTL)
+    if settings.RESULT_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL)
+    return None
+
+
+result_cache = ResultCache(_backend())
@@ -1,18 +1,116 @@
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min == max == default: any hash at a different cost is reported by needs_update()
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 ALGORITHM = "HS256"
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def verify_and_update_password(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a replacement hash when the stored one uses an outdated cost."""
+    return pwd_context.verify_and_update(plain, hashed)
+
+
+class KDFOverloaded(Exception):
+    """Raised when the password-hashing queue is full; surfaced as 503."""
+
+
+class KDFPool:
+    """
+    Dedicated, bounded executor for bcrypt so a burst of logins cannot
+    exhaust the shared threadpool or block the event loop. Work beyond
+    `max_pending` outstanding calls is shed with KDFOverloaded.
+    """
+
+    def __init__(self, workers: int, max_pending: int, kind: str = "process"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="kdf")
+            else:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def run(self, fn, *args, weight: int = 1):
+        """Run fn(*args) on the pool; `weight` is how many hashes the call performs."""
+        if self.pending + weight > self.max_pending and self.pending:
+            raise KDFOverloaded("Password hashing queue is full")
+        self.pending += weight
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= weight
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+kdf_pool = KDFPool(settings.KDF_WORKERS, settings.KDF_MAX_PENDING, settings.KDF_EXECUTOR)
+
+async def hash_password_async(password: str) -> str:
+    return await kdf_pool.run(hash_password, password)
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords on all KDF workers at once. Work goes out in small
+    batches so logins queued meanwhile are not stuck behind the whole lot;
+    a batch shed by a busy pool is retried instead of failing the caller.
+    """
+    workers = kdf_pool.workers
+    size = max(1, kdf_pool.max_pending // (2 * workers))
+    batches = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+
+    async def run(batch):
+        delay = 0.05
+        while True:
+            try:
+                return await kdf_pool.run(hash_passwords, batch, weight=len(batch))
+            except KDFOverloaded:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+    hashed: List[str] = []
+    for start in range(0, len(batches), workers):
+        for result in await asyncio.gather(*(run(b) for b in batches[start:start + workers])):
+            hashed.extend(result)
+    return hashed
+
+async def verify_and_update_password_async(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await kdf_pool.run(verify_and_update_password, plain, hashed)
+
 def create_access_token(data: dict, expires_minutes: int = None) -> str:
     """Create JWT token with flexible payload."""
     to_encode = data.copy()
@@ -27,3 +125,7 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+def token_digest(token: str) -> str:
+    """Stable cache key for a bearer token (never store raw tokens as keys)."""
+    return hashlib.sha256(token.encode()).hexdigest()
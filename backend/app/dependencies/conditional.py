@@ -0,0 +1,130 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for any router.
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: int, conditional: Conditional = Depends(conditional_get), ...):
+        version = await db.execute(select(Item.id, Item.updated_at).where(...))  # cheap probe
+        conditional.evaluate(entity_etag(item_id, updated_at), updated_at)  # may raise 304
+        ...load and return the body...
+
+`evaluate` answers 304 Not Modified (by raising) before the handler loads
+or serializes anything, and otherwise puts the validators and
+Cache-Control on the response. Handlers that return a Response object
+directly must pass it through `conditional.finish(response)`.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import func, select
+
+# Responses depend on the caller, so shared caches must not store them,
+# and clients must revalidate before reusing a stored copy
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+def _digest(*parts) -> str:
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def entity_etag(entity_id: int, updated_at: Optional[datetime], variant: str = "") -> str:
+    """Strong ETag of one row's representation; `variant` distinguishes query-dependent shapes."""
+    return _digest("entity", entity_id, updated_at.isoformat() if updated_at else None, variant)
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of a rendered body, for aggregates that have no row versions to hash."""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+async def page_validators(db, page, id_column, updated_column, *extra):
+    """
+    (ETag, Last-Modified) for a page of rows from one aggregate query over
+    `page` (the ordered, limited select the handler will run): row count,
+    sum of ids and latest updated_at. `extra` folds in other parts of the
+    body, such as the total count or the query string.
+    """
+    rows = page.with_only_columns(id_column.label("id"), updated_column.label("updated_at")).subquery()
+    count, id_sum, last_modified = (await db.execute(
+        select(func.count(), func.sum(rows.c.id), func.max(rows.c.updated_at))
+    )).one()
+    return _digest("page", count, id_sum, last_modified, *extra), last_modified
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since is None:
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+class Conditional:
+    """Per-request helper returned by the conditional_get dependency."""
+
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.headers = {}
+
+    @property
+    def is_conditional(self) -> bool:
+        """Whether the client sent validators, i.e. a 304 is possible."""
+        return "if-none-match" in self.request.headers or "if-modified-since" in self.request.headers
+
+    def evaluate(self, etag: str, last_modified: Optional[datetime] = None,
+                 cache_control: str = DEFAULT_CACHE_CONTROL) -> None:
+        """
+        Raise 304 if the client's copy (If-None-Match, else If-Modified-Since)
+        is current; otherwise set ETag, Last-Modified and Cache-Control.
+        """
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+        if last_modified is not None:
+            headers["Last-Modified"] = _http_date(last_modified)
+
+        if_none_match = self.request.headers.get("if-none-match")
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            fresh = _etag_matches(if_none_match, etag)
+        elif if_modified_since is not None and last_modified is not None:
+            fresh = _not_modified_since(if_modified_since, last_modified)
+        else:
+            fresh = False
+        if fresh:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        self.headers = headers
+        self.response.headers.update(headers)
+
+    def finish(self, response: Response) -> Response:
+        """Copy the validators onto a Response the handler returns itself."""
+        response.headers.update(self.headers)
+        return response
+
+
+def conditional_get(request: Request, response: Response) -> Conditional:
+    return Conditional(request, response)
@@ -1,20 +1,73 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
-from app.core.security import decode_access_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token, token_digest
 from app.core.database import get_db  # Fixed import path
 from app.models.user import User  # Import specific models
 from app.models.school import School, TrainingSession  # Import specific models
+from app.services.refresh_tokens import revoked_sessions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_user(token: str = Depends(oauth2_scheme),
-                    db: Session = Depends(get_db)) -> User:  # Use User directly, not models.User
+
+@dataclass(frozen=True)
+class Principal:
+    """Snapshot of the authenticated user, as returned by get_current_user."""
+    id: int
+    username: str
+    email: str
+    role: str
+    district: Optional[str]
+    school_id: Optional[int] = None
+    # Login session (refresh-token family) the access token belongs to
+    session_id: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User, session_id: Optional[str] = None) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            role=user.role,
+            district=user.district,
+            school_id=getattr(user, "school_id", None),
+            session_id=session_id,
+        )
+
+
+# token digest -> Principal; entries never outlive the token's exp. No endpoint
+# changes a user's role or district; a change made elsewhere (the shell, a
+# migration) shows up here within AUTH_CACHE_TTL seconds.
+principal_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+
+
+def _remember(key: str, principal: Principal, exp) -> None:
+    ttl = float(exp) - time.time() if exp else None
+    principal_cache.set(key, principal, ttl=ttl)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme),
+                           db: AsyncSession = Depends(get_db)) -> Principal:
     """
-    Extract user from JWT token and return DB user object.
-    Raises 401 if invalid or expired, 404 if user not found.
+    Extract user from JWT token and return the cached Principal.
+    A cache hit skips both the JWT decode and the database lookup.
+    Raises 401 if invalid, expired or its session was revoked, 404 if user not found.
     """
+    # Revocations are checked against the in-process denylist, refreshed every few seconds
+    await revoked_sessions.sync(db)
+    key = token_digest(token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        if principal.session_id in revoked_sessions:
+            raise HTTPException(status_code=401, detail="Session has been revoked")
+        return principal
+
     try:
         payload = decode_access_token(token)
         if not payload:
@@ -24,10 +77,15 @@ def get_current_user(token: str = Depends(oauth2_scheme),
             raise HTTPException(status_code=401, detail="Invalid token payload")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    session_id = payload.get("sid")
+    if session_id in revoked_sessions:
+        raise HTTPException(status_code=401, detail="Session has been revoked")
 
     # fetch directly from DB (no get_user_by_id helper needed)
-    user = db.get(User, int(user_id))  # Use User directly
+    user = await db.get(User, int(user_id))  # Use User directly
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
\ No newline at end of file
+    principal = Principal.from_user(user, session_id)
+    _remember(key, principal, payload.get("exp"))
+    return principal
@@ -1,11 +1,67 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+import anyio.to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import engine, Base
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import (
+    check_ready, dispose_pools, engine, open_session, pool_capacity, prewarm_pool, read_replicas,
+    reset_pools, threadpool_tokens,
+)
+from app.core.instrumentation import MetricsMiddleware, install_sql_hooks
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry
+from app.core.migrations import check_schema
+from app.core.read_your_writes import ReadYourWritesMiddleware
+from app.core.result_cache import result_cache
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, users, schools  # Import schools
+from app.routers import auth, users, schools, cadets, jobs, dashboard, geo  # Import schools
+from app.core.responses import FastJSONResponse
+from app.core.security import KDFOverloaded, kdf_pool
+from app.dependencies.deps import principal_cache
+from app.services.geo import geo_index
+from app.services.jobs import runner as job_runner
+from app.services.refresh_tokens import revoked_sessions
+
+
+logger = logging.getLogger(__name__)
 
 
-app = FastAPI(title="NCCAA API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker after fork: no connection is shared with the parent
+    await reset_pools()
+    tokens = threadpool_tokens()
+    if tokens:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = tokens
+    capacity = pool_capacity()
+    if settings.DB_MODE == "sync" and tokens and capacity and tokens > capacity:
+        logger.warning(
+            "THREADPOOL_TOKENS=%d exceeds the pool's %d connections; "
+            "requests will queue on the pool and time out after DB_POOL_TIMEOUT", tokens, capacity
+        )
+    # No DDL at startup: only verify that migrations have been applied
+    await run_in_threadpool(check_schema, engine, settings.DB_SCHEMA_CHECK)
+    await prewarm_pool(settings.DB_POOL_PREWARM)
+    # School writes normalize names against it, so load it before taking traffic
+    try:
+        async with open_session() as db:
+            await geo_index.ensure_fresh(db)
+    except Exception:
+        logger.warning("Geography index not loaded at startup; it loads on first use", exc_info=True)
+    # Picks up jobs left queued (or orphaned) by a previous run
+    job_runner.start()
+    app.state.ready = True
+    yield
+    # Fail readiness first, so the load balancer stops routing here while we drain
+    app.state.ready = False
+    await job_runner.stop()
+    kdf_pool.shutdown()
+    await dispose_pools()
+
+
+app = FastAPI(title="NCCAA API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -15,12 +71,64 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+# Outermost, so latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+install_sql_hooks()
+
+@app.exception_handler(KDFOverloaded)
+async def kdf_overloaded_handler(request: Request, exc: KDFOverloaded):
+    # Shed load instead of queueing logins behind an unbounded backlog
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(schools.router, prefix="/schools", tags=["schools"])  # Add schools router
+app.include_router(cadets.router, prefix="/cadets", tags=["cadets"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(geo.router, prefix="/geo", tags=["geo"])
 
 @app.get("/", tags=["health"])
 def root():
-    return {"status": "ok", "message": "NCCAA API is running"}
\ No newline at end of file
+    return {"status": "ok", "message": "NCCAA API is running"}
+
+@app.get("/health/ready", tags=["health"])
+async def readiness(request: Request):
+    """
+    503 until startup has finished, during shutdown, and while the primary
+    pool is exhausted or no connection answers within READY_TIMEOUT.
+    """
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"ready": False, "error": "starting or stopping"})
+    ready, details = await check_ready(settings.READY_TIMEOUT)
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, **details})
+
+@app.get("/health/caches", tags=["health"])
+def cache_stats():
+    """Hit/miss counters of the in-process caches and the result cache."""
+    return {
+        "principal": principal_cache.stats(),
+        "results": result_cache.stats(),
+        "revoked_sessions": len(revoked_sessions),
+    }
+
+@app.get("/health/jobs", tags=["health"])
+def job_runner_status():
+    """This process's job runner: worker id, running job ids and capacity."""
+    return job_runner.status()
+
+@app.get("/health/replicas", tags=["health"])
+def replica_status():
+    """Read replicas and whether each passed its last health check."""
+    return {"replicas": read_replicas.status()}
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+def metrics():
+    """Request, latency and SQL metrics of this process, in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
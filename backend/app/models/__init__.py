@@ -1,2 +1,7 @@
 from .user import User
-from .school import School, TrainingSession
\ No newline at end of file
+from .school import School, SchoolArchive, TrainingSession, TrainingSessionArchive
+from .stats import SchoolStats
+from .cadet import Cadet
+from .job import Job
+from .refresh_token import RefreshToken
+from .geo import District, Municipality
@@ -0,0 +1,77 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Public sort keys of GET /cadets -> column name
+CADET_SORT_FIELDS = {
+    "cadet_number": "cadet_number",
+    "name": "full_name_en",
+    "rank": "rank",
+    "gender": "gender",
+    "school": "school_id",
+    "district": "district",
+}
+# Equality filters of GET /cadets
+CADET_FILTER_FIELDS = ("district", "rank", "school_id")
+
+
+def cadet_list_indexes():
+    """
+    (name, columns) for the GET /cadets filter/sort combinations, so each
+    list query is an index range scan in sort order rather than a filesort.
+    InnoDB appends the primary key to secondary indexes, which covers the
+    id tie-breaker.
+
+    A school lies in one district, so the equality filters reduce to a
+    place (school_id, else district) and rank; indexes cover each sort
+    with no filter, one of them, or a place and rank together. Mirrored
+    literally in the cadets migration and 1e7c4b9a2d60.
+    """
+    indexes = []
+    # Unfiltered sorts, and filter == sort (ORDER BY col, id); cadet_number has its unique index
+    for sort_column in CADET_SORT_FIELDS.values():
+        if sort_column != "cadet_number":
+            indexes.append((f"ix_cadets_{sort_column}", (sort_column,)))
+    for filter_column in CADET_FILTER_FIELDS:
+        for sort_column in CADET_SORT_FIELDS.values():
+            if sort_column != filter_column:
+                indexes.append((f"ix_cadets_{filter_column}_{sort_column}", (filter_column, sort_column)))
+    # Place and rank together; (place, rank) above already serves sorting by either
+    for place_column in ("district", "school_id"):
+        for sort_column in CADET_SORT_FIELDS.values():
+            if sort_column not in (place_column, "rank"):
+                indexes.append((
+                    f"ix_cadets_{place_column}_rank_{sort_column}", (place_column, "rank", sort_column)
+                ))
+    return indexes
+
+
+class Cadet(Base):
+    __tablename__ = "cadets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cadet_number = Column(String(50), unique=True, nullable=False, index=True)
+    full_name_en = Column(String(150), nullable=False)
+    full_name_np = Column(String(150))
+    rank = Column(String(50), nullable=False)
+    gender = Column(String(10), nullable=False)
+    phone = Column(String(30))
+    email = Column(String(255))
+    address = Column(String(255))
+    # Copied from the school on write so district filters stay on this table's indexes
+    district = Column(String(100), nullable=False)
+    school_id = Column(Integer, ForeignKey("schools.id"), nullable=False)
+    # Deleting a session (PATCH /schools/{id}/training-sessions) unlinks its cadets, not the rows
+    training_session_id = Column(Integer, ForeignKey("training_sessions.id", ondelete="SET NULL"), index=True)
+    passout_year = Column(Integer)
+    guardian_name = Column(String(100))
+    guardian_contact = Column(String(30))
+    relation = Column(String(50))
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    school = relationship("School")
+    training_session = relationship("TrainingSession")
+
+    __table_args__ = tuple(Index(name, *columns) for name, columns in cadet_list_indexes())
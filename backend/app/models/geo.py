@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class District(Base):
+    """Canonical district names; schools, users and cadets store the name as written here."""
+    __tablename__ = "districts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True)
+    province = Column(String(100), nullable=True)
+
+    municipalities = relationship("Municipality", back_populates="district")
+
+
+class Municipality(Base):
+    """Local levels of a district; registered on first use by a school write or `manage.py sync-geo`."""
+    __tablename__ = "municipalities"
+
+    id = Column(Integer, primary_key=True, index=True)
+    district_id = Column(Integer, ForeignKey("districts.id"), nullable=False)
+    name = Column(String(100), nullable=False)
+    ward_count = Column(Integer, nullable=True)  # highest ward number seen
+
+    district = relationship("District", back_populates="municipalities")
+
+    __table_args__ = (
+        UniqueConstraint("district_id", "name", name="uq_municipalities_district_name"),
+    )
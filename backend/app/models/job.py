@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON, ForeignKey, Index
+from app.core.database import Base
+from app.utils.timestamps import utcnow
+
+# Lifecycle: queued -> running -> succeeded | failed | cancelled (running -> queued on retry)
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class Job(Base):
+    """
+    A unit of background work run by app.services.jobs. The row is the
+    queue entry, the lease (worker_id + heartbeat_at) and the outcome.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    params = Column(JSON, nullable=False, default=dict)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    run_after = Column(DateTime, nullable=False, default=utcnow)  # retry backoff
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    message = Column(String(255), nullable=True)
+
+    result = Column(JSON, nullable=True)
+    result_path = Column(String(500), nullable=True)
+    result_filename = Column(String(255), nullable=True)
+    result_media_type = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # The runners' claim query
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_created_by", "created_by"),
+        # Finished jobs past JOB_RESULT_TTL are deleted oldest first
+        Index("ix_jobs_finished_at", "finished_at"),
+    )
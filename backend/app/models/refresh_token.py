@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.core.database import Base
+from app.utils.timestamps import utcnow
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token, stored as its SHA-256 digest. Every token
+    minted from one login shares a family_id (the login session, carried
+    as `sid` in access tokens); rotation marks the old row used_at, and
+    revoking sets revoked_at on the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    family_id = Column(String(32), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)  # rotated; presenting it again is reuse
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+        Index('ix_refresh_tokens_user_id', 'user_id'),
+        # Denylist sync reads recent revocations
+        Index('ix_refresh_tokens_revoked_at', 'revoked_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -27,6 +27,20 @@ class School(Base):
     # Relationship with training sessions
     training_sessions = relationship("TrainingSession", back_populates="school")
 
+    __table_args__ = (
+        # Default listings read live rows only (is_active = true), often in one district
+        Index("ix_schools_is_active_district", "is_active", "district"),
+        # Covers the dashboard rollup GROUP BY district, municipality
+        Index("ix_schools_district_municipality", "district", "municipality", "is_active"),
+        # Backs GET /schools/search on MySQL; other dialects use the in-process trigram index
+        Index(
+            "ft_schools_search", "name", "principal_name", "area_name", "municipality",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+        # Archived schools keep their ids, so SQLite must not hand out the largest one again
+        {"sqlite_autoincrement": True},
+    )
+
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
     
@@ -39,3 +53,58 @@ class TrainingSession(Base):
     
     # Relationship with school
     school = relationship("School", back_populates="training_sessions")
+
+    __table_args__ = (
+        # Cover the dashboard rollups; their left prefixes also serve lookups
+        # by school_id (and its foreign key) and by ncc_batch
+        Index("ix_training_sessions_school_rollup", "school_id", "ncc_batch", "start_date", "division"),
+        Index("ix_training_sessions_batch_rollup", "ncc_batch", "start_date", "division"),
+        # Kept by training_sessions_archive as well (see School)
+        {"sqlite_autoincrement": True},
+    )
+
+
+class SchoolArchive(Base):
+    """
+    Inactive schools moved out of `schools` by app.services.archive: the
+    same columns and ids, plus when the row was archived.
+    """
+    __tablename__ = "schools_archive"
+
+    id = Column(Integer, primary_key=True)  # its id in schools
+    name = Column(String(255), nullable=False)
+    district = Column(String(100), nullable=False)
+    municipality = Column(String(100), nullable=False)
+    ward_number = Column(Integer, nullable=False)
+    area_name = Column(String(100))
+    official_email = Column(String(255))
+    phone_number = Column(String(20), nullable=False)
+    website = Column(String(255))
+    principal_name = Column(String(100), nullable=False)
+    principal_contact = Column(String(20), nullable=False)
+    teacher_name = Column(String(100))
+    teacher_contact = Column(String(20))
+    notes = Column(Text)
+    is_active = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_schools_archive_district", "district"),
+    )
+
+class TrainingSessionArchive(Base):
+    """Training sessions of archived schools, with their original ids."""
+    __tablename__ = "training_sessions_archive"
+
+    id = Column(Integer, primary_key=True)
+    school_id = Column(Integer, ForeignKey("schools_archive.id"))
+    ncc_batch = Column(String(100), nullable=False)
+    start_date = Column(Date, nullable=False)
+    passout_date = Column(Date)
+    division = Column(String(10), nullable=False)
+
+    __table_args__ = (
+        Index("ix_training_sessions_archive_school_id", "school_id"),
+    )
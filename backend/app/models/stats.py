@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Primary key of the row holding global totals
+GLOBAL_STATS_KEY = "__all__"
+
+class SchoolStats(Base):
+    """
+    Incrementally maintained counters behind /schools/stats.
+    One row per district plus a GLOBAL_STATS_KEY row with the totals;
+    updated in the same transaction as school, session and cadet writes.
+    """
+    __tablename__ = "school_stats"
+
+    district = Column(String(100), primary_key=True)
+    total_schools = Column(Integer, nullable=False, default=0)
+    active_schools = Column(Integer, nullable=False, default=0)
+    total_sessions = Column(Integer, nullable=False, default=0)
+    total_cadets = Column(Integer, nullable=False, default=0)
+    districts_covered = Column(Integer, nullable=False, default=0)  # meaningful on the global row
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, func, UniqueConstraint, Index
 from app.core.database import Base
 from sqlalchemy.orm import relationship 
 
@@ -24,6 +24,7 @@ class User(Base):
         UniqueConstraint('cadet_number', name='uq_users_cadet_number'),
         UniqueConstraint('username', name='uq_users_username'),
         UniqueConstraint('email', name='uq_users_email'),
+        Index('ix_users_district_role', 'district', 'role'),
     )
     # Relationship with school
     #school = relationship("School", backref="coordinators")
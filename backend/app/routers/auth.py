@@ -1,16 +1,40 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db, Base, engine
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_db
 from app import models, schemas
-from app.core.security import verify_password, create_access_token
-
-# Ensure tables exist
-Base.metadata.create_all(bind=engine)
+from app.core.security import verify_and_update_password_async, create_access_token
+from app.dependencies.deps import Principal, get_current_user
+from app.services import refresh_tokens
+from app.services.refresh_tokens import InvalidRefreshToken, revoked_sessions
 
 router = APIRouter()
 
+
+def _token_pair(user, refresh_token: str, session_id: str) -> dict:
+    # Include role and district in JWT; sid ties it to its refresh-token family
+    token = create_access_token(
+        data={
+            "sub": str(user.id),
+            "role": user.role,
+            "district": user.district,
+            "sid": session_id,
+        }
+    )
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+        "role": user.role,
+        "district": user.district,
+        "username": user.username
+    }
+
 @router.post("/login", response_model=schemas.Token)
-def login(payload: schemas.LoginIn, db: Session = Depends(get_db)):
+async def login(payload: schemas.LoginIn, db: AsyncSession = Depends(get_db)):
     """
     Login endpoint.
     Returns JWT token with role and district info.
@@ -18,30 +42,73 @@ def login(payload: schemas.LoginIn, db: Session = Depends(get_db)):
     if not payload.email and not payload.username:
         raise HTTPException(status_code=400, detail="Provide email or username")
 
-    query = db.query(models.User)
+    query = select(models.User)
     user = None
     if payload.email:
-        user = query.filter(models.User.email == payload.email).first()
+        user = await db.scalar(query.where(models.User.email == payload.email).limit(1))
     elif payload.username:
-        user = query.filter(models.User.username == payload.username).first()
+        user = await db.scalar(query.where(models.User.username == payload.username).limit(1))
 
-    if not user or not verify_password(payload.password, user.password_hash):
+    # bcrypt runs on the dedicated KDF pool (503 when saturated)
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password_async(payload.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    # Include role and district in JWT
-    # Corrected token creation
-    token = create_access_token(
-        data={
-            "sub": str(user.id),
-            "role": user.role,
-            "district": user.district
-        }
-    )
-    print("DEBUG: Access token created for user:", user.username)
-    return {
-        "access_token": token, 
-        "token_type": "bearer",
-        "role": user.role,
-        "district": user.district,
-        "username": user.username
-    }
+    # Stored hash uses an outdated bcrypt cost; upgrade it transparently
+    if new_hash:
+        user.password_hash = new_hash
+
+    # New session: clients renew through /auth/refresh instead of logging in again
+    await db.run_sync(refresh_tokens.prune, user.id)
+    refresh_token, session_id = await db.run_sync(refresh_tokens.issue, user.id)
+    await db.commit()
+    return _token_pair(user, refresh_token, session_id)
+
+
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh(payload: schemas.RefreshIn, db: AsyncSession = Depends(get_db)):
+    """
+    Trade a refresh token for a new access token and a new refresh token;
+    no password check, so no bcrypt cost. Each refresh token works once:
+    presenting a spent one revokes its whole session.
+    """
+    try:
+        user, refresh_token, session_id = await db.run_sync(refresh_tokens.rotate, payload.refresh_token)
+    except InvalidRefreshToken as exc:
+        if exc.revoked_family:
+            await db.commit()
+            revoked_sessions.add(exc.revoked_family)
+        else:
+            await db.rollback()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc))
+    await db.commit()
+    return _token_pair(user, refresh_token, session_id)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: Optional[schemas.LogoutIn] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Revoke the caller's current session (or the session of `refresh_token`,
+    or with all_sessions every session of the caller). Its refresh tokens
+    stop working at once and its access tokens within REVOCATION_SYNC_SECONDS
+    on every worker.
+    """
+    payload = payload or schemas.LogoutIn()
+    if payload.all_sessions:
+        families = await db.run_sync(refresh_tokens.revoke, user_id=current_user.id)
+    else:
+        family_ids = [current_user.session_id] if current_user.session_id else []
+        if payload.refresh_token:
+            owner = await db.run_sync(refresh_tokens.family_of, payload.refresh_token)
+            if owner and owner[0] == current_user.id:
+                family_ids.append(owner[1])
+        families = await db.run_sync(refresh_tokens.revoke, family_ids)
+    await db.commit()
+    # Access tokens issued before refresh tokens existed carry no sid; they just expire
+    revoked_sessions.add(*families)
@@ -0,0 +1,368 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+
+from app.core.database import get_db, get_read_db
+from app.core.read_your_writes import wrote_recently
+from app.core.responses import FastJSONResponse
+from app.models.cadet import Cadet, CADET_SORT_FIELDS
+from app.models.school import School, TrainingSession
+from app.dependencies.deps import Principal, get_current_user
+from app.routers.jobs import queue_job
+from app.services import jobs, stats
+from app.services.geo import geo_index
+from app.services.export import MEDIA_TYPES, count_export, stream_export
+from app.utils.pagination import count_rows
+from app.schemas.cadet import (
+    Cadet as CadetSchema,
+    CadetCreate,
+    CadetExportParams,
+    CadetUpdate,
+    CadetListResponse
+)
+
+# Mounted under /cadets in app.main
+router = APIRouter()
+
+WRITE_ROLES = ["admin", "province_admin", "district_admin", "committee_member"]
+
+# NOT NULL columns; an explicit null in an update leaves them unchanged
+REQUIRED_FIELDS = {"cadet_number", "full_name_en", "rank", "gender", "school_id"}
+
+# Display columns joined onto every cadet row
+DISPLAY_COLUMNS = (
+    School.name.label("school_name"),
+    TrainingSession.ncc_batch.label("batch_name"),
+)
+
+
+def _cadet_filters(current_user, district: Optional[str], rank: Optional[str],
+                   school_id: Optional[int], search: Optional[str]) -> list:
+    """
+    WHERE clauses on the cadets table only, so list queries stay on the
+    (filter, sort) indexes declared in app.models.cadet.
+    """
+    clauses = []
+
+    # Role-based filtering
+    if current_user.role == "district_admin" and current_user.district:
+        clauses.append(Cadet.district == current_user.district)
+    elif current_user.role == "school_coordinator" and current_user.school_id:
+        clauses.append(Cadet.school_id == current_user.school_id)
+
+    if district:
+        clauses.append(Cadet.district == geo_index.district_name(district))
+    if rank:
+        clauses.append(Cadet.rank == rank)
+    if school_id is not None:
+        clauses.append(Cadet.school_id == school_id)
+    if search:
+        # Prefix match only: a leading wildcard could not use the indexes
+        clauses.append(or_(
+            Cadet.cadet_number.startswith(search, autoescape=True),
+            Cadet.full_name_en.startswith(search, autoescape=True),
+        ))
+    return clauses
+
+
+def _with_display(statement):
+    return (
+        statement
+        .join(School, School.id == Cadet.school_id)
+        .outerjoin(TrainingSession, TrainingSession.id == Cadet.training_session_id)
+    )
+
+
+# Cadet schema fields stored on the cadets table, then the joined display names
+CADET_FIELDS = tuple(f for f in CadetSchema.model_fields if hasattr(Cadet, f))
+ROW_FIELDS = CADET_FIELDS + tuple(column.name for column in DISPLAY_COLUMNS)
+
+
+def _cadet_select():
+    return _with_display(select(*(getattr(Cadet, f) for f in CADET_FIELDS), *DISPLAY_COLUMNS))
+
+
+def _to_dict(row) -> dict:
+    data = dict(zip(ROW_FIELDS, row))
+    data["district_name"] = data["district"]
+    return data
+
+
+async def _load_cadet(db: AsyncSession, cadet_id: int) -> Optional[dict]:
+    row = (await db.execute(_cadet_select().where(Cadet.id == cadet_id))).first()
+    return _to_dict(row) if row else None
+
+
+def _check_access(current_user, district: str, school_id: int, detail: str) -> None:
+    if current_user.role == "district_admin" and district != current_user.district:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    if current_user.role == "school_coordinator" and school_id != current_user.school_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+async def _resolve_school(db: AsyncSession, school_id: int, training_session_id: Optional[int]) -> School:
+    """The cadet's school (for its district), checking the batch belongs to it."""
+    school = await db.get(School, school_id)
+    if not school:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="School not found"
+        )
+    if training_session_id is not None:
+        owner = await db.scalar(
+            select(TrainingSession.school_id).where(TrainingSession.id == training_session_id)
+        )
+        if owner != school_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Training session does not belong to this school"
+            )
+    return school
+
+
+async def _cadet_number_taken(db: AsyncSession, cadet_number: str) -> bool:
+    return await db.scalar(
+        select(Cadet.id).where(Cadet.cadet_number == cadet_number).limit(1)
+    ) is not None
+
+
+@router.get("", response_model=CadetListResponse)
+async def get_cadets(
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    sort: Literal["cadet_number", "name", "rank", "gender", "school", "district"] = "cadet_number",
+    order: Literal["asc", "desc"] = "asc",
+    district: Optional[str] = None,
+    rank: Optional[str] = None,
+    school_id: Optional[int] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Page of cadets for the cadet table, with whitelisted sort keys and
+    filters. Any sort with up to one place filter (district or school_id,
+    the caller's scope included) and `rank` reads the page in order from
+    a composite index (see cadet_list_indexes), and only `limit` rows are
+    joined for the school and batch names.
+
+    `search` is two prefix ranges, on cadet_number and full_name_en under
+    the same equality prefix; the database merges them and sorts only the
+    matching rows.
+    """
+    clauses = _cadet_filters(current_user, district, rank, school_id, search)
+    total, _ = await count_rows(db, select(Cadet.id).where(*clauses), "exact")
+
+    sort_column = getattr(Cadet, CADET_SORT_FIELDS[sort])
+    if order == "desc":
+        ordering = (sort_column.desc(), Cadet.id.desc())
+    else:
+        ordering = (sort_column, Cadet.id)
+
+    # Pick the page ids on the cadets table alone, then join display names onto those rows
+    page_ids = (
+        select(Cadet.id).where(*clauses).order_by(*ordering)
+        .offset((page - 1) * limit).limit(limit)
+        .subquery()
+    )
+    result = await db.execute(
+        _cadet_select()
+        .join(page_ids, page_ids.c.id == Cadet.id)
+        .order_by(*ordering)
+    )
+
+    # Built from column tuples already; skip response-model validation
+    return FastJSONResponse({
+        "items": [_to_dict(row) for row in result.all()],
+        "total": total,
+    })
+
+
+EXPORT_CADET_COLUMNS = [
+    "id", "cadet_number", "full_name_en", "full_name_np", "rank", "gender", "phone", "email",
+    "address", "district", "school_id", "training_session_id", "passout_year",
+    "guardian_name", "guardian_contact", "relation", "created_at", "updated_at",
+]
+
+
+def _export_statement(current_user, district: Optional[str], rank: Optional[str],
+                      school_id: Optional[int], search: Optional[str]):
+    """(statement, column names) of a cadet export."""
+    statement = (
+        _with_display(select(*(getattr(Cadet, c) for c in EXPORT_CADET_COLUMNS), *DISPLAY_COLUMNS))
+        .where(*_cadet_filters(current_user, district, rank, school_id, search))
+        .order_by(Cadet.id)
+    )
+    return statement, EXPORT_CADET_COLUMNS + ["school_name", "batch_name"]
+
+
+@router.get("/export")
+async def export_cadets(
+    request: Request,
+    format: Literal["csv", "ndjson", "xlsx"] = "csv",
+    district: Optional[str] = None,
+    rank: Optional[str] = None,
+    school_id: Optional[int] = None,
+    search: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Stream every cadet matching the list filters, with school and batch names."""
+    statement, columns = _export_statement(current_user, district, rank, school_id, search)
+    return StreamingResponse(
+        stream_export(statement, columns, format, read_only=not wrote_recently(request)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="cadets_export.{format}"'},
+    )
+
+
+@router.post("/export", status_code=status.HTTP_202_ACCEPTED)
+async def queue_cadet_export(
+    format: Literal["csv", "ndjson", "xlsx"] = "csv",
+    district: Optional[str] = None,
+    rank: Optional[str] = None,
+    school_id: Optional[int] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """The same export as a background job; download from /jobs/{id}/result once done."""
+    params = {"format": format, "district": district, "rank": rank, "school_id": school_id, "search": search}
+    return await queue_job(db, "export_cadets", params, current_user)
+
+
+@jobs.job_type("export_cadets", params=CadetExportParams, concurrency=2)
+async def export_cadets_job(job: jobs.JobContext):
+    params = CadetExportParams.model_validate(job.params)
+    statement, columns = _export_statement(
+        await job.principal(), params.district, params.rank, params.school_id, params.search
+    )
+    job.progress(done=0, total=await count_export(statement, read_only=True))
+    await job.write_result(
+        stream_export(statement, columns, params.format, read_only=True, on_rows=job.advance),
+        f"cadets_export.{params.format}", MEDIA_TYPES[params.format]
+    )
+    return {"rows": job.done}
+
+
+@router.get("/{cadet_id}", response_model=CadetSchema)
+async def get_cadet(
+    cadet_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    cadet = await _load_cadet(db, cadet_id)
+    if not cadet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cadet not found"
+        )
+    _check_access(current_user, cadet["district"], cadet["school_id"], "Not authorized to access this cadet")
+    return cadet
+
+
+@router.post("", response_model=CadetSchema)
+async def create_cadet(
+    cadet_data: CadetCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if current_user.role not in WRITE_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create cadets"
+        )
+
+    school = await _resolve_school(db, cadet_data.school_id, cadet_data.training_session_id)
+    _check_access(current_user, school.district, school.id, "Not authorized to add cadets to this school")
+
+    if await _cadet_number_taken(db, cadet_data.cadet_number):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cadet number already exists"
+        )
+
+    db_cadet = Cadet(**cadet_data.model_dump(), district=school.district)
+    db.add(db_cadet)
+    await db.flush()
+    await db.run_sync(stats.apply_school_delta, school.district, cadets=1)
+    await db.commit()
+
+    return await _load_cadet(db, db_cadet.id)
+
+
+@router.put("/{cadet_id}", response_model=CadetSchema)
+async def update_cadet(
+    cadet_id: int,
+    cadet_data: CadetUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if current_user.role not in WRITE_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update cadets"
+        )
+
+    db_cadet = await db.get(Cadet, cadet_id)
+    if not db_cadet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cadet not found"
+        )
+    _check_access(current_user, db_cadet.district, db_cadet.school_id, "Not authorized to update this cadet")
+
+    update_data = cadet_data.model_dump(exclude_unset=True)
+    if (update_data.get("cadet_number") not in (None, db_cadet.cadet_number)
+            and await _cadet_number_taken(db, update_data["cadet_number"])):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cadet number already exists"
+        )
+
+    old_district = db_cadet.district
+    school_id = update_data.get("school_id") or db_cadet.school_id
+    if "school_id" in update_data or "training_session_id" in update_data:
+        training_session_id = update_data.get("training_session_id", db_cadet.training_session_id)
+        school = await _resolve_school(db, school_id, training_session_id)
+        _check_access(current_user, school.district, school.id, "Not authorized to move cadets to this school")
+        update_data["district"] = school.district
+
+    for field, value in update_data.items():
+        if value is not None or field not in REQUIRED_FIELDS:
+            setattr(db_cadet, field, value)
+
+    if db_cadet.district != old_district:
+        await db.run_sync(stats.apply_school_delta, old_district, cadets=-1)
+        await db.run_sync(stats.apply_school_delta, db_cadet.district, cadets=1)
+    await db.commit()
+
+    return await _load_cadet(db, cadet_id)
+
+
+@router.delete("/{cadet_id}")
+async def delete_cadet(
+    cadet_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    if current_user.role not in WRITE_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete cadets"
+        )
+
+    db_cadet = await db.get(Cadet, cadet_id)
+    if not db_cadet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cadet not found"
+        )
+    _check_access(current_user, db_cadet.district, db_cadet.school_id, "Not authorized to delete this cadet")
+
+    await db.delete(db_cadet)
+    await db.run_sync(stats.apply_school_delta, db_cadet.district, cadets=-1)
+    await db.commit()
+
+    return {"message": "Cadet deleted successfully"}
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.database import get_read_db
+from app.core.read_your_writes import wrote_recently
+from app.core.responses import FastJSONResponse
+from app.core.result_cache import CachedResponse, cache_key, result_cache
+from app.dependencies.deps import Principal, get_current_user
+from app.dependencies.conditional import Conditional, body_etag, conditional_get
+from app.schemas.dashboard import DashboardRollups
+from app.services import rollups, school_scope
+
+# Mounted under /dashboard in app.main
+router = APIRouter()
+
+
+@router.get("/rollups", response_model=DashboardRollups)
+async def get_rollups(
+    district: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    conditional: Conditional = Depends(conditional_get)
+):
+    """
+    Dashboard aggregates for the schools visible to the caller (scoped like
+    GET /schools/): schools per district and municipality, training
+    sessions per batch and start year, and junior/senior splits per
+    district. Three GROUP BY queries over covering indexes; the result is
+    kept in the result cache and invalidated by school writes like the list.
+    """
+    clauses = school_scope.school_filters(current_user, district, is_active)
+
+    async def load() -> CachedResponse:
+        body = FastJSONResponse(await db.run_sync(rollups.rollups, clauses)).body
+        return CachedResponse(body_etag(body), body)
+
+    entry = await result_cache.get_or_load(
+        cache_key("dashboard:rollups", school_scope.cache_scope(current_user),
+                  conditional.request.query_params.multi_items()),
+        school_scope.list_tags(current_user, district), load,
+        bypass=wrote_recently(conditional.request)
+    )
+    conditional.evaluate(entry.etag)
+    return conditional.finish(Response(entry.body, media_type=FastJSONResponse.media_type))
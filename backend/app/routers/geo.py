@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.core.responses import FastJSONResponse
+from app.dependencies.deps import Principal, get_current_user
+from app.dependencies.conditional import Conditional, conditional_get
+from app.schemas.geo import GeoTree
+from app.services.geo import geo_index
+
+# Mounted under /geo in app.main
+router = APIRouter()
+
+
+@router.get("/tree", response_model=GeoTree)
+async def get_geo_tree(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    conditional: Conditional = Depends(conditional_get)
+):
+    """
+    Every district, its municipalities and their wards, each with school,
+    active school and training session counts; for filter dropdowns and
+    map views. Served from the in-process geography index: no query unless
+    a school write (or GEO_TREE_TTL) made it stale. Supports If-None-Match.
+    """
+    await geo_index.ensure_fresh(db)
+    conditional.evaluate(geo_index.etag)
+    return conditional.finish(Response(geo_index.body, media_type=FastJSONResponse.media_type))
@@ -0,0 +1,128 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.dependencies.deps import Principal, get_current_user
+from app.models.job import FINISHED_STATUSES, Job
+from app.schemas.job import Job as JobSchema, JobCreate
+from app.services import jobs
+
+# Mounted under /jobs in app.main
+router = APIRouter()
+
+
+async def queue_job(db: AsyncSession, type: str, params: dict, current_user) -> JSONResponse:
+    """
+    Submit a job and answer 202 with it and its Location. For routers that
+    hand heavy work to the job runner.
+    """
+    try:
+        job = await jobs.submit(db, type, params, current_user)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown job type: {type}")
+    except jobs.JobNotAllowed as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc))
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False)
+        )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobSchema.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+async def _visible_job(db: AsyncSession, job_id: int, current_user) -> Job:
+    """The job, if the caller submitted it or is an admin; 404 otherwise."""
+    job = await db.get(Job, job_id)
+    if not job or (job.created_by != current_user.id and current_user.role != "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    payload: JobCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Queue a background job; poll GET /jobs/{id} for progress. Types:
+    stats_rebuild, export_schools, export_cadets (params as the matching
+    endpoints' query parameters).
+    """
+    return await queue_job(db, payload.type, payload.params, current_user)
+
+
+@router.get("/", response_model=List[JobSchema])
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """The caller's most recent jobs, newest first."""
+    query = select(Job).where(Job.created_by == current_user.id)
+    if status_filter:
+        query = query.where(Job.status == status_filter)
+    return (await db.scalars(query.order_by(Job.id.desc()).limit(min(limit, 500)))).all()
+
+
+@router.get("/{job_id}", response_model=JobSchema)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Status and progress; progress is refreshed every JOB_POLL_INTERVAL seconds."""
+    return await _visible_job(db, job_id, current_user)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Download the result file of a succeeded job, or its JSON result when it has no file."""
+    job = await _visible_job(db, job_id, current_user)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}"
+        )
+    if job.result_filename:
+        if not job.result_path or not os.path.exists(job.result_path):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Result file has expired"
+            )
+        return FileResponse(job.result_path, media_type=job.result_media_type, filename=job.result_filename)
+    return job.result
+
+
+@router.post("/{job_id}/cancel", response_model=JobSchema)
+async def cancel_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """A queued job is cancelled at once; a running one stops at its runner's next heartbeat."""
+    job = await _visible_job(db, job_id, current_user)
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is already {job.status}"
+        )
+    return await jobs.cancel(db, job)
@@ -1,84 +1,158 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
+import csv
 
-from app.core.database import Base, engine, get_db
-from pydantic import BaseModel
-from typing import List
+from app.core.config import settings
+
+from app.core.database import get_db, get_read_db, open_session
+from app.core.read_your_writes import wrote_recently
+from app.core.responses import FastJSONResponse
+from app.core.result_cache import CachedResponse, cache_key, result_cache
 from app.models import school as models
+from app.models.cadet import Cadet
+from app.models.stats import GLOBAL_STATS_KEY, SchoolStats
+from app.services import archive, geo, jobs, stats, school_rows, school_scope, school_search, training_sessions
+from app.services.export import MEDIA_TYPES, count_export, stream_export
+from app.services.school_import import (
+    ImportFormatError, ImportState, csv_rows, xlsx_rows, import_chunk, parse_row, take
+)
 
-from app.models.user import User
-from app.dependencies.deps import get_current_user
-from sqlalchemy.orm import joinedload
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.dependencies.deps import Principal, get_current_user
+from app.dependencies.conditional import Conditional, conditional_get, entity_etag, page_validators
+from app.routers.jobs import queue_job
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, keyset_filter
 from app import schemas
-from app.core.database import get_db
 from app.schemas.school import (
     School as SchoolSchema,
     SchoolCreate,
+    SchoolArchiveParams,
+    SchoolExportParams,
     SchoolUpdate,
-    SchoolListResponse
+    SchoolListResponse,
+    SchoolImportReport,
+    SchoolSearchHit,
+    TrainingSessionChanges,
+    TrainingSessionPatch
 )
 
 __all__ = ["get_current_user"]
 
-router = APIRouter(prefix="/schools", tags=["schools"])
+# Mounted under /schools in app.main
+router = APIRouter()
+
+# Keyset-pageable sort keys -> School attributes, each indexed together with
+# the primary key (looked up on the query's source, see get_schools)
+SORT_FIELDS = {
+    "id": "id",
+    "name": "name",
+}
+
+
+async def _load_school(db: AsyncSession, school_id: int):
+    """Fetch a school with its training sessions eagerly loaded (no lazy loads under asyncio)."""
+    return await db.scalar(
+        select(models.School)
+        .options(selectinload(models.School.training_sessions))
+        .where(models.School.id == school_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-@router.get("/stats/")
-def get_school_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    total_schools = db.query(models.School).count()
-    active_schools = db.query(models.School).filter(models.School.is_active == True).count()
 
-    # Count training sessions and multiply by Cadets per session (30)
-    total_sessions = db.query(models.TrainingSession).count()
-    total_cadets = total_sessions * 30
+async def _invalidate_school(school_id: Optional[int], *districts: str) -> None:
+    """Drop cached reads a write to this school (in these districts) can change."""
+    tags = {f"district:{district}" for district in districts}
+    if school_id is not None:
+        tags.add(f"school:{school_id}")
+    await result_cache.invalidate("district:*", *sorted(tags))
+    geo.geo_index.invalidate()
+
+
+def _cached_json(entry: CachedResponse) -> Response:
+    return Response(entry.body, media_type=FastJSONResponse.media_type)
+
+
+FIELDS_DESCRIPTION = "Comma-separated school fields to return; id is always included"
+INCLUDE_DESCRIPTION = (
+    "Relationships to embed: training_sessions, or empty for none. "
+    "Defaults to training_sessions unless fields is given"
+)
+
+
+def _projection(fields: Optional[str], include: Optional[str]):
+    """(school fields to select, whether to load sessions) for a read request."""
+    try:
+        return school_rows.parse_fields(fields), school_rows.parse_include(include, fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
 
-    districts_covered = db.query(models.School.district).distinct().count()
+
+@router.get("/stats/")
+async def get_school_stats(
+    district: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Served from the school_stats summary table: a single primary-key read
+    of the global row, or of one district's row when `district` is given.
+    """
+    # Rows are keyed by the canonical spelling, as school_filters uses for listings
+    district = geo.geo_index.district_name(district)
+    row = await db.get(SchoolStats, district or GLOBAL_STATS_KEY)
+    if row is None:
+        return {"total_schools": 0, "active_schools": 0, "total_cadets": 0, "districts_covered": 0}
 
     return {
-        "total_schools": total_schools,
-        "active_schools": active_schools,
-        "total_cadets": total_cadets,
-        "districts_covered": districts_covered
+        "total_schools": row.total_schools,
+        "active_schools": row.active_schools,
+        "total_cadets": row.total_cadets,
+        "districts_covered": row.districts_covered if not district else int(row.total_schools > 0)
     }
-    
-    
+
+
 @router.post("/", response_model=SchoolSchema)
-def create_school(
+async def create_school(
     school_data: SchoolCreate,  # <-- Fix: use SchoolCreate, not SchoolSchema
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    print("Received school creation request:", school_data.dict())  # Debug log
-
     # Check permissions
     if current_user.role not in ["admin", "committee_member"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to create schools"
         )
-    
+
     # Check if school name already exists
-    existing_school = db.query(models.School).filter(
-        models.School.name == school_data.name
-    ).first()
-    
+    existing_school = await db.scalar(
+        select(models.School.id).where(models.School.name == school_data.name).limit(1)
+    )
+
     if existing_school:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="School with this name already exists"
         )
-    
-    # Create school
+
+    # Create school, under the canonical district/municipality names
     db_school = models.School(
-        **school_data.dict(exclude={"training_sessions"})
+        **geo.geo_index.normalize(school_data.dict(exclude={"training_sessions"}))
     )
     db.add(db_school)
-    db.flush()  # Flush to get the ID but don't commit yet
-    
+    await db.flush()  # Flush to get the ID but don't commit yet
+
     # Add training sessions
     for session_data in school_data.training_sessions:
         db_session = models.TrainingSession(
@@ -86,89 +160,468 @@ def create_school(
             school_id=db_school.id
         )
         db.add(db_session)
-    
-    db.commit()
-    db.refresh(db_school)
-    
-    return db_school
+
+    await db.run_sync(
+        stats.apply_school_delta, db_school.district,
+        schools=1, active=1, sessions=len(school_data.training_sessions)
+    )
+    await db.run_sync(geo.register, db_school.district, db_school.municipality, db_school.ward_number)
+    await db.commit()
+    school_search.school_index.upsert(db_school)
+    await _invalidate_school(None, db_school.district)
+
+    return await _load_school(db, db_school.id)
+
+
+@router.post("/import", response_model=SchoolImportReport)
+async def import_schools(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Bulk-create schools (and their training sessions) from a CSV or XLSX file.
+    Each chunk of `chunk_size` rows is committed on its own; invalid rows are
+    skipped and listed in the report. With dry_run nothing is written.
+    """
+    if current_user.role not in ["admin", "committee_member"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create schools"
+        )
+
+    filename = (file.filename or "").lower()
+    if filename.endswith(".xlsx") or file.content_type == XLSX_CONTENT_TYPE:
+        read_rows = xlsx_rows
+    elif filename.endswith(".csv") or file.content_type in ("text/csv", "application/csv"):
+        read_rows = csv_rows
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a .csv or .xlsx file"
+        )
+
+    state = ImportState(dry_run=dry_run)
+    rows = read_rows(file.file)
+    try:
+        while True:
+            # File reads happen in the threadpool, one chunk at a time
+            chunk = await run_in_threadpool(take, rows, chunk_size)
+            if not chunk:
+                break
+            valid = []
+            for line, raw in chunk:
+                state.total_rows += 1
+                school, errors = parse_row(raw)
+                if errors:
+                    state.errors.append({"row": line, "errors": errors})
+                else:
+                    valid.append((line, school))
+            saved = state.checkpoint()
+            try:
+                await db.run_sync(import_chunk, valid, state)
+                if not dry_run:
+                    await db.commit()
+            except IntegrityError:
+                # A concurrent insert, or a duplicate only the database's collation sees
+                await db.rollback()
+                state.rollback_chunk(saved, valid)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse file after row {state.total_rows + 1}"
+        )
+
+    if state.schools_created and not dry_run:
+        school_search.school_index.invalidate()
+        geo.geo_index.invalidate()
+        await result_cache.invalidate("schools")
+    return state.report()
 
 
 @router.get("/", response_model=SchoolListResponse)
-def get_schools(
+async def get_schools(
     skip: int = 0,
     limit: int = 100,
     district: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    include_archived: bool = False,
+    cursor: Optional[str] = None,
+    sort: Literal["id", "name"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    count: Literal["exact", "estimate", "none"] = "exact",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    conditional: Conditional = Depends(conditional_get)
 ):
-    query = db.query(models.School).options(joinedload(models.School.training_sessions))
+    """
+    Offset pagination (skip/limit) is kept for existing clients. Passing the
+    `next_cursor` of a previous page as `cursor` switches to keyset pagination,
+    whose cost does not grow with page depth; `skip` is then ignored.
+    Supports If-None-Match: an unchanged page answers 304 after one
+    aggregate query, without loading the rows.
+    `fields` and `include` trim the items, e.g. `?fields=name&include=` for
+    a dropdown; only the requested columns are selected.
+    Pages are kept in the result cache per role scope and query, so a
+    repeated request (or its 304) needs no queries until a write in the
+    district invalidates it.
+    Without `is_active` only active schools are listed. `include_archived`
+    lists deleted and archived schools as well (with is_active=false, only
+    those).
+    """
+    projection, with_sessions = _projection(fields, include)
+    if is_active is None and not include_archived:
+        # Live rows only, through ix_schools_is_active_district
+        is_active = True
+    source = archive.with_archived() if include_archived else models.School
+    # Clients inside their read-your-writes window skip the cache like they skip replicas
+    use_cache = result_cache.enabled and not wrote_recently(conditional.request)
+    # The keyset cursor needs the sort value of the last row
+    selected = projection if sort in projection else projection + (sort,)
+    prepared = None
+
+    async def prepare():
+        """(page query, ETag, total, total_is_estimate), computed once per request."""
+        nonlocal prepared
+        if prepared is not None:
+            return prepared
+        query = select(*school_rows.columns(selected, source)).where(
+            *school_scope.school_filters(current_user, district, is_active, source)
+        )
+
+        total, total_is_estimate = await count_rows(db, query, count)
+
+        sort_column = getattr(source, SORT_FIELDS[sort])
+        descending = order == "desc"
+        page = query
+        if cursor:
+            try:
+                sort_value, last_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            page = page.where(keyset_filter(sort_column, source.id, sort_value, last_id, descending))
+        else:
+            page = page.offset(skip)
+
+        if descending:
+            page = page.order_by(sort_column.desc(), source.id.desc())
+        else:
+            page = page.order_by(sort_column, source.id)
+
+        # One extra row tells us whether there is a next page
+        page = page.limit(limit + 1)
+        etag, _ = await page_validators(
+            db, page, source.id, source.updated_at, total, conditional.request.url.query
+        )
+        prepared = page, etag, total, total_is_estimate
+        return prepared
+
+    async def validate() -> None:
+        # Answer 304 before loading rows, on a cache miss too
+        if conditional.is_conditional:
+            _, etag, _, _ = await prepare()
+            conditional.evaluate(etag)
 
-    # Role-based filtering
+    async def load() -> CachedResponse:
+        page, etag, total, total_is_estimate = await prepare()
+        result = await db.execute(page)
+        schools = school_rows.school_dicts(result.all(), selected)
+
+        next_cursor = None
+        if len(schools) > limit:
+            schools = schools[:limit]
+            last = schools[-1]
+            next_cursor = encode_cursor(last[sort], last["id"])
+        if selected is not projection:
+            for school in schools:
+                del school[sort]
+
+        if with_sessions:
+            await db.run_sync(school_rows.attach_sessions, schools, include_archived)
+
+        # Built from column tuples already; skip response-model validation
+        return CachedResponse(etag, FastJSONResponse({
+            "items": schools,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "next_cursor": next_cursor,
+        }).body)
+
+    entry = await result_cache.get_or_load(
+        cache_key("schools", school_scope.cache_scope(current_user),
+                  conditional.request.query_params.multi_items()),
+        school_scope.list_tags(current_user, district), load, bypass=not use_cache, validate=validate
+    )
+    # No Last-Modified: a row leaving the page does not advance max(updated_at)
+    conditional.evaluate(entry.etag)
+    return conditional.finish(_cached_json(entry))
+
+
+@router.get("/search", response_model=List[SchoolSearchHit])
+async def search_schools(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    district: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Typeahead over active schools by name, principal, area and municipality,
+    best match first. Results are limited to the schools the caller can see.
+    """
+    # Canonical spelling, as school_filters uses for listings
+    district = geo.geo_index.district_name(district)
+    school_id = None
     if current_user.role == "district_admin" and current_user.district:
-        query = query.filter(models.School.district == current_user.district)
+        if district and district != current_user.district:
+            return []
+        district = current_user.district
     elif current_user.role == "school_coordinator" and current_user.school_id:
-        query = query.filter(models.School.id == current_user.school_id)
-    # Admin has access to all schools
+        school_id = current_user.school_id
 
-    if district:
-        query = query.filter(models.School.district == district)
-    if is_active is not None:
-        query = query.filter(models.School.is_active == is_active)
+    hits = await db.run_sync(school_search.search, q, limit, district=district, school_id=school_id)
+    return [
+        {**{field: getattr(school, field) for field in SchoolSearchHit.model_fields if field != "score"},
+         "score": round(score, 4)}
+        for school, score in hits
+    ]
 
-    total = query.count()
-    schools = query.offset(skip).limit(limit).all()
 
-    return {"items": schools, "total": total}
+# One row per training session (schools without sessions get one row)
+EXPORT_SCHOOL_COLUMNS = [
+    "id", "name", "district", "municipality", "ward_number", "area_name", "official_email",
+    "phone_number", "website", "principal_name", "principal_contact", "teacher_name",
+    "teacher_contact", "notes", "is_active", "created_at", "updated_at",
+]
+EXPORT_SESSION_COLUMNS = ["id", "ncc_batch", "start_date", "passout_date", "division"]
 
 
-router = APIRouter(prefix="/schools", tags=["schools"])
+def _export_statement(current_user, district: Optional[str], is_active: Optional[bool]):
+    """(statement, column names) of a school export: one row per training session."""
+    statement = (
+        select(
+            *(getattr(models.School, c) for c in EXPORT_SCHOOL_COLUMNS),
+            *(getattr(models.TrainingSession, c) for c in EXPORT_SESSION_COLUMNS),
+        )
+        .outerjoin(models.TrainingSession, models.TrainingSession.school_id == models.School.id)
+        .where(*school_scope.school_filters(current_user, district, is_active))
+        .order_by(models.School.id, models.TrainingSession.id)
+    )
+    return statement, EXPORT_SCHOOL_COLUMNS + [f"session_{c}" for c in EXPORT_SESSION_COLUMNS]
 
 
-@router.get("/{school_id}", response_model=SchoolSchema)
-def get_school(
-    school_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/export")
+async def export_schools(
+    request: Request,
+    format: Literal["csv", "ndjson", "xlsx"] = "csv",
+    district: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    current_user: Principal = Depends(get_current_user)
 ):
-    db_school = (
-        db.query(models.School)
-        .options(joinedload(models.School.training_sessions))
-        .filter(models.School.id == school_id)
-        .first()
+    """
+    Stream every school visible to the caller, flattened to one row per
+    training session. Memory use does not depend on the number of rows.
+    """
+    statement, columns = _export_statement(current_user, district, is_active)
+    return StreamingResponse(
+        stream_export(statement, columns, format, read_only=not wrote_recently(request)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="schools_export.{format}"'},
     )
 
-    if not db_school:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="School not found"
+
+@router.post("/export", status_code=status.HTTP_202_ACCEPTED)
+async def queue_school_export(
+    format: Literal["csv", "ndjson", "xlsx"] = "csv",
+    district: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Same export as a background job, for exports too large to stream
+    within proxy timeouts. Download from /jobs/{id}/result once done.
+    """
+    return await queue_job(
+        db, "export_schools", {"format": format, "district": district, "is_active": is_active}, current_user
+    )
+
+
+@jobs.job_type("export_schools", params=SchoolExportParams, concurrency=2)
+async def export_schools_job(job: jobs.JobContext):
+    params = SchoolExportParams.model_validate(job.params)
+    statement, columns = _export_statement(await job.principal(), params.district, params.is_active)
+    job.progress(done=0, total=await count_export(statement, read_only=True))
+    await job.write_result(
+        stream_export(statement, columns, params.format, read_only=True, on_rows=job.advance),
+        f"schools_export.{params.format}", MEDIA_TYPES[params.format]
+    )
+    return {"rows": job.done}
+
+
+@router.post("/stats/rebuild", status_code=status.HTTP_202_ACCEPTED)
+async def queue_stats_rebuild(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Recompute school_stats from the base tables (manage.py rebuild-stats) as a job. Admin only."""
+    return await queue_job(db, "stats_rebuild", {}, current_user)
+
+
+@jobs.job_type("stats_rebuild", roles=["admin"], concurrency=1)
+async def rebuild_stats_job(job: jobs.JobContext):
+    job.progress(message="Recomputing school_stats")
+    async with open_session() as db:
+        districts = await db.run_sync(stats.rebuild)
+        await db.commit()
+    return {"districts": districts}
+
+
+@router.post("/archive", status_code=status.HTTP_202_ACCEPTED)
+async def queue_school_archive(
+    older_than_days: int = Query(settings.SCHOOL_ARCHIVE_AFTER_DAYS, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Move schools soft-deleted more than `older_than_days` ago, with their
+    training sessions, to the archive tables (manage.py archive-schools)
+    as a job. Admin only.
+    """
+    return await queue_job(db, "archive_schools", {"older_than_days": older_than_days}, current_user)
+
+
+@jobs.job_type("archive_schools", params=SchoolArchiveParams, roles=["admin"], concurrency=1)
+async def archive_schools_job(job: jobs.JobContext):
+    params = SchoolArchiveParams.model_validate(job.params)
+    before = archive.cutoff(params.older_than_days)
+    job.progress(done=0, message=f"Archiving schools inactive since before {before:%Y-%m-%d}")
+    schools = sessions = 0
+    while True:
+        async with open_session() as db:
+            batch = await db.run_sync(archive.candidates, before, settings.ARCHIVE_BATCH_SIZE)
+            if not batch:
+                break
+            moved, moved_sessions = await db.run_sync(archive.archive_batch, batch)
+            await db.commit()
+        schools += moved
+        sessions += moved_sessions
+        job.advance(moved)
+        await result_cache.invalidate(
+            "district:*", *sorted({f"district:{district}" for _, district in batch}),
+            *(f"school:{school_id}" for school_id, _ in batch)
         )
-    if current_user.role == "admin":
+    geo.geo_index.invalidate()
+    return {"schools": schools, "sessions": sessions}
+
+
+@router.get("/{school_id}", response_model=SchoolSchema)
+async def get_school(
+    school_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    conditional: Conditional = Depends(conditional_get)
+):
+    """
+    Supports If-None-Match / If-Modified-Since; a current copy gets 304
+    without loading the school, or without any query while it is in the
+    result cache. Accepts the same `fields` and `include` parameters as
+    the list; with `include_archived` an archived school is found too.
+    """
+    projection, with_sessions = _projection(fields, include)
+    use_cache = result_cache.enabled and not wrote_recently(conditional.request)
+    prepared = None
+
+    async def prepare():
+        """(version row, ETag, source table) after the access checks, computed once per request."""
+        nonlocal prepared
+        if prepared is not None:
+            return prepared
+        # The live row first: it wins should an archived school share its id
+        sources = (models.School, models.SchoolArchive) if include_archived else (models.School,)
+        for source in sources:
+            version = (await db.execute(
+                select(source.id, source.district, source.updated_at)
+                .where(source.id == school_id)
+            )).first()
+            if version:
+                break
+
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="School not found"
+            )
         # Admin can access any school
-        return db_school
-   
-    if (current_user.role == "district_admin" and 
-        db_school.district != current_user.district):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this school"
-        )
-    
-    if (current_user.role == "school_coordinator" and 
-        db_school.id != current_user.school_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this school"
-        )
-    
-    return db_school
+        if (current_user.role == "district_admin" and
+            version.district != current_user.district):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this school"
+            )
+
+        if (current_user.role == "school_coordinator" and
+            version.id != current_user.school_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this school"
+            )
+
+        prepared = version, entity_etag(version.id, version.updated_at, conditional.request.url.query), source
+        return prepared
+
+    async def validate() -> None:
+        # Answer 304 before loading the school, on a cache miss too
+        if conditional.is_conditional:
+            version, etag, _ = await prepare()
+            conditional.evaluate(etag, version.updated_at)
+
+    async def load() -> CachedResponse:
+        version, etag, source = await prepare()
+        if projection is school_rows.SCHOOL_FIELDS and with_sessions and source is models.School:
+            orm_school = await db.scalar(
+                select(models.School)
+                .options(selectinload(models.School.training_sessions))
+                .where(models.School.id == school_id)
+            )
+            school = SchoolSchema.model_validate(orm_school).model_dump(mode="json")
+        else:
+            row = (await db.execute(
+                select(*school_rows.columns(projection, source)).where(source.id == school_id)
+            )).one()
+            # Partial (or archived) representation; skip response-model validation
+            school = school_rows.school_dicts([row], projection)[0]
+            if with_sessions:
+                await db.run_sync(school_rows.attach_sessions, [school], source is models.SchoolArchive)
+        return CachedResponse(etag, FastJSONResponse(school).body, version.updated_at)
+
+    # Entries are per caller scope, so the access checks above hold for every hit
+    entry = await result_cache.get_or_load(
+        cache_key(f"school:{school_id}", school_scope.cache_scope(current_user),
+                  conditional.request.query_params.multi_items()),
+        ("schools", f"school:{school_id}"), load, bypass=not use_cache, validate=validate
+    )
+    conditional.evaluate(entry.etag, entry.last_modified)
+    return conditional.finish(_cached_json(entry))
 
 @router.put("/{school_id}", response_model=SchoolSchema)
-def update_school(
+async def update_school(
     school_id: int,
     school_data: SchoolUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     # Check permissions
     if current_user.role not in ["admin", "committee_member"]:
@@ -176,46 +629,122 @@ def update_school(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update schools"
         )
-    
-    db_school = db.query(models.School).filter(models.School.id == school_id).first()
-    
+
+    db_school = await db.get(models.School, school_id)
+
     if not db_school:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="School not found"
         )
-    
+
+    old_district = db_school.district
+
     # Update school fields
     update_data = school_data.dict(exclude={"training_sessions"}, exclude_unset=True)
+    place_changed = bool({"district", "municipality", "ward_number"} & update_data.keys())
+    if place_changed:
+        place = geo.geo_index.normalize({
+            "district": update_data.get("district") or db_school.district,
+            "municipality": update_data.get("municipality") or db_school.municipality,
+        })
+        update_data.update({name: place[name] for name in place if update_data.get(name)})
     for field, value in update_data.items():
         setattr(db_school, field, value)
-    
-    # Handle training sessions - this is a simplified approach
-    # In production, you might want a more sophisticated way to update sessions
+    if place_changed:
+        await db.run_sync(geo.register, db_school.district, db_school.municipality, db_school.ward_number)
+
+    # Sessions are diffed against the stored rows; only changes are written
+    changes = training_sessions.SessionChanges()
     if school_data.training_sessions:
-        # Delete existing sessions
-        db.query(models.TrainingSession).filter(
-            models.TrainingSession.school_id == school_id
-        ).delete()
-        
-        # Add new sessions
-        for session_data in school_data.training_sessions:
-            db_session = models.TrainingSession(
-                **session_data.dict(),
-                school_id=school_id
+        try:
+            changes = await db.run_sync(
+                training_sessions.sync_sessions, school_id,
+                [session.model_dump() for session in school_data.training_sessions]
             )
-            db.add(db_session)
-    
-    db.commit()
-    db.refresh(db_school)
-    
-    return db_school
+        except training_sessions.SessionNotFound as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        if changes.touched:
+            # Sessions are part of the school's representation (and its ETag)
+            db_school.updated_at = func.now()
+
+    # Keep school_stats in step within this transaction
+    if db_school.district != old_district:
+        total_sessions = await db.scalar(
+            select(func.count()).select_from(models.TrainingSession)
+            .where(models.TrainingSession.school_id == school_id)
+        )
+        # Cadets carry a copy of their school's district
+        moved = await db.execute(
+            update(Cadet).where(Cadet.school_id == school_id).values(district=db_school.district)
+        )
+        await db.run_sync(
+            stats.move_school, old_district, db_school.district, db_school.is_active,
+            total_sessions - changes.inserted + changes.deleted, moved.rowcount
+        )
+    await db.run_sync(
+        stats.apply_school_delta, db_school.district, sessions=changes.inserted - changes.deleted
+    )
+
+    await db.commit()
+    school_search.school_index.upsert(db_school)
+    await _invalidate_school(school_id, old_district, db_school.district)
+
+    return await _load_school(db, school_id)
+
+@router.patch("/{school_id}/training-sessions", response_model=TrainingSessionChanges)
+async def patch_training_sessions(
+    school_id: int,
+    operations: TrainingSessionPatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Add, remove (by id) and modify (by id, sent fields only) training
+    sessions of one school. Returns the number of rows inserted, updated
+    and deleted; unchanged modifications are not written.
+    """
+    if current_user.role not in ["admin", "committee_member"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update schools"
+        )
+
+    db_school = await db.get(models.School, school_id)
+
+    if not db_school:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="School not found"
+        )
+
+    try:
+        changes = await db.run_sync(
+            training_sessions.apply_operations, school_id,
+            [session.model_dump() for session in operations.add],
+            operations.remove,
+            [session.model_dump(exclude_unset=True) for session in operations.modify]
+        )
+    except training_sessions.SessionNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if changes.touched:
+        db_school.updated_at = func.now()
+        await db.run_sync(
+            stats.apply_school_delta, db_school.district, sessions=changes.inserted - changes.deleted
+        )
+        await db.commit()
+        await _invalidate_school(school_id, db_school.district)
+
+    return changes.report()
 
 @router.delete("/{school_id}")
-def delete_school(
+async def delete_school(
     school_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     # Only admin can delete schools
     if current_user.role != "admin":
@@ -223,17 +752,21 @@ def delete_school(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin can delete schools"
         )
-    
-    db_school = db.query(models.School).filter(models.School.id == school_id).first()
-    
+
+    db_school = await db.get(models.School, school_id)
+
     if not db_school:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="School not found"
         )
-    
+
     # Soft delete
+    if db_school.is_active:
+        await db.run_sync(stats.apply_school_delta, db_school.district, active=-1)
     db_school.is_active = False
-    db.commit()
-    
-    return {"message": "School deleted successfully"}
\ No newline at end of file
+    await db.commit()
+    school_search.school_index.upsert(db_school)
+    await _invalidate_school(school_id, db_school.district)
+
+    return {"message": "School deleted successfully"}
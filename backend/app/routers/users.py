@@ -1,17 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
 from app.core.database import get_db
 from app import models, schemas
-from app.core.security import hash_password
-from app.dependencies.deps import get_current_user  # use from deps.py
+from app.core.security import hash_password_async, hash_passwords_async
+from app.services.school_import import csv_rows, take
+from app.services.user_import import (
+    CREATOR_ROLES, ProvisionState, existing_values, insert_users, parse_row, screen_chunk
+)
+from app.dependencies.deps import Principal, get_current_user  # use from deps.py
+from app.services.geo import geo_index
 
 router = APIRouter()
 
 @router.post("/create", response_model=schemas.UserOut)
-def create_user(
+async def create_user(
     payload: schemas.UserCreate,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Province admin can create users for any district.
@@ -20,17 +32,18 @@ def create_user(
     if current_user.role not in ["province_admin", "district_admin"]:
         raise HTTPException(status_code=403, detail="Unauthorized to create users")
 
+    payload.district = geo_index.district_name(payload.district)
     if current_user.role == "district_admin":
         if payload.district and payload.district.lower() != current_user.district.lower():
             raise HTTPException(status_code=403, detail="Cannot create user outside your district")
         payload.district = current_user.district
 
     # Check uniqueness
-    if db.query(models.User).filter(models.User.email == payload.email).first():
+    if await db.scalar(select(models.User.id).where(models.User.email == payload.email).limit(1)):
         raise HTTPException(status_code=400, detail="Email already registered")
-    if db.query(models.User).filter(models.User.username == payload.username).first():
+    if await db.scalar(select(models.User.id).where(models.User.username == payload.username).limit(1)):
         raise HTTPException(status_code=400, detail="Username already taken")
-    if db.query(models.User).filter(models.User.cadet_number == payload.cadet_number).first():
+    if await db.scalar(select(models.User.id).where(models.User.cadet_number == payload.cadet_number).limit(1)):
         raise HTTPException(status_code=400, detail="Cadet number already registered")
 
     # Create user
@@ -42,15 +55,120 @@ def create_user(
         address=payload.address,
         district=payload.district,
         role=payload.role,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
+async def _bulk_rows(request: Request):
+    """(row number, row) pairs from a JSON array, a text/csv body or a multipart `file` upload."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload the CSV as `file`")
+        return csv_rows(upload.file)
+    if content_type in ("text/csv", "application/csv"):
+        return csv_rows(io.BytesIO(await request.body()))
+    if content_type == "application/json":
+        try:
+            body = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body is not valid JSON")
+        if isinstance(body, dict):
+            body = body.get("users")
+        if not isinstance(body, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Send a JSON array of users (or {\"users\": [...]})"
+            )
+        return iter(enumerate(body, start=1))
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send application/json, text/csv or a multipart CSV upload"
+    )
+
+
+_BULK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": schemas.UserCreate.model_json_schema()}},
+            "text/csv": {"schema": {"type": "string"}},
+            "multipart/form-data": {
+                "schema": {"type": "object", "properties": {"file": {"type": "string", "format": "binary"}}}
+            },
+        },
+    }
+}
+
+
+@router.post("/bulk", response_model=schemas.UserBulkReport, openapi_extra=_BULK_BODY)
+async def create_users_bulk(
+    request: Request,
+    dry_run: bool = False,
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=5000),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many users at once, with the same rules as /users/create.
+    Accepts a JSON array of UserCreate objects or CSV with those columns.
+    Each chunk of `chunk_size` rows is committed on its own; the report
+    gives every row's outcome. With dry_run nothing is hashed or written.
+    """
+    if current_user.role not in CREATOR_ROLES:
+        raise HTTPException(status_code=403, detail="Unauthorized to create users")
+
+    state = ProvisionState(dry_run=dry_run)
+    rows = await _bulk_rows(request)
+    try:
+        while True:
+            chunk = await run_in_threadpool(take, rows, chunk_size)
+            if not chunk:
+                break
+            valid = []
+            for line, raw in chunk:
+                state.total_rows += 1
+                user, errors = parse_row(raw, current_user)
+                if errors:
+                    state.reject(line, errors, raw.get("username") if isinstance(raw, dict) else None)
+                else:
+                    valid.append((line, user))
+            if not valid:
+                continue
+
+            taken = await db.run_sync(existing_values, [user for _, user in valid])
+            accepted = screen_chunk(valid, taken, state)
+            if dry_run or not accepted:
+                for line, user in accepted:
+                    state.accept(line, user.username)
+                continue
+
+            hashes = await hash_passwords_async([user.password for _, user in accepted])
+            try:
+                ids = await db.run_sync(insert_users, accepted, hashes)
+                await db.commit()
+            except IntegrityError:
+                # A concurrent write, or a duplicate only the database's collation sees
+                await db.rollback()
+                for line, user in accepted:
+                    state.reject(line, ["Not created: its chunk hit a unique constraint; resubmit this row"], user.username)
+                continue
+            for line, user in accepted:
+                state.accept(line, user.username, ids[user.username])
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse CSV after row {state.total_rows + 1}"
+        )
+    return state.report()
+
 @router.get("/me")
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return {
         "id": current_user.id,
         "username": current_user.username,
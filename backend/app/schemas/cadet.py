@@ -0,0 +1,85 @@
+from pydantic import BaseModel, EmailStr, Field, AliasChoices, ConfigDict
+from typing import Literal, Optional, List
+from datetime import datetime
+
+# The cadet form in "Cadet Management.html" posts cadet_no/name/name_np/contact/school/batch;
+# those names are accepted as aliases of the stored field names.
+
+class CadetBase(BaseModel):
+    cadet_number: str = Field(..., min_length=1, max_length=50,
+                              validation_alias=AliasChoices("cadet_number", "cadet_no"))
+    full_name_en: str = Field(..., min_length=2, max_length=150,
+                              validation_alias=AliasChoices("full_name_en", "name"))
+    full_name_np: Optional[str] = Field(None, validation_alias=AliasChoices("full_name_np", "name_np"))
+    rank: str
+    gender: str
+    phone: Optional[str] = Field(None, validation_alias=AliasChoices("phone", "contact"))
+    email: Optional[EmailStr] = None
+    address: Optional[str] = None
+    school_id: int = Field(..., validation_alias=AliasChoices("school_id", "school"))
+    training_session_id: Optional[int] = Field(None, validation_alias=AliasChoices("training_session_id", "batch"))
+    passout_year: Optional[int] = None
+    guardian_name: Optional[str] = None
+    guardian_contact: Optional[str] = None
+    relation: Optional[str] = None
+
+class CadetCreate(CadetBase):
+    pass
+
+# Partial update: only fields sent are changed
+class CadetUpdate(BaseModel):
+    cadet_number: Optional[str] = Field(None, min_length=1, max_length=50,
+                                        validation_alias=AliasChoices("cadet_number", "cadet_no"))
+    full_name_en: Optional[str] = Field(None, min_length=2, max_length=150,
+                                        validation_alias=AliasChoices("full_name_en", "name"))
+    full_name_np: Optional[str] = Field(None, validation_alias=AliasChoices("full_name_np", "name_np"))
+    rank: Optional[str] = None
+    gender: Optional[str] = None
+    phone: Optional[str] = Field(None, validation_alias=AliasChoices("phone", "contact"))
+    email: Optional[EmailStr] = None
+    address: Optional[str] = None
+    school_id: Optional[int] = Field(None, validation_alias=AliasChoices("school_id", "school"))
+    training_session_id: Optional[int] = Field(None, validation_alias=AliasChoices("training_session_id", "batch"))
+    passout_year: Optional[int] = None
+    guardian_name: Optional[str] = None
+    guardian_contact: Optional[str] = None
+    relation: Optional[str] = None
+
+class Cadet(BaseModel):
+    id: int
+    cadet_number: str
+    full_name_en: str
+    full_name_np: Optional[str] = None
+    rank: str
+    gender: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    district: str
+    school_id: int
+    training_session_id: Optional[int] = None
+    passout_year: Optional[int] = None
+    guardian_name: Optional[str] = None
+    guardian_contact: Optional[str] = None
+    relation: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # Display names used by the cadet table
+    school_name: Optional[str] = None
+    district_name: Optional[str] = None
+    batch_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CadetListResponse(BaseModel):
+    items: List[Cadet]
+    total: int
+
+
+class CadetExportParams(BaseModel):
+    """Params of export_cadets jobs; the query parameters of GET /cadets/export."""
+    format: Literal["csv", "ndjson", "xlsx"] = "csv"
+    district: Optional[str] = None
+    rank: Optional[str] = None
+    school_id: Optional[int] = None
+    search: Optional[str] = None
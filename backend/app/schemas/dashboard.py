@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class RollupTotals(BaseModel):
+    schools: int
+    active_schools: int
+    sessions: int
+    junior: int
+    senior: int
+
+
+class SchoolsByArea(BaseModel):
+    district: str
+    municipality: str
+    schools: int
+    active_schools: int
+
+
+class SessionsByBatch(BaseModel):
+    ncc_batch: str
+    year: Optional[int] = None  # of start_date
+    sessions: int
+    junior: int
+    senior: int
+
+
+class DivisionsByDistrict(BaseModel):
+    district: str
+    sessions: int  # may exceed junior + senior when other division names are used
+    junior: int
+    senior: int
+
+
+class DashboardRollups(BaseModel):
+    totals: RollupTotals
+    schools_by_area: List[SchoolsByArea]
+    sessions_by_batch: List[SessionsByBatch]
+    divisions_by_district: List[DivisionsByDistrict]
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class GeoCounts(BaseModel):
+    schools: int
+    active_schools: int
+    sessions: int
+
+
+class WardNode(GeoCounts):
+    ward: Optional[int] = None
+
+
+class MunicipalityNode(GeoCounts):
+    name: str
+    ward_count: Optional[int] = None  # highest ward number registered
+    wards: List[WardNode]
+
+
+class DistrictNode(GeoCounts):
+    name: str
+    province: Optional[str] = None
+    municipalities: List[MunicipalityNode]
+
+
+class GeoTree(BaseModel):
+    districts: List[DistrictNode]
+    totals: GeoCounts
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class JobCreate(BaseModel):
+    type: str
+    params: Dict[str, Any] = {}
+
+
+class Job(BaseModel):
+    id: int
+    type: str
+    status: str
+    params: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    progress_done: int
+    progress_total: Optional[int] = None
+    message: Optional[str] = None
+    error: Optional[str] = None
+    # Small JSON results; files are downloaded from /jobs/{id}/result
+    result: Optional[Any] = None
+    result_filename: Optional[str] = None
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import date, datetime
 
 # -------------------
@@ -15,11 +15,33 @@ class TrainingSessionBase(BaseModel):
 class TrainingSessionCreate(TrainingSessionBase):
     pass
 
+# In PUT /schools/{id}: matched to an existing session by id, else by (ncc_batch, division)
+class TrainingSessionUpsert(TrainingSessionBase):
+    id: Optional[int] = None
+
 class TrainingSession(TrainingSessionBase):
     id: int
     school_id: int
     model_config = ConfigDict(from_attributes=True)  # replaces orm_mode = True
 
+class TrainingSessionModify(BaseModel):
+    id: int
+    ncc_batch: Optional[str] = None
+    start_date: Optional[date] = None
+    passout_date: Optional[date] = None
+    division: Optional[str] = None
+
+# Body of PATCH /schools/{id}/training-sessions
+class TrainingSessionPatch(BaseModel):
+    add: List[TrainingSessionCreate] = []
+    remove: List[int] = []  # session ids
+    modify: List[TrainingSessionModify] = []  # only the fields sent are changed
+
+class TrainingSessionChanges(BaseModel):
+    inserted: int
+    updated: int
+    deleted: int
+
 
 # -------------------
 # School Schemas
@@ -58,7 +80,7 @@ class SchoolUpdate(BaseModel):
     teacher_name: Optional[str] = None
     teacher_contact: Optional[str] = None
     notes: Optional[str] = None
-    training_sessions: Optional[List[TrainingSessionCreate]] = None
+    training_sessions: Optional[List[TrainingSessionUpsert]] = None
 
 class School(SchoolBase):
     id: int
@@ -71,4 +93,42 @@ class School(SchoolBase):
 
 class SchoolListResponse(BaseModel):
     items: List[School]
-    total: int
+    total: Optional[int] = None  # None when count=none
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
+class SchoolSearchHit(BaseModel):
+    id: int
+    name: str
+    district: str
+    municipality: str
+    area_name: Optional[str] = None
+    principal_name: str
+    score: float  # 0..1, higher is better
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SchoolImportRowError(BaseModel):
+    row: int  # line/row number in the uploaded file (header is row 1)
+    errors: List[str]
+
+class SchoolImportReport(BaseModel):
+    dry_run: bool
+    total_rows: int
+    schools_created: int  # would be created, for dry runs
+    sessions_created: int
+    errors: List[SchoolImportRowError]
+
+
+class SchoolExportParams(BaseModel):
+    """Params of export_schools jobs; the query parameters of GET /schools/export."""
+    format: Literal["csv", "ndjson", "xlsx"] = "csv"
+    district: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class SchoolArchiveParams(BaseModel):
+    """Params of archive_schools jobs; days inactive before a school is archived."""
+    older_than_days: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 
 # For creating a new user
 class UserCreate(BaseModel):
@@ -26,6 +26,21 @@ class UserOut(BaseModel):
     class Config:
         from_attributes = True
 
+# Outcome of one row of POST /users/bulk
+class UserBulkRowResult(BaseModel):
+    row: int
+    status: str  # created / valid (dry run) / error
+    id: Optional[int] = None
+    username: Optional[str] = None
+    errors: List[str] = []
+
+class UserBulkReport(BaseModel):
+    dry_run: bool
+    total_rows: int
+    created: int
+    failed: int
+    results: List[UserBulkRowResult]
+
 # For login
 class LoginIn(BaseModel):
     email: Optional[EmailStr] = None
@@ -36,6 +51,16 @@ class LoginIn(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: Optional[int] = None  # access token lifetime, seconds
+    refresh_token: Optional[str] = None
+
+class RefreshIn(BaseModel):
+    refresh_token: str
+
+# Revokes the caller's current session, the session of refresh_token, or all of them
+class LogoutIn(BaseModel):
+    refresh_token: Optional[str] = None
+    all_sessions: bool = False
 
 # Generic message response
 class Message(BaseModel):
@@ -0,0 +1,103 @@
+"""
+Archival of soft-deleted schools.
+
+DELETE /schools/{id} only marks a school inactive. Once it has stayed
+inactive for the retention period (judged by updated_at, which the delete
+sets), it and its training sessions are moved to schools_archive and
+training_sessions_archive: INSERT ... SELECT then DELETE, a batch of
+schools per transaction, with school_stats adjusted in the same
+transaction. Ids are kept, so archived schools stay addressable with
+include_archived; schools and training_sessions never reuse an id
+(AUTOINCREMENT on SQLite), and a school whose id, or one of whose
+session ids, is already archived is left in place rather than shadowing
+it. Schools that cadets still reference are left in place too.
+
+Run as the archive_schools job (POST /schools/archive) or on a schedule
+with `python manage.py archive-schools`.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import delete, exists, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models.cadet import Cadet
+from app.models.school import School, SchoolArchive, TrainingSession, TrainingSessionArchive
+from app.services import stats
+from app.utils.timestamps import utcnow
+
+SCHOOL_COLUMNS = tuple(column.name for column in School.__table__.columns)
+SESSION_COLUMNS = tuple(column.name for column in TrainingSession.__table__.columns)
+
+
+def cutoff(days: int) -> datetime:
+    # updated_at comes from the database clock; its zone does not matter at a granularity of days
+    return utcnow() - timedelta(days=days)
+
+
+def candidates(session: Session, before: datetime, limit: int) -> List[Tuple[int, str]]:
+    """
+    (id, district) of up to `limit` schools inactive since before `before`,
+    without cadets and without an id already in the archive tables.
+    """
+    return session.execute(
+        select(School.id, School.district)
+        .where(
+            School.is_active == False,
+            School.updated_at < before,
+            ~exists().where(Cadet.school_id == School.id),
+            ~exists().where(SchoolArchive.id == School.id),
+            ~exists().where(
+                TrainingSession.school_id == School.id,
+                TrainingSessionArchive.id == TrainingSession.id,
+            ),
+        )
+        .order_by(School.id)
+        .limit(limit)
+    ).tuples().all()
+
+
+def archive_batch(session: Session, schools: List[Tuple[int, str]]) -> Tuple[int, int]:
+    """Move these schools and their sessions to the archive tables; returns (schools, sessions)."""
+    if not schools:
+        return 0, 0
+    ids = [school_id for school_id, _ in schools]
+    sessions_by_district = dict(session.execute(
+        select(School.district, func.count(TrainingSession.id))
+        .join(TrainingSession, TrainingSession.school_id == School.id)
+        .where(School.id.in_(ids))
+        .group_by(School.district)
+    ).tuples().all())
+
+    session.execute(insert(SchoolArchive).from_select(
+        SCHOOL_COLUMNS + ("archived_at",),
+        select(*(School.__table__.c[name] for name in SCHOOL_COLUMNS), literal(utcnow()))
+        .where(School.id.in_(ids))
+    ))
+    session.execute(insert(TrainingSessionArchive).from_select(
+        SESSION_COLUMNS,
+        select(*(TrainingSession.__table__.c[name] for name in SESSION_COLUMNS))
+        .where(TrainingSession.school_id.in_(ids))
+    ))
+    session.execute(delete(TrainingSession).where(TrainingSession.school_id.in_(ids)))
+    session.execute(delete(School).where(School.id.in_(ids)))
+
+    # Archived schools leave the counters; they were already out of active_schools
+    for district, count in Counter(district for _, district in schools).items():
+        stats.apply_school_delta(
+            session, district, schools=-count, sessions=-sessions_by_district.get(district, 0)
+        )
+    return len(ids), sum(sessions_by_district.values())
+
+
+def with_archived():
+    """
+    An alias of School over live and archived rows (UNION ALL), for
+    include_archived reads; filter and select through it like School.
+    """
+    rows = union_all(
+        select(*(School.__table__.c[name] for name in SCHOOL_COLUMNS)),
+        select(*(SchoolArchive.__table__.c[name] for name in SCHOOL_COLUMNS)),
+    ).subquery("schools_with_archived")
+    return aliased(School, rows)
@@ -0,0 +1,290 @@
+"""
+Administrative geography: district -> municipality -> ward.
+
+The districts and municipalities tables are the reference; GeoIndex holds
+them in memory with per-node school and training session counts, plus the
+rendered GET /geo/tree body and its ETag. The index is loaded at startup
+and rebuilt on the next read after a school write in this process (other
+processes rebuild within GEO_TREE_TTL seconds).
+
+School writes pass district and municipality names through the index, so
+spelling variants ("palpa ", "Bardia", "Nawalparasi West") are stored under
+one canonical name and equality filters on schools.district hit its
+indexes. Unknown names keep their spelling (spaces tidied) and are
+registered as new reference rows.
+"""
+import asyncio
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.dependencies.conditional import body_etag
+from app.models.geo import District, Municipality
+from app.models.school import School, TrainingSession
+
+# Spellings in use for districts whose official names changed or vary
+DISTRICT_ALIASES = {
+    "bardia": "Bardiya",
+    "dang deukhuri": "Dang",
+    "rukum east": "Eastern Rukum",
+    "east rukum": "Eastern Rukum",
+    "rukum (east)": "Eastern Rukum",
+    "nawalparasi west": "Parasi",
+    "west nawalparasi": "Parasi",
+    "nawalparasi (west)": "Parasi",
+    "nawalparasi (bardaghat susta west)": "Parasi",
+}
+
+_SPACES = re.compile(r"\s+")
+
+
+def _tidy(name: str) -> str:
+    return _SPACES.sub(" ", name).strip()
+
+
+def _key(name: str) -> str:
+    return _tidy(name).casefold()
+
+
+def _counts(schools: int = 0, active: int = 0, sessions: int = 0) -> dict:
+    return {"schools": schools, "active_schools": active, "sessions": sessions}
+
+
+def _add(node: dict, counts: dict) -> None:
+    for name, value in counts.items():
+        node[name] += value
+
+
+def load_tree(session: Session) -> Tuple[dict, list]:
+    """
+    The reference tables with counts from two GROUP BY queries, as nested
+    dicts keyed by name, and the reference places as (district,
+    municipality or None, ward_count) tuples.
+    """
+    tree, names, reference = {}, {}, []
+    for district_id, name, province in session.execute(
+        select(District.id, District.name, District.province).order_by(District.name)
+    ):
+        names[district_id] = name
+        reference.append((name, None, None))
+        tree[name] = {"name": name, "province": province, **_counts(), "municipalities": {}}
+    for district_id, name, ward_count in session.execute(
+        select(Municipality.district_id, Municipality.name, Municipality.ward_count).order_by(Municipality.name)
+    ):
+        reference.append((names[district_id], name, ward_count))
+        tree[names[district_id]]["municipalities"][name] = {
+            "name": name, "ward_count": ward_count, **_counts(), "wards": {}
+        }
+
+    area = (School.district, School.municipality, School.ward_number)
+    school_rows = session.execute(
+        select(*area, func.count(), func.sum(case((School.is_active == True, 1), else_=0)))
+        .group_by(*area)
+    ).all()
+    session_rows = session.execute(
+        select(*area, func.count())
+        .select_from(TrainingSession).join(School, School.id == TrainingSession.school_id)
+        .group_by(*area)
+    ).all()
+
+    def nodes(district, municipality, number):
+        # Schools written before sync-geo may name places not yet in the reference
+        d = tree.setdefault(district, {"name": district, "province": None, **_counts(), "municipalities": {}})
+        m = d["municipalities"].setdefault(
+            municipality, {"name": municipality, "ward_count": None, **_counts(), "wards": {}}
+        )
+        return d, m, m["wards"].setdefault(number, {"ward": number, **_counts()})
+
+    for district, municipality, number, schools, active in school_rows:
+        for node in nodes(district, municipality, number):
+            _add(node, _counts(schools=schools, active=active or 0))
+    for district, municipality, number, sessions in session_rows:
+        for node in nodes(district, municipality, number):
+            _add(node, _counts(sessions=sessions))
+    return tree, reference
+
+
+def _render(tree: dict) -> dict:
+    districts = []
+    totals = _counts()
+    for district in tree.values():
+        municipalities = []
+        for municipality in district["municipalities"].values():
+            wards = [municipality["wards"][n] for n in sorted(municipality["wards"], key=lambda n: (n is None, n))]
+            municipalities.append({**municipality, "wards": wards})
+        districts.append({**district, "municipalities": municipalities})
+        _add(totals, {name: district[name] for name in totals})
+    return {"districts": districts, "totals": totals}
+
+
+class GeoIndex:
+    """In-process copy of the geography tree; rebuilt in place, read without locks."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self._districts: Dict[str, str] = {}  # name key -> district
+        self._municipalities: Dict[Tuple[str, str], str] = {}  # (district, name key) -> municipality
+        self._ward_counts: Dict[Tuple[str, str], Optional[int]] = {}  # (district, municipality) -> wards
+        self._loaded_at = 0.0
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.body is not None
+
+    def district_name(self, name: Optional[str], pending: Optional[dict] = None) -> Optional[str]:
+        """
+        Canonical spelling of a district name. A new name is only tidied, as
+        written ("KTM" stays "KTM"); pass `pending` as for municipality_name.
+        """
+        if not name:
+            return name
+        key = _key(name)
+        known = self._districts.get(key) or DISTRICT_ALIASES.get(key)
+        if known is None and pending is not None:
+            known = pending.setdefault(key, _tidy(name))
+        return known or _tidy(name)
+
+    def municipality_name(self, district: str, name: Optional[str],
+                          pending: Optional[dict] = None) -> Optional[str]:
+        """
+        Canonical spelling of a municipality within its (canonical) district.
+        A new name is tidied; pass `pending` to make later spellings within
+        one batch follow the first.
+        """
+        if not name:
+            return name
+        key = (district, _key(name))
+        known = self._municipalities.get(key)
+        if known is None and pending is not None:
+            known = pending.setdefault(key, _tidy(name))
+        return known or _tidy(name)
+
+    def normalize(self, values: dict, pending: Optional[dict] = None) -> dict:
+        """Canonicalize the district/municipality of school field values, in place."""
+        if values.get("district"):
+            values["district"] = self.district_name(values["district"], pending)
+        if values.get("municipality") and values.get("district"):
+            values["municipality"] = self.municipality_name(values["district"], values["municipality"], pending)
+        return values
+
+    def covers(self, district: str, municipality: str, ward_number: Optional[int] = None) -> bool:
+        """Whether the reference already has this place (and at least this many wards)."""
+        if (district, _key(municipality)) not in self._municipalities:
+            return False
+        ward_count = self._ward_counts.get((district, municipality))
+        return ward_number is None or (ward_count is not None and ward_number <= ward_count)
+
+    def _remember(self, district: str, municipality: Optional[str], ward_count: Optional[int]) -> None:
+        self._districts.setdefault(_key(district), district)
+        if municipality is not None:
+            self._municipalities.setdefault((district, _key(municipality)), municipality)
+            self._ward_counts[(district, municipality)] = ward_count
+
+    def load(self, session: Session) -> None:
+        tree, reference = load_tree(session)
+        # Only reference rows are canonical; names found only on schools are not
+        self._districts, self._municipalities, self._ward_counts = {}, {}, {}
+        for place in reference:
+            self._remember(*place)
+        body = FastJSONResponse(_render(tree)).body
+        self.body, self.etag = body, body_etag(body)
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def invalidate(self) -> None:
+        """Rebuild on the next read; call after committing a school write."""
+        self._stale = True
+
+    async def ensure_fresh(self, db) -> None:
+        """Rebuild if invalidated or older than the TTL; concurrent callers share one rebuild."""
+        if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        async with self._lock:
+            if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            await db.run_sync(self.load)
+
+
+geo_index = GeoIndex(settings.GEO_TREE_TTL)
+
+
+def _get_or_add(session: Session, model, key: dict, **values):
+    """The `model` row with these unique `key` values, inserted if missing."""
+    query = select(model).filter_by(**key)
+    row = session.scalar(query)
+    if row is None:
+        # A concurrent write may add the same place first; its row is kept, not a 500
+        session.execute(
+            insert(model).values(**key, **values)
+            .prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        # A locking read sees that row even when committed after this transaction's snapshot
+        row = session.scalar(query.with_for_update())
+    return row
+
+
+def register(session: Session, district: str, municipality: str, ward_number: Optional[int] = None) -> None:
+    """
+    Add a district or municipality the reference does not have yet, and
+    raise a municipality's ward_count to `ward_number`. Call with canonical
+    names inside the write's transaction; a known place costs no query.
+    """
+    if geo_index.covers(district, municipality, ward_number):
+        return
+    district_row = _get_or_add(session, District, {"name": district})
+    row = _get_or_add(
+        session, Municipality, {"district_id": district_row.id, "name": municipality}, ward_count=ward_number
+    )
+    if ward_number is not None and (row.ward_count or 0) < ward_number:
+        row.ward_count = ward_number
+
+
+def sync_reference(session: Session) -> Dict[str, int]:
+    """
+    Canonicalize district and municipality names already stored on schools,
+    users and cadets, and register every place in use. For `manage.py sync-geo`.
+    """
+    from app.models.cadet import Cadet
+    from app.models.user import User
+
+    geo_index.load(session)
+    renamed = {"schools": 0, "users": 0, "cadets": 0}
+    # The most used spelling of a district new to the reference becomes its name
+    districts = {}
+    for model, table in ((School, "schools"), (User, "users"), (Cadet, "cadets")):
+        for (name,) in session.execute(
+            select(model.district).group_by(model.district).order_by(func.count().desc(), model.district)
+        ).all():
+            canonical = geo_index.district_name(name, districts)
+            if name and canonical != name:
+                renamed[table] += session.execute(
+                    model.__table__.update().where(model.district == name).values(district=canonical)
+                ).rowcount
+
+    # The most used spelling of a municipality new to the reference becomes its name
+    spellings = {}
+    for district, municipality, wards in session.execute(
+        select(School.district, School.municipality, func.max(School.ward_number))
+        .group_by(School.district, School.municipality)
+        .order_by(School.district, func.count().desc(), School.municipality)
+    ).all():
+        canonical = geo_index.municipality_name(district, municipality, spellings)
+        if canonical != municipality:
+            renamed["schools"] += session.execute(
+                School.__table__.update()
+                .where(School.district == district, School.municipality == municipality)
+                .values(municipality=canonical)
+            ).rowcount
+        register(session, district, canonical, wards)
+        session.flush()
+    geo_index.invalidate()
+    return renamed
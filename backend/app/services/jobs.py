@@ -0,0 +1,411 @@
+"""
+In-process background jobs, queued in the jobs table.
+
+Register a job type where its work lives (usually next to the endpoint it
+replaces), then submit from any router:
+
+    @jobs.job_type("stats_rebuild", roles=["admin"], concurrency=1)
+    async def rebuild_stats_job(job: jobs.JobContext):
+        job.progress(message="rebuilding")
+        ...
+        return {"districts": n}  # stored as the job's JSON result
+
+    job = await jobs.submit(db, "stats_rebuild", {}, current_user)
+
+Every process started with JOB_WORKERS > 0 runs a JobRunner (see the
+lifespan in app.main). The runners coordinate through the table only:
+a queued job is claimed with a conditional UPDATE, so exactly one runner
+gets it, and the claim is a lease renewed every JOB_POLL_INTERVAL seconds
+together with the job's progress. Jobs whose lease is older than
+JOB_STALE_SECONDS (the worker died) are requeued, so queued and
+interrupted work resumes after a restart. A failed attempt is retried
+after JOB_RETRY_DELAY seconds, doubled per attempt, up to the type's
+max_attempts. Cancelling a running job cancels its task at the owning
+runner's next heartbeat (at once when it runs in the same process).
+Housekeeping (requeueing stale jobs, deleting finished jobs and their
+result files after JOB_RESULT_TTL) runs every JOB_STALE_SECONDS rather
+than on every poll.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import open_session
+from app.core.metrics import registry
+from app.models.job import FINISHED_STATUSES, Job
+from app.models.user import User
+from app.utils.timestamps import utcnow
+
+logger = logging.getLogger(__name__)
+
+FINISHED = registry.counter("jobs_finished_total", "Background job attempts by outcome.", ("type", "status"))
+RUNNING = registry.gauge("jobs_running", "Background jobs running in this process.", ("type",))
+
+
+class EmptyParams(BaseModel):
+    pass
+
+
+@dataclass
+class JobType:
+    name: str
+    handler: Callable[["JobContext"], Awaitable[Optional[dict]]]
+    params: Type[BaseModel]
+    roles: Optional[List[str]]  # None: any authenticated user
+    concurrency: int  # per process
+    max_attempts: int
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(name: str, params: Type[BaseModel] = EmptyParams, roles: Optional[List[str]] = None,
+             concurrency: int = 1, max_attempts: Optional[int] = None):
+    """Register `handler(job: JobContext) -> Optional[dict]` as job type `name`."""
+    def register(handler):
+        JOB_TYPES[name] = JobType(
+            name, handler, params, roles, concurrency, max_attempts or settings.JOB_MAX_ATTEMPTS
+        )
+        return handler
+    return register
+
+
+class JobNotAllowed(Exception):
+    pass
+
+
+async def submit(db, type: str, params: dict, user) -> Job:
+    """
+    Validate `params` against the type's model and queue a job for `user`.
+    Raises KeyError for an unknown type, JobNotAllowed for the wrong role
+    and pydantic.ValidationError for bad params. Commits `db`.
+    """
+    spec = JOB_TYPES[type]
+    if spec.roles is not None and user.role not in spec.roles:
+        raise JobNotAllowed(f"Not authorized to run {type} jobs")
+    job = Job(
+        type=type,
+        params=spec.params.model_validate(params).model_dump(mode="json"),
+        created_by=user.id,
+        max_attempts=spec.max_attempts,
+    )
+    db.add(job)
+    await db.commit()
+    runner.wake()
+    return job
+
+
+async def cancel(db, job: Job) -> Job:
+    """Cancel a queued job at once; ask the runner of a running one to stop it."""
+    await db.execute(
+        update(Job).where(Job.id == job.id, Job.status.not_in(FINISHED_STATUSES)).values(cancel_requested=True)
+    )
+    await db.execute(
+        update(Job).where(Job.id == job.id, Job.status == "queued")
+        .values(status="cancelled", finished_at=utcnow())
+    )
+    await db.commit()
+    runner.cancel_local(job.id)
+    return await db.scalar(select(Job).where(Job.id == job.id).execution_options(populate_existing=True))
+
+
+@dataclass
+class JobContext:
+    """What a handler gets: its params, progress reporting and result output."""
+    id: int
+    type: str
+    params: dict
+    user_id: Optional[int]
+    attempt: int
+    done: int = 0
+    total: Optional[int] = None
+    message: Optional[str] = None
+    cancel_requested: bool = False
+    result_file: Optional[tuple] = field(default=None, repr=False)  # (path, filename, media type)
+
+    def progress(self, done: Optional[int] = None, total: Optional[int] = None,
+                 message: Optional[str] = None) -> None:
+        """Record progress; written to the jobs row with the next heartbeat."""
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message[:255]
+
+    def advance(self, count: int = 1) -> None:
+        self.done += count
+
+    async def principal(self):
+        """The submitting user as it is now, in the shape get_current_user returns."""
+        from app.dependencies.deps import Principal
+
+        async with open_session() as db:
+            user = await db.get(User, self.user_id) if self.user_id else None
+        if user is None:
+            raise RuntimeError("The user who submitted this job no longer exists")
+        return Principal.from_user(user)
+
+    async def write_result(self, chunks: AsyncIterator[bytes], filename: str, media_type: str) -> None:
+        """Store a byte stream (e.g. a stream_export body) as the job's downloadable result."""
+        directory = Path(settings.JOB_RESULT_DIR) / str(self.id)
+        await run_in_threadpool(directory.mkdir, parents=True, exist_ok=True)
+        partial = directory / (filename + ".part")
+        handle = await run_in_threadpool(open, partial, "wb")
+        try:
+            async for chunk in chunks:
+                if chunk:
+                    await run_in_threadpool(handle.write, chunk)
+        finally:
+            await run_in_threadpool(handle.close)
+        path = directory / filename
+        await run_in_threadpool(os.replace, partial, path)
+        self.result_file = (str(path), filename, media_type)
+
+
+def _remove_result(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+class JobRunner:
+    """Claims and runs jobs in this process; one scheduler task plus one task per job."""
+
+    def __init__(self):
+        self.worker_id: Optional[str] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._contexts: Dict[int, JobContext] = {}
+        self._housekept_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None
+
+    def start(self) -> None:
+        if settings.JOB_WORKERS <= 0 or self._scheduler is not None:
+            return
+        # Set here rather than at import, so forked workers get distinct ids
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = asyncio.Event()
+        self._housekept_at = None
+        self._scheduler = asyncio.create_task(self._loop(), name="job-scheduler")
+
+    async def stop(self) -> None:
+        """Stop claiming and requeue jobs still running here, so another runner resumes them."""
+        if self._scheduler is None:
+            return
+        self._scheduler.cancel()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(self._scheduler, *tasks, return_exceptions=True)
+        self._scheduler = None
+
+    def wake(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def cancel_local(self, job_id: int) -> None:
+        context = self._contexts.get(job_id)
+        if context is not None:
+            context.cancel_requested = True
+            self._tasks[job_id].cancel()
+
+    def status(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": self.running,
+            "jobs": sorted(self._tasks),
+            "capacity": settings.JOB_WORKERS,
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self._tick()
+            except Exception:
+                logger.exception("Job scheduler tick failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _tick(self) -> None:
+        async with open_session() as db:
+            await self._heartbeat(db)
+            # At start, then every JOB_STALE_SECONDS: a lease cannot go stale any faster
+            now = time.monotonic()
+            if self._housekept_at is None or now - self._housekept_at >= settings.JOB_STALE_SECONDS:
+                self._housekept_at = now
+                await self._recover(db)
+                await self._expire(db)
+            await self._claim(db)
+
+    async def _heartbeat(self, db) -> None:
+        """Renew our leases, flush progress, and act on cancellations or lost leases."""
+        if not self._contexts:
+            return
+        now = utcnow()
+        for job_id, context in list(self._contexts.items()):
+            renewed = await db.execute(
+                update(Job).where(Job.id == job_id, Job.worker_id == self.worker_id, Job.status == "running")
+                .values(heartbeat_at=now, progress_done=context.done,
+                        progress_total=context.total, message=context.message)
+            )
+            if renewed.rowcount == 0 and job_id in self._tasks:
+                logger.warning("Job %s is no longer leased to this worker; stopping it", job_id)
+                self._tasks[job_id].cancel()
+        await db.commit()
+        cancelled = (await db.execute(
+            select(Job.id).where(Job.id.in_(list(self._contexts)), Job.cancel_requested.is_(True))
+        )).scalars().all()
+        for job_id in cancelled:
+            self.cancel_local(job_id)
+
+    async def _recover(self, db) -> None:
+        """Requeue running jobs whose worker stopped heartbeating; fail those out of attempts."""
+        stale = utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        lost = Job.status == "running", Job.heartbeat_at < stale
+        await db.execute(
+            update(Job).where(*lost, Job.attempts >= Job.max_attempts)
+            .values(status="failed", error="Worker stopped responding", finished_at=utcnow(), worker_id=None)
+        )
+        await db.execute(
+            update(Job).where(*lost).values(status="queued", worker_id=None, run_after=utcnow())
+        )
+        await db.commit()
+
+    def _free_slots(self) -> Dict[str, int]:
+        running = {}
+        for context in self._contexts.values():
+            running[context.type] = running.get(context.type, 0) + 1
+        return {
+            name: spec.concurrency - running.get(name, 0)
+            for name, spec in JOB_TYPES.items() if spec.concurrency > running.get(name, 0)
+        }
+
+    async def _claim(self, db) -> None:
+        capacity = settings.JOB_WORKERS - len(self._tasks)
+        slots = self._free_slots()
+        if capacity <= 0 or not slots:
+            return
+        candidates = (await db.execute(
+            select(Job.id, Job.type).where(
+                Job.status == "queued", Job.run_after <= utcnow(), Job.type.in_(list(slots)),
+                Job.cancel_requested.is_(False)
+            ).order_by(Job.id).limit(capacity * 4)
+        )).all()
+        for job_id, type in candidates:
+            if capacity <= 0:
+                break
+            if slots.get(type, 0) <= 0:
+                continue
+            now = utcnow()
+            claimed = await db.execute(
+                update(Job).where(Job.id == job_id, Job.status == "queued", Job.cancel_requested.is_(False))
+                .values(status="running", worker_id=self.worker_id, attempts=Job.attempts + 1,
+                        heartbeat_at=now, started_at=now, error=None)
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                continue  # another runner got it
+            job = await db.scalar(select(Job).where(Job.id == job_id).execution_options(populate_existing=True))
+            self._start(job)
+            capacity -= 1
+            slots[type] -= 1
+
+    def _start(self, job: Job) -> None:
+        context = JobContext(
+            id=job.id, type=job.type, params=job.params, user_id=job.created_by, attempt=job.attempts,
+            done=job.progress_done or 0, total=job.progress_total, message=job.message,
+        )
+        self._contexts[job.id] = context
+        self._tasks[job.id] = asyncio.create_task(
+            self._run(JOB_TYPES[job.type], context, job.max_attempts), name=f"job-{job.id}"
+        )
+
+    async def _run(self, spec: JobType, context: JobContext, max_attempts: int) -> None:
+        RUNNING.inc(spec.name)
+        try:
+            try:
+                result = await spec.handler(context)
+            except asyncio.CancelledError:
+                if context.cancel_requested:
+                    await self._finish(context, status="cancelled")
+                else:
+                    # Shutdown: hand the job back without spending an attempt
+                    await self._finish(context, status="queued", attempts=Job.attempts - 1)
+                return
+            except Exception as exc:
+                logger.exception("Job %s (%s) failed on attempt %d", context.id, spec.name, context.attempt)
+                error = f"{type(exc).__name__}: {exc}"[:2000]
+                if context.attempt < max_attempts and not context.cancel_requested:
+                    delay = settings.JOB_RETRY_DELAY * 2 ** (context.attempt - 1)
+                    await self._finish(context, status="queued", error=error,
+                                       run_after=utcnow() + timedelta(seconds=delay))
+                else:
+                    await self._finish(context, status="failed", error=error)
+                return
+            await self._finish(context, status="succeeded", result=result)
+        finally:
+            RUNNING.dec(spec.name)
+            self._contexts.pop(context.id, None)
+            self._tasks.pop(context.id, None)
+            self.wake()
+
+    async def _finish(self, context: JobContext, status: str, **values) -> None:
+        FINISHED.inc(context.type, status)
+        values.update(status=status, worker_id=None, progress_done=context.done,
+                      progress_total=context.total, message=context.message)
+        if status in FINISHED_STATUSES:
+            values["finished_at"] = utcnow()
+        if status == "succeeded" and context.result_file:
+            values["result_path"], values["result_filename"], values["result_media_type"] = context.result_file
+        try:
+            async with open_session() as db:
+                # Only while we still hold the lease; a recovered job belongs to someone else
+                await db.execute(
+                    update(Job).where(Job.id == context.id, Job.worker_id == self.worker_id).values(**values)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Could not record the outcome of job %s", context.id)
+
+    async def _expire(self, db) -> None:
+        """Delete jobs finished more than JOB_RESULT_TTL ago, with their result files."""
+        expired = utcnow() - timedelta(seconds=settings.JOB_RESULT_TTL)
+        while True:
+            rows = (await db.execute(
+                select(Job.id, Job.result_path)
+                .where(Job.finished_at < expired).order_by(Job.finished_at).limit(100)
+            )).all()
+            if not rows:
+                return
+            for _, path in rows:
+                if path:
+                    await run_in_threadpool(_remove_result, path)
+            await db.execute(delete(Job).where(Job.id.in_([job_id for job_id, _ in rows])))
+            await db.commit()
+
+
+runner = JobRunner()
@@ -0,0 +1,172 @@
+"""
+Refresh tokens and session revocation.
+
+Login issues an access token plus an opaque refresh token, stored only as
+its SHA-256 digest. POST /auth/refresh trades the refresh token for a new
+pair without any password hashing: one conditional UPDATE marks the
+presented token used and one INSERT stores its successor. All tokens from
+one login share a family (the session, `sid` in access tokens); a token
+presented again after rotation can only be a replayed copy, so its whole
+family is revoked.
+
+Revoked families go on an in-process denylist that get_current_user checks
+without touching the database. Each process picks up revocations made by
+other processes with one query every REVOCATION_SYNC_SECONDS. Denylist
+entries live as long as an access token, after which no token of the
+family can still be valid.
+"""
+import asyncio
+import logging
+import secrets
+import time
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import token_digest
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.utils.timestamps import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Re-read this much history on every sync: clock skew between processes and slow commits
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class InvalidRefreshToken(Exception):
+    """
+    Unknown, expired, revoked or reused refresh token. `revoked_family` is
+    set when reuse revoked a family; commit the session and deny it.
+    """
+
+    def __init__(self, message: str, revoked_family: Optional[str] = None):
+        super().__init__(message)
+        self.revoked_family = revoked_family
+
+
+def issue(session: Session, user_id: int, family_id: Optional[str] = None) -> Tuple[str, str]:
+    """Add a refresh token row (a new family unless given); returns (token, family_id)."""
+    now = utcnow()
+    token = secrets.token_urlsafe(32)
+    family_id = family_id or secrets.token_hex(16)
+    session.add(RefreshToken(
+        user_id=user_id,
+        token_hash=token_digest(token),
+        family_id=family_id,
+        created_at=now,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token, family_id
+
+
+def prune(session: Session, user_id: int) -> None:
+    """Delete a user's expired refresh tokens; run at login so the table stays small."""
+    session.execute(
+        delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= utcnow())
+    )
+
+
+def rotate(session: Session, token: str) -> Tuple[User, str, str]:
+    """Spend `token` and issue its successor; returns (user, new token, family_id)."""
+    now = utcnow()
+    row = session.scalar(select(RefreshToken).where(RefreshToken.token_hash == token_digest(token)))
+    if row is None or row.revoked_at is not None or row.expires_at <= now:
+        raise InvalidRefreshToken("Invalid or expired refresh token")
+
+    # Conditional UPDATE: of two concurrent refreshes with one token, only one wins
+    spent = session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == row.id, RefreshToken.used_at.is_(None))
+        .values(used_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not spent:
+        logger.warning("Refresh token reused; revoking session %s of user %s", row.family_id, row.user_id)
+        revoke(session, family_ids=[row.family_id])
+        raise InvalidRefreshToken("Refresh token already used", revoked_family=row.family_id)
+
+    user = session.get(User, row.user_id)
+    if user is None:
+        raise InvalidRefreshToken("Invalid or expired refresh token")
+    new_token, _ = issue(session, user.id, row.family_id)
+    return user, new_token, row.family_id
+
+
+def family_of(session: Session, token: str) -> Optional[Tuple[int, str]]:
+    """(user_id, family_id) of a refresh token, if it exists."""
+    return session.execute(
+        select(RefreshToken.user_id, RefreshToken.family_id)
+        .where(RefreshToken.token_hash == token_digest(token))
+    ).tuples().first()
+
+
+def revoke(session: Session, family_ids: Iterable[str] = (), user_id: Optional[int] = None) -> List[str]:
+    """Revoke the given families, or every live family of `user_id`; returns the families revoked."""
+    query = select(RefreshToken.family_id).where(RefreshToken.revoked_at.is_(None)).distinct()
+    if user_id is not None:
+        query = query.where(RefreshToken.user_id == user_id)
+    else:
+        family_ids = list(family_ids)
+        if not family_ids:
+            return []
+        query = query.where(RefreshToken.family_id.in_(family_ids))
+    families = list(session.scalars(query))
+    if families:
+        session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id.in_(families), RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    return families
+
+
+class SessionDenylist:
+    """Revoked session families, kept for one access-token lifetime."""
+
+    def __init__(self, maxsize: int, ttl: float, sync_interval: float):
+        self._revoked = TTLCache(maxsize, ttl)
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._synced_at = None  # utcnow() of the last successful sync
+        self._next_sync = 0.0
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, family_id) -> bool:
+        return family_id is not None and family_id in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, *family_ids: str) -> None:
+        for family_id in family_ids:
+            self._revoked.set(family_id, True)
+
+    async def sync(self, db) -> None:
+        """Pull recent revocations from the database when due; a no-op on all other calls."""
+        if time.monotonic() < self._next_sync or self._lock.locked():
+            return
+        async with self._lock:
+            now = utcnow()
+            since = (self._synced_at - SYNC_OVERLAP) if self._synced_at else now - timedelta(seconds=self.ttl)
+            try:
+                families = (await db.scalars(
+                    select(RefreshToken.family_id).where(RefreshToken.revoked_at >= since).distinct()
+                )).all()
+            except Exception:
+                logger.warning("Revocation sync failed", exc_info=True)
+                await db.rollback()
+            else:
+                self.add(*families)
+                self._synced_at = now
+            self._next_sync = time.monotonic() + self.sync_interval
+
+
+revoked_sessions = SessionDenylist(
+    settings.AUTH_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, settings.REVOCATION_SYNC_SECONDS
+)
@@ -0,0 +1,86 @@
+"""
+Dashboard rollups: one GROUP BY per breakdown, computed in the database.
+
+Functions take a sync Session (call through `await db.run_sync(...)`) and
+the caller's school WHERE clauses from app.services.school_scope. Each
+query reads only columns held by a covering index:
+
+* schools:           ix_schools_district_municipality (district, municipality, is_active)
+* sessions, scoped:  ix_training_sessions_school_rollup (school_id, ncc_batch, start_date, division)
+* sessions, global:  ix_training_sessions_batch_rollup (ncc_batch, start_date, division)
+"""
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.school import School, TrainingSession
+
+DIVISIONS = ("junior", "senior")
+
+
+def _division_counts():
+    division = func.lower(TrainingSession.division)
+    return [func.sum(case((division == name, 1), else_=0)) for name in DIVISIONS]
+
+
+def schools_by_area(session: Session, clauses: list) -> list:
+    rows = session.execute(
+        select(
+            School.district, School.municipality, func.count(),
+            func.sum(case((School.is_active == True, 1), else_=0)),
+        )
+        .where(*clauses)
+        .group_by(School.district, School.municipality)
+        .order_by(School.district, School.municipality)
+    ).all()
+    return [
+        {"district": district, "municipality": municipality, "schools": schools, "active_schools": active or 0}
+        for district, municipality, schools, active in rows
+    ]
+
+
+def sessions_by_batch(session: Session, clauses: list) -> list:
+    year = func.extract("year", TrainingSession.start_date)
+    query = select(TrainingSession.ncc_batch, year, func.count(), *_division_counts())
+    if clauses:
+        # Unscoped callers read the training_sessions index alone
+        query = query.join(School, School.id == TrainingSession.school_id).where(*clauses)
+    rows = session.execute(
+        query.group_by(TrainingSession.ncc_batch, year).order_by(TrainingSession.ncc_batch, year)
+    ).all()
+    return [
+        {"ncc_batch": batch, "year": int(year) if year is not None else None, "sessions": sessions,
+         **{name: count or 0 for name, count in zip(DIVISIONS, counts)}}
+        for batch, year, sessions, *counts in rows
+    ]
+
+
+def divisions_by_district(session: Session, clauses: list) -> list:
+    rows = session.execute(
+        select(School.district, func.count(), *_division_counts())
+        .select_from(TrainingSession)
+        .join(School, School.id == TrainingSession.school_id)
+        .where(*clauses)
+        .group_by(School.district)
+        .order_by(School.district)
+    ).all()
+    return [
+        {"district": district, "sessions": sessions, **{name: count or 0 for name, count in zip(DIVISIONS, counts)}}
+        for district, sessions, *counts in rows
+    ]
+
+
+def rollups(session: Session, clauses: list) -> dict:
+    """Every breakdown plus totals summed from them (no extra query)."""
+    by_area = schools_by_area(session, clauses)
+    by_district = divisions_by_district(session, clauses)
+    return {
+        "totals": {
+            "schools": sum(row["schools"] for row in by_area),
+            "active_schools": sum(row["active_schools"] for row in by_area),
+            "sessions": sum(row["sessions"] for row in by_district),
+            **{name: sum(row[name] for row in by_district) for name in DIVISIONS},
+        },
+        "schools_by_area": by_area,
+        "sessions_by_batch": sessions_by_batch(session, clauses),
+        "divisions_by_district": by_district,
+    }
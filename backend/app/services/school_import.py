@@ -0,0 +1,217 @@
+"""
+Bulk school import from CSV/XLSX uploads.
+
+Rows are read from the upload's spooled temp file a chunk at a time, so
+memory is bounded by the chunk size rather than the file size. Each chunk
+is validated against SchoolCreate/TrainingSessionCreate, checked for name
+clashes with one IN query, and written with multi-row INSERTs.
+
+Expected columns: the SchoolBase fields plus optional ncc_batch,
+start_date, passout_date and division. A row whose name repeats an earlier
+row in the same file only adds that row's training session. A chunk that
+still hits the unique name constraint (a concurrent insert, or names equal
+only under the database's collation) is rolled back and its rows reported.
+"""
+import codecs
+import csv
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.school import School, TrainingSession
+from app.schemas.school import SchoolBase, SchoolCreate, TrainingSessionCreate
+from app.services import geo, stats
+
+SCHOOL_FIELDS = tuple(SchoolBase.model_fields)
+SESSION_FIELDS = ("ncc_batch", "start_date", "passout_date", "division")
+# Everything else is text; spreadsheets hand phone numbers etc. back as numbers
+NUMERIC_FIELDS = {"ward_number"}
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as the requested format."""
+
+
+@dataclass
+class ImportState:
+    """Running totals and per-row errors for one import."""
+    dry_run: bool = False
+    total_rows: int = 0
+    schools_created: int = 0
+    sessions_created: int = 0
+    errors: List[dict] = field(default_factory=list)
+    # name -> school id (None in dry-run) for schools created by this import
+    created: Dict[str, Optional[int]] = field(default_factory=dict)
+    rejected: Set[str] = field(default_factory=set)
+    # District and municipality spellings new to the geography reference, see geo.GeoIndex.normalize
+    places: dict = field(default_factory=dict)
+
+    def report(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "total_rows": self.total_rows,
+            "schools_created": self.schools_created,
+            "sessions_created": self.sessions_created,
+            # Validation errors are found as rows are read, name clashes when their chunk is written
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+    def checkpoint(self) -> tuple:
+        """What import_chunk changes, to restore with rollback_chunk if its chunk fails."""
+        return (self.schools_created, self.sessions_created, dict(self.created),
+                dict(self.places), len(self.errors))
+
+    def rollback_chunk(self, saved: tuple, rows: List[Tuple[int, SchoolCreate]]) -> None:
+        """Undo a chunk rolled back on a unique constraint; its rows are reported as not imported."""
+        self.schools_created, self.sessions_created, self.created, self.places, errors = saved
+        reported = {error["row"] for error in self.errors[errors:]}
+        for line, _ in rows:
+            if line not in reported:
+                self.errors.append({"row": line, "errors": [
+                    "name: Not imported: its chunk hit a duplicate school name; resubmit this row"
+                ]})
+
+
+def csv_rows(fileobj) -> Iterator[Tuple[int, dict]]:
+    """Yield (line number, row dict) from a binary CSV file object."""
+    text = codecs.getreader("utf-8-sig")(fileobj)
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def xlsx_rows(fileobj) -> Iterator[Tuple[int, dict]]:
+    """Yield (row number, row dict) from the first sheet of an XLSX file object."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ImportFormatError("XLSX import requires the openpyxl package") from exc
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFormatError("Not a valid XLSX file") from exc
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        for number, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def take(rows: Iterator, n: int) -> list:
+    """Next n items of an iterator (blocking file IO; call from the threadpool)."""
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= n:
+            break
+    return chunk
+
+
+def _clean(key, value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and key not in NUMERIC_FIELDS:
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def parse_row(row: dict) -> Tuple[Optional[SchoolCreate], List[str]]:
+    """Validate one upload row; returns (school, []) or (None, messages)."""
+    values = {}
+    for key, value in row.items():
+        if key:
+            key = key.strip().lower()
+            values[key] = _clean(key, value)
+    school_values = {k: values[k] for k in SCHOOL_FIELDS if values.get(k) is not None}
+    session_values = {k: values[k] for k in SESSION_FIELDS if values.get(k) is not None}
+    try:
+        sessions = [TrainingSessionCreate(**session_values)] if session_values else []
+        return SchoolCreate(**school_values, training_sessions=sessions), []
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+        ]
+
+
+def import_chunk(session: Session, rows: List[Tuple[int, SchoolCreate]], state: ImportState) -> None:
+    """
+    Persist one chunk of validated rows: one IN query for name clashes,
+    one multi-row INSERT for schools, one id lookup, one multi-row INSERT
+    for sessions, then the school_stats deltas.
+    """
+    for _, school in rows:
+        place = geo.geo_index.normalize(
+            {"district": school.district, "municipality": school.municipality}, state.places
+        )
+        school.district, school.municipality = place["district"], place["municipality"]
+
+    new_names = {
+        school.name for _, school in rows
+        if school.name not in state.created and school.name not in state.rejected
+    }
+    taken = set()
+    if new_names:
+        taken = set(session.scalars(select(School.name).where(School.name.in_(new_names))))
+
+    school_rows, session_rows = {}, []
+    for line, school in rows:
+        if school.name in state.rejected or school.name in taken:
+            state.rejected.add(school.name)
+            state.errors.append({"row": line, "errors": ["name: School with this name already exists"]})
+            continue
+        if school.name not in state.created and school.name not in school_rows:
+            school_rows[school.name] = school.model_dump(exclude={"training_sessions"})
+        session_rows.extend((school.name, s.model_dump()) for s in school.training_sessions)
+
+    if state.dry_run:
+        state.created.update(dict.fromkeys(school_rows))
+        state.schools_created += len(school_rows)
+        state.sessions_created += len(session_rows)
+        return
+
+    if school_rows:
+        wards = defaultdict(int)
+        for values in school_rows.values():
+            place = (values["district"], values["municipality"])
+            wards[place] = max(wards[place], values["ward_number"])
+        for (district, municipality), ward_number in wards.items():
+            geo.register(session, district, municipality, ward_number)
+        session.execute(insert(School), list(school_rows.values()))
+        state.created.update(session.execute(
+            select(School.name, School.id).where(School.name.in_(school_rows))
+        ).tuples().all())
+    if session_rows:
+        session.execute(insert(TrainingSession), [
+            {**values, "school_id": state.created[name]} for name, values in session_rows
+        ])
+
+    # school_stats: new schools count once, sessions count per district of their school
+    district_of = {name: values["district"] for name, values in school_rows.items()}
+    missing = {name for name, _ in session_rows if name not in district_of}
+    if missing:
+        district_of.update(session.execute(
+            select(School.name, School.district).where(School.name.in_(missing))
+        ).tuples().all())
+    deltas = defaultdict(lambda: [0, 0])
+    for values in school_rows.values():
+        deltas[values["district"]][0] += 1
+    for name, _ in session_rows:
+        deltas[district_of[name]][1] += 1
+    for district, (schools, sessions) in deltas.items():
+        stats.apply_school_delta(session, district, schools=schools, active=schools, sessions=sessions)
+
+    state.schools_created += len(school_rows)
+    state.sessions_created += len(session_rows)
@@ -0,0 +1,89 @@
+"""
+Schools as plain dicts built from column tuples, for list endpoints.
+
+Produces the same shape as app.schemas.school.School without hydrating ORM
+objects or validating each row through Pydantic: one column select for the
+page of schools and one IN query for their training sessions.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.school import School, TrainingSession, TrainingSessionArchive
+from app.schemas.school import School as SchoolSchema, TrainingSession as TrainingSessionSchema
+
+SCHOOL_FIELDS = tuple(f for f in SchoolSchema.model_fields if f != "training_sessions")
+SESSION_FIELDS = tuple(TrainingSessionSchema.model_fields)
+
+SCHOOL_COLUMNS = tuple(getattr(School, f) for f in SCHOOL_FIELDS)
+SESSION_COLUMNS = tuple(getattr(TrainingSession, f) for f in SESSION_FIELDS)
+
+# Relationships that can be embedded with include=
+INCLUDES = ("training_sessions",)
+
+
+def _names(value: str) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    `fields=` value -> school fields to select, id first. All fields when
+    not given. Raises ValueError for unknown names.
+    """
+    if fields is None:
+        return SCHOOL_FIELDS
+    requested = _names(fields)
+    unknown = [name for name in requested if name not in SCHOOL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return ("id",) + tuple(name for name in requested if name != "id")
+
+
+def parse_include(include: Optional[str], fields: Optional[str]) -> bool:
+    """
+    Whether to embed training sessions. An explicit `include=` decides
+    (empty means none); otherwise only the full representation has them.
+    """
+    if include is None:
+        return fields is None
+    requested = _names(include)
+    unknown = [name for name in requested if name not in INCLUDES]
+    if unknown:
+        raise ValueError(f"Unknown include(s): {', '.join(unknown)}")
+    return "training_sessions" in requested
+
+
+def columns(projection: Sequence[str], source=School) -> tuple:
+    """Columns of `projection` on School, SchoolArchive or an alias of School (see archive.with_archived)."""
+    return tuple(getattr(source, f) for f in projection)
+
+
+def school_dicts(rows, projection: Sequence[str] = SCHOOL_FIELDS) -> List[dict]:
+    """Rows selected with columns(projection) -> school dicts (without sessions)."""
+    return [dict(zip(projection, row)) for row in rows]
+
+
+def attach_sessions(session: Session, schools: List[dict], include_archived: bool = False) -> List[dict]:
+    """Fill in `training_sessions` for school dicts with one IN query (two with include_archived)."""
+    if not schools:
+        return schools
+    by_school: Dict[int, list] = defaultdict(list)
+    ids = [school["id"] for school in schools]
+    tables = [(TrainingSession, SESSION_COLUMNS)]
+    if include_archived:
+        tables.append((
+            TrainingSessionArchive, tuple(getattr(TrainingSessionArchive, f) for f in SESSION_FIELDS)
+        ))
+    for model, session_columns in tables:
+        rows = session.execute(
+            select(*session_columns).where(model.school_id.in_(ids)).order_by(model.id)
+        )
+        for row in rows:
+            values = dict(zip(SESSION_FIELDS, row))
+            by_school[values["school_id"]].append(values)
+    for school in schools:
+        school["training_sessions"] = by_school.get(school["id"], [])
+    return schools
@@ -0,0 +1,51 @@
+"""
+Role scope of school reads, shared by the schools and dashboard routers:
+the WHERE clauses a caller is confined to, and the result-cache scope and
+tags that follow from them.
+"""
+from typing import Optional
+
+from app.models.school import School
+from app.services.geo import geo_index
+
+
+def school_filters(current_user, district: Optional[str] = None, is_active: Optional[bool] = None,
+                   source=School) -> list:
+    """
+    WHERE clauses shared by every school listing: role scope plus query
+    filters, on School or an alias of it (see archive.with_archived).
+    """
+    clauses = []
+
+    # Role-based filtering
+    if current_user.role == "district_admin" and current_user.district:
+        clauses.append(source.district == current_user.district)
+    elif current_user.role == "school_coordinator" and current_user.school_id:
+        clauses.append(source.id == current_user.school_id)
+    # Admin has access to all schools
+
+    if district:
+        # Stored names are canonical (see app.services.geo), so this stays an index equality
+        clauses.append(source.district == geo_index.district_name(district))
+    if is_active is not None:
+        clauses.append(source.is_active == is_active)
+    return clauses
+
+
+def cache_scope(current_user) -> str:
+    """What of the caller a school read depends on: the role scope of school_filters and the access checks."""
+    if current_user.role == "district_admin":
+        return f"district_admin:{current_user.district}"
+    if current_user.role == "school_coordinator":
+        return f"school_coordinator:{current_user.school_id}"
+    return "all"
+
+
+def list_tags(current_user, district: Optional[str]) -> tuple:
+    """Result cache tags of a school listing: the district it is confined to, else district:*."""
+    if current_user.role == "school_coordinator" and current_user.school_id:
+        return ("schools", f"school:{current_user.school_id}")
+    if current_user.role == "district_admin" and current_user.district:
+        district = current_user.district
+    district = geo_index.district_name(district)
+    return ("schools", f"district:{district}" if district else "district:*")
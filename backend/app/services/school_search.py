@@ -0,0 +1,294 @@
+"""
+Typeahead search over schools (name, principal, area, municipality).
+
+Two backends, chosen by SCHOOL_SEARCH_BACKEND ("auto" picks by dialect):
+
+* fulltext: MySQL FULLTEXT index with the ngram parser (see the
+  ft_schools_search migration). InnoDB keeps it in sync itself.
+* trigram: an in-process inverted index of character trigrams, for SQLite
+  and other backends without a usable full-text index. It is built on the
+  first search and updated by the school write paths of this process, so
+  it is meant for single-process deployments (dev, tests, small installs).
+
+Both return active schools only, ranked best first.
+"""
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.school import School
+
+# Indexed columns and their ranking weight
+SEARCH_FIELDS = {
+    "name": 3,
+    "principal_name": 2,
+    "area_name": 1,
+    "municipality": 1,
+}
+_MAX_WEIGHT = max(SEARCH_FIELDS.values())
+
+# Word separators; anything else (including Devanagari vowel signs) is part of a word
+_SEPARATORS = re.compile(r"[\s\-_.,;:/\\()\[\]'\"&|+*@<>~!?#%^=]+")
+
+
+def _words(text: Optional[str]) -> List[str]:
+    return [w for w in _SEPARATORS.split((text or "").casefold()) if w]
+
+
+def _trigrams(word: str) -> Set[str]:
+    # Start-padded like pg_trgm, so a fragment of one or two characters still
+    # yields trigrams and every trigram of a prefix is a trigram of the word
+    padded = "  " + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Word-prefix index over active schools. Trigrams map to vocabulary
+    words and words map to the schools (and best field weight) using them,
+    so a query fragment is resolved against the vocabulary, not every school.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._grams: Dict[str, Set[str]] = defaultdict(set)  # trigram -> words
+        self._words: Dict[str, Dict[int, int]] = {}  # word -> {school id: field weight}
+        self._docs: Dict[int, Tuple[str, str, Set[str]]] = {}  # school id -> (district, name, words)
+        self._districts: Dict[str, Set[int]] = defaultdict(set)
+        self._names: List[Tuple[str, int]] = []  # sorted (casefolded name, id), for name-prefix ranking
+        self.ready = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, school_id: int, district: str, values: dict) -> None:
+        weights: Dict[str, int] = {}
+        for column, weight in SEARCH_FIELDS.items():
+            for word in _words(values.get(column)):
+                if weights.get(word, 0) < weight:
+                    weights[word] = weight
+        for word, weight in weights.items():
+            docs = self._words.get(word)
+            if docs is None:
+                docs = self._words[word] = {}
+                for gram in _trigrams(word):
+                    self._grams[gram].add(word)
+            docs[school_id] = weight
+        name = (values.get("name") or "").casefold()
+        self._docs[school_id] = (district, name, set(weights))
+        self._districts[district].add(school_id)
+        bisect.insort(self._names, (name, school_id))
+
+    def _remove(self, school_id: int) -> None:
+        doc = self._docs.pop(school_id, None)
+        if doc is None:
+            return
+        district, name, words = doc
+        for word in words:
+            docs = self._words[word]
+            docs.pop(school_id, None)
+            if docs:
+                continue
+            del self._words[word]
+            for gram in _trigrams(word):
+                grams = self._grams[gram]
+                grams.discard(word)
+                if not grams:
+                    del self._grams[gram]
+        self._districts[district].discard(school_id)
+        position = bisect.bisect_left(self._names, (name, school_id))
+        if position < len(self._names) and self._names[position] == (name, school_id):
+            del self._names[position]
+
+    def _prefixed(self, fragment: str) -> List[str]:
+        """Vocabulary words starting with `fragment`."""
+        sets = sorted((self._grams.get(gram, ()) for gram in _trigrams(fragment)), key=len)
+        if not sets or not sets[0]:
+            return []
+        return [word for word in sets[0] if word.startswith(fragment)
+                and all(word in other for other in sets[1:])]
+
+    def load(self, rows: Iterable) -> None:
+        """Replace the contents with (id, district, *SEARCH_FIELDS) rows."""
+        with self._lock:
+            self._grams.clear()
+            self._words.clear()
+            self._docs.clear()
+            self._districts.clear()
+            self._names = []
+            for school_id, district, *values in rows:
+                self._add(school_id, district, dict(zip(SEARCH_FIELDS, values)))
+            self.ready = True
+
+    def upsert(self, school) -> None:
+        """Re-index one school after a write; inactive schools are dropped."""
+        if not self.ready:
+            return
+        with self._lock:
+            self._remove(school.id)
+            if school.is_active:
+                self._add(school.id, school.district,
+                          {column: getattr(school, column) for column in SEARCH_FIELDS})
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next search (after bulk writes)."""
+        self.ready = False
+
+    def search(self, q: str, limit: int, district: Optional[str] = None,
+               school_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        (school id, score in 0..1) for the best `limit` schools having a
+        word starting with each word of `q`. Names starting with `q`,
+        complete-word matches and matches in heavier fields rank higher.
+        """
+        fragments = list(dict.fromkeys(_words(q)))
+        if not fragments:
+            return []
+
+        with self._lock:
+            plans = []
+            for fragment in fragments:
+                postings = sorted(
+                    ((self._words[word], 2 if word == fragment else 1) for word in self._prefixed(fragment)),
+                    key=lambda posting: len(posting[0]), reverse=True,
+                )
+                if not postings:
+                    return []
+                plans.append((sum(len(docs) for docs, _ in postings), fragment, postings))
+            # Most selective fragment first; later ones only narrow the candidates
+            plans.sort(key=lambda plan: plan[0])
+
+            candidates: Optional[Dict[int, int]] = None
+            for size, fragment, postings in plans:
+                if candidates is None:
+                    docs, bonus = postings[0]
+                    best = {candidate: weight * bonus for candidate, weight in docs.items()}
+                    for docs, bonus in postings[1:]:
+                        for candidate, weight in docs.items():
+                            if best.get(candidate, 0) < weight * bonus:
+                                best[candidate] = weight * bonus
+                    # Role scope before any further work
+                    if school_id is not None:
+                        best = {school_id: best[school_id]} if school_id in best else {}
+                    if district is not None:
+                        in_district = self._districts.get(district, ())
+                        best = {candidate: points for candidate, points in best.items()
+                                if candidate in in_district}
+                elif len(candidates) * len(postings) < size and len(postings) <= 4:
+                    # Look the candidates up in the few postings instead of walking them
+                    best = {}
+                    for candidate, points in candidates.items():
+                        most = 0
+                        for docs, bonus in postings:
+                            weight = docs.get(candidate)
+                            if weight and weight * bonus > most:
+                                most = weight * bonus
+                        if most:
+                            best[candidate] = points + most
+                elif len(candidates) * 4 < size:
+                    # Few candidates left: check their own words instead of the postings
+                    best = {}
+                    for candidate, points in candidates.items():
+                        most = 0
+                        for word in self._docs[candidate][2]:
+                            if word.startswith(fragment):
+                                most = max(most, self._words[word][candidate] * (2 if word == fragment else 1))
+                        if most:
+                            best[candidate] = points + most
+                else:
+                    found: Dict[int, int] = {}
+                    for docs, bonus in postings:
+                        for candidate, weight in docs.items():
+                            if candidate in candidates and found.get(candidate, 0) < weight * bonus:
+                                found[candidate] = weight * bonus
+                    best = {candidate: points + candidates[candidate] for candidate, points in found.items()}
+                candidates = best
+                if not candidates:
+                    return []
+
+            # Names starting with the whole query outrank everything else
+            prefix = q.strip().casefold()
+            low = bisect.bisect_left(self._names, (prefix,))
+            high = bisect.bisect_left(self._names, (prefix + "\U0010ffff",))
+            named = {candidate for _, candidate in self._names[low:high]}
+
+        most = 2 * _MAX_WEIGHT * len(fragments)
+        top = heapq.nlargest(limit, (
+            (points + most if candidate in named else points, -candidate)
+            for candidate, points in candidates.items()
+        ))
+        return [(-neg_id, points / (2 * most)) for points, neg_id in top]
+
+
+school_index = TrigramIndex()
+
+
+def backend_for(session: Session) -> str:
+    if settings.SCHOOL_SEARCH_BACKEND != "auto":
+        return settings.SCHOOL_SEARCH_BACKEND
+    return "fulltext" if session.get_bind().dialect.name == "mysql" else "trigram"
+
+
+def _boolean_query(q: str) -> str:
+    # Every word required; with the ngram parser each word is matched as a
+    # phrase of its n-grams, so partial words match too. Words shorter than
+    # ngram_token_size (2) are not indexed and are dropped
+    return " ".join(f'+"{word}"' for word in _words(q) if len(word) >= 2)
+
+
+def _fulltext_search(session: Session, q: str, limit: int, scope: list) -> List[Tuple[int, float]]:
+    boolean_query = _boolean_query(q)
+    if not boolean_query:
+        return []
+    relevance = match(
+        *(getattr(School, column) for column in SEARCH_FIELDS), against=boolean_query
+    ).in_boolean_mode()
+    rows = session.execute(
+        select(School.id, relevance.label("score"))
+        .where(relevance > 0, School.is_active == True, *scope)
+        .order_by(relevance.desc(), School.id)
+        .limit(limit)
+    ).tuples().all()
+    top = rows[0][1] if rows else 1
+    return [(school_id, float(score) / float(top)) for school_id, score in rows]
+
+
+def _ensure_index(session: Session) -> None:
+    if school_index.ready:
+        return
+    rows = session.execute(
+        select(School.id, School.district, *(getattr(School, column) for column in SEARCH_FIELDS))
+        .where(School.is_active == True)
+    ).tuples()
+    school_index.load(rows)
+
+
+def search(session: Session, q: str, limit: int, district: Optional[str] = None,
+           school_id: Optional[int] = None) -> List[Tuple[School, float]]:
+    """Ranked (school, score) pairs for `q`, restricted to the given scope."""
+    if backend_for(session) == "fulltext":
+        scope = []
+        if district is not None:
+            scope.append(School.district == district)
+        if school_id is not None:
+            scope.append(School.id == school_id)
+        ranked = _fulltext_search(session, q, limit, scope)
+    else:
+        _ensure_index(session)
+        ranked = school_index.search(q, limit, district=district, school_id=school_id)
+
+    if not ranked:
+        return []
+    schools = {
+        school.id: school
+        for school in session.scalars(select(School).where(School.id.in_([i for i, _ in ranked])))
+    }
+    return [(schools[i], score) for i, score in ranked if i in schools]
@@ -0,0 +1,119 @@
+"""
+Bookkeeping for the school_stats summary table.
+
+Functions here take a sync Session so routers can call them through
+`await db.run_sync(...)` inside the request's transaction, and the
+rebuild can run from manage.py.
+"""
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.cadet import Cadet
+from app.models.school import School, TrainingSession
+from app.models.stats import GLOBAL_STATS_KEY, SchoolStats
+
+COUNTERS = ("total_schools", "active_schools", "total_sessions", "total_cadets", "districts_covered")
+
+
+def _bump(session: Session, key: str, deltas: dict) -> None:
+    """Add deltas to one stats row, creating it on first use."""
+    deltas = {col: d for col, d in deltas.items() if d}
+    if not deltas:
+        return
+    values = {col: getattr(SchoolStats, col) + d for col, d in deltas.items()}
+    result = session.execute(
+        update(SchoolStats).where(SchoolStats.district == key).values(**values)
+    )
+    if result.rowcount:
+        return
+    try:
+        # A concurrent writer may create the same row; the savepoint lets us retry the UPDATE
+        with session.begin_nested():
+            session.execute(insert(SchoolStats).values(
+                district=key, **{col: deltas.get(col, 0) for col in COUNTERS}
+            ))
+    except IntegrityError:
+        session.execute(
+            update(SchoolStats).where(SchoolStats.district == key).values(**values)
+        )
+
+
+def apply_school_delta(session: Session, district: str, schools: int = 0,
+                       active: int = 0, sessions: int = 0, cadets: int = 0) -> None:
+    """Apply counter changes for one district and to the global totals row."""
+    if not (schools or active or sessions or cadets):
+        return
+    _bump(session, district, {
+        "total_schools": schools, "active_schools": active,
+        "total_sessions": sessions, "total_cadets": cadets,
+    })
+
+    covered = 0
+    if schools:
+        # Our UPDATE holds the row lock, so this read is consistent with the delta
+        now = session.scalar(
+            select(SchoolStats.total_schools).where(SchoolStats.district == district)
+        ) or 0
+        before = now - schools
+        if before <= 0 < now:
+            covered = 1
+        elif now <= 0 < before:
+            covered = -1
+
+    _bump(session, GLOBAL_STATS_KEY, {
+        "total_schools": schools, "active_schools": active,
+        "total_sessions": sessions, "total_cadets": cadets, "districts_covered": covered,
+    })
+
+
+def move_school(session: Session, old_district: str, new_district: str,
+                is_active: bool, sessions: int, cadets: int = 0) -> None:
+    """Re-attribute a school (and its sessions and cadets) to another district."""
+    if old_district == new_district:
+        return
+    active = 1 if is_active else 0
+    apply_school_delta(session, old_district, schools=-1, active=-active,
+                       sessions=-sessions, cadets=-cadets)
+    apply_school_delta(session, new_district, schools=1, active=active,
+                       sessions=sessions, cadets=cadets)
+
+
+def rebuild(session: Session) -> int:
+    """Recompute every stats row from the base tables (drift repair). Returns district count."""
+    session_counts = (
+        select(TrainingSession.school_id, func.count().label("n"))
+        .group_by(TrainingSession.school_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(
+            School.district,
+            func.count(School.id),
+            func.sum(case((School.is_active == True, 1), else_=0)),
+            func.coalesce(func.sum(session_counts.c.n), 0),
+        )
+        .outerjoin(session_counts, session_counts.c.school_id == School.id)
+        .group_by(School.district)
+    ).all()
+
+    cadet_counts = dict(session.execute(
+        select(Cadet.district, func.count()).group_by(Cadet.district)
+    ).tuples().all())
+
+    session.execute(delete(SchoolStats))
+    totals = dict.fromkeys(COUNTERS, 0)
+    for district, schools, active, sessions in rows:
+        cadets = cadet_counts.get(district, 0)
+        session.add(SchoolStats(
+            district=district, total_schools=schools, active_schools=active or 0,
+            total_sessions=sessions, total_cadets=cadets, districts_covered=0,
+        ))
+        totals["total_schools"] += schools
+        totals["active_schools"] += active or 0
+        totals["total_sessions"] += sessions
+        totals["total_cadets"] += cadets
+        totals["districts_covered"] += 1
+    session.add(SchoolStats(district=GLOBAL_STATS_KEY, **totals))
+    session.flush()
+    return len(rows)
@@ -0,0 +1,141 @@
+"""
+Diff-based writes of a school's training sessions.
+
+Instead of deleting and re-inserting every session, the requested state is
+compared with the stored rows and only the difference is written: one
+multi-row INSERT, one bulk UPDATE by primary key and one DELETE, each
+skipped when empty. Cadets linked to a deleted session lose the link
+(training_session_id is set to NULL) rather than the row.
+
+Functions take a sync Session; routers call them through `db.run_sync`.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.cadet import Cadet
+from app.models.school import TrainingSession
+from app.schemas.school import TrainingSessionBase
+
+SESSION_FIELDS = tuple(TrainingSessionBase.model_fields)
+NULLABLE_FIELDS = {f for f in SESSION_FIELDS if TrainingSession.__table__.c[f].nullable}
+
+
+class SessionNotFound(LookupError):
+    """Session ids that do not belong to the school."""
+
+    def __init__(self, ids):
+        self.ids = sorted(set(ids))
+        super().__init__(f"Training session(s) not found for this school: {self.ids}")
+
+
+@dataclass
+class SessionChanges:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def touched(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def report(self) -> dict:
+        return {"inserted": self.inserted, "updated": self.updated, "deleted": self.deleted}
+
+
+def _existing(session: Session, school_id: int) -> Dict[int, dict]:
+    rows = session.execute(
+        select(TrainingSession.id, *(getattr(TrainingSession, f) for f in SESSION_FIELDS))
+        .where(TrainingSession.school_id == school_id)
+        .order_by(TrainingSession.id)
+    )
+    return {row[0]: dict(zip(SESSION_FIELDS, row[1:])) for row in rows}
+
+
+def _write(session: Session, school_id: int, inserts: List[dict],
+           updates: List[dict], deletes: List[int]) -> SessionChanges:
+    if deletes:
+        session.execute(
+            update(Cadet).where(Cadet.training_session_id.in_(deletes)).values(training_session_id=None)
+        )
+        session.execute(delete(TrainingSession).where(TrainingSession.id.in_(deletes)))
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany with full rows
+        session.execute(update(TrainingSession), updates)
+    if inserts:
+        session.execute(insert(TrainingSession), [{**values, "school_id": school_id} for values in inserts])
+    return SessionChanges(inserted=len(inserts), updated=len(updates), deleted=len(deletes))
+
+
+def sync_sessions(session: Session, school_id: int, desired: List[dict]) -> SessionChanges:
+    """
+    Make the school's sessions equal `desired` (dicts of the session fields,
+    optionally with an id). Items are matched to stored rows by id, else by
+    (ncc_batch, division); unmatched items are inserted and unmatched rows
+    deleted. Raises SessionNotFound for ids of other schools' sessions.
+    """
+    existing = _existing(session, school_id)
+    by_key = defaultdict(list)
+    for session_id, values in existing.items():
+        by_key[(values["ncc_batch"], values["division"])].append(session_id)
+
+    unknown = [item["id"] for item in desired if item.get("id") is not None and item["id"] not in existing]
+    if unknown:
+        raise SessionNotFound(unknown)
+
+    # Items addressed by id claim their rows before natural-key matching
+    matched = {}
+    for item in desired:
+        if item.get("id") is not None:
+            matched[item["id"]] = item
+    inserts = []
+    for item in desired:
+        if item.get("id") is not None:
+            continue
+        candidates = by_key[(item["ncc_batch"], item["division"])]
+        session_id = next((c for c in candidates if c not in matched), None)
+        if session_id is None:
+            inserts.append({f: item[f] for f in SESSION_FIELDS})
+        else:
+            matched[session_id] = item
+
+    updates = [
+        {"id": session_id, **{f: item[f] for f in SESSION_FIELDS}}
+        for session_id, item in matched.items()
+        if any(existing[session_id][f] != item[f] for f in SESSION_FIELDS)
+    ]
+    deletes = [session_id for session_id in existing if session_id not in matched]
+    return _write(session, school_id, inserts, updates, deletes)
+
+
+def apply_operations(session: Session, school_id: int, add: List[dict],
+                     remove: List[int], modify: List[dict]) -> SessionChanges:
+    """
+    Apply explicit add/remove/modify operations. `modify` items carry an id
+    and only the fields to change (a null for a required field is ignored).
+    Raises SessionNotFound for unknown ids and ValueError when one id is
+    both removed and modified.
+    """
+    existing = _existing(session, school_id)
+    modified_ids = [item["id"] for item in modify]
+    unknown = [i for i in list(remove) + modified_ids if i not in existing]
+    if unknown:
+        raise SessionNotFound(unknown)
+    both = set(remove) & set(modified_ids)
+    if both:
+        raise ValueError(f"Training session(s) both removed and modified: {sorted(both)}")
+
+    updates = []
+    for item in modify:
+        current = existing[item["id"]]
+        values = {**current, **{
+            f: v for f, v in item.items()
+            if f in SESSION_FIELDS and (v is not None or f in NULLABLE_FIELDS)
+        }}
+        if values != current:
+            updates.append({"id": item["id"], **values})
+    inserts = [{f: item[f] for f in SESSION_FIELDS} for item in add]
+    return _write(session, school_id, inserts, updates, sorted(set(remove)))
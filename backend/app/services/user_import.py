@@ -0,0 +1,144 @@
+"""
+Bulk user provisioning for POST /users/bulk.
+
+Rows (JSON objects or CSV lines) are validated against UserCreate and the
+creator's district rules, then handled a chunk at a time: one IN query per
+unique column (email, username, cadet_number) finds clashes with existing
+users, the chunk's passwords are hashed across the KDF pool's workers, and
+the surviving rows are written with one multi-row INSERT.
+
+The report lists every row with its outcome. A row that repeats an email,
+username or cadet number of an earlier row in the same upload is rejected.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.dependencies.deps import Principal
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.geo import geo_index
+
+# Column -> message for a clash, in the order create_user checks them
+UNIQUE_FIELDS = {
+    "email": "Email already registered",
+    "username": "Username already taken",
+    "cadet_number": "Cadet number already registered",
+}
+CREATOR_ROLES = ("province_admin", "district_admin")
+
+
+@dataclass
+class ProvisionState:
+    """Running totals, per-row results and the unique values seen so far."""
+    dry_run: bool = False
+    total_rows: int = 0
+    created: int = 0
+    results: List[dict] = field(default_factory=list)
+    # column -> values claimed by earlier rows of this upload (emails case-folded)
+    seen: Dict[str, Set[str]] = field(default_factory=lambda: {name: set() for name in UNIQUE_FIELDS})
+
+    def accept(self, line: int, username: str, user_id: Optional[int] = None) -> None:
+        self.created += 1
+        self.results.append({
+            "row": line, "status": "valid" if self.dry_run else "created",
+            "id": user_id, "username": username, "errors": [],
+        })
+
+    def reject(self, line: int, errors: List[str], username: Optional[str] = None) -> None:
+        self.results.append({"row": line, "status": "error", "username": username, "errors": errors})
+
+    def report(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "total_rows": self.total_rows,
+            "created": self.created,
+            "failed": sum(1 for result in self.results if result["status"] == "error"),
+            "results": sorted(self.results, key=lambda result: result["row"]),
+        }
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Numbers from JSON: cadet numbers and phone numbers are text
+        return str(int(value)) if float(value).is_integer() else str(value)
+    return value
+
+
+def parse_row(row: dict, creator: Principal) -> Tuple[Optional[UserCreate], List[str]]:
+    """Validate one row and apply the creator's district rule; returns (user, []) or (None, messages)."""
+    if not isinstance(row, dict):
+        return None, ["Expected an object"]
+    values = {
+        key.strip().lower(): _clean(value)
+        for key, value in row.items() if isinstance(key, str) and key.strip()
+    }
+    try:
+        payload = UserCreate(**{k: v for k, v in values.items() if v is not None})
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+        ]
+
+    # Same rules as POST /users/create
+    payload.district = geo_index.district_name(payload.district)
+    if creator.role == "district_admin":
+        if payload.district and payload.district.lower() != creator.district.lower():
+            return None, ["district: Cannot create user outside your district"]
+        payload.district = creator.district
+    return payload, []
+
+
+def _seen_key(column: str, value: str) -> str:
+    return value.casefold() if column == "email" else value
+
+
+def existing_values(session: Session, users: Iterable[UserCreate]) -> Dict[str, Set[str]]:
+    """Values of `users` already taken in the users table: one IN query per unique column."""
+    users = list(users)
+    taken = {}
+    for column in UNIQUE_FIELDS:
+        values = {getattr(user, column) for user in users}
+        taken[column] = set(
+            session.scalars(select(getattr(User, column)).where(getattr(User, column).in_(values)))
+        ) if values else set()
+    return taken
+
+
+def screen_chunk(rows: List[Tuple[int, UserCreate]], taken: Dict[str, Set[str]],
+                 state: ProvisionState) -> List[Tuple[int, UserCreate]]:
+    """Rows of a chunk that clash with neither the table nor an earlier row of the upload."""
+    accepted = []
+    for line, user in rows:
+        errors = []
+        for column, message in UNIQUE_FIELDS.items():
+            value = getattr(user, column)
+            if value in taken[column]:
+                errors.append(f"{column}: {message}")
+            elif _seen_key(column, value) in state.seen[column]:
+                errors.append(f"{column}: Repeats an earlier row")
+        if errors:
+            state.reject(line, errors, user.username)
+            continue
+        for column in UNIQUE_FIELDS:
+            state.seen[column].add(_seen_key(column, getattr(user, column)))
+        accepted.append((line, user))
+    return accepted
+
+
+def insert_users(session: Session, rows: List[Tuple[int, UserCreate]], hashes: List[str]) -> Dict[str, int]:
+    """One multi-row INSERT for the chunk; returns username -> new id."""
+    session.execute(insert(User), [
+        {**user.model_dump(exclude={"password"}), "password_hash": password_hash}
+        for (_, user), password_hash in zip(rows, hashes)
+    ])
+    usernames = [user.username for _, user in rows]
+    return dict(session.execute(
+        select(User.username, User.id).where(User.username.in_(usernames))
+    ).tuples().all())
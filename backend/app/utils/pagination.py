@@ -0,0 +1,57 @@
+import base64
+import json
+from typing import Any, Tuple
+
+from sqlalchemy import and_, or_, select, func
+
+# Upper bound for count=estimate; beyond this the total is reported as the cap
+ESTIMATE_COUNT_CAP = 10_000
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Opaque cursor for keyset pagination over (sort_key, id)."""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid cursor")
+    return sort_value, row_id
+
+
+def keyset_filter(sort_column, id_column, sort_value, row_id, descending: bool = False):
+    """
+    WHERE clause for rows after (sort_value, row_id).
+    Written as an OR of ranges rather than a row-value comparison so MySQL
+    can use the (sort_column, id) index range.
+    """
+    if sort_column is id_column:
+        return id_column < row_id if descending else id_column > row_id
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+
+
+async def count_rows(db, query, mode: str):
+    """
+    Row count for a filtered select according to `mode`:
+    exact -> full COUNT(*), estimate -> COUNT(*) capped at ESTIMATE_COUNT_CAP,
+    none -> no count at all (returns None).
+    Returns (total, is_estimate).
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        capped = query.with_only_columns(query.selected_columns[0]).limit(ESTIMATE_COUNT_CAP + 1)
+        total = await db.scalar(select(func.count()).select_from(capped.subquery()))
+        if total > ESTIMATE_COUNT_CAP:
+            return ESTIMATE_COUNT_CAP, True
+        return total, False
+    return await db.scalar(select(func.count()).select_from(query.subquery())), False
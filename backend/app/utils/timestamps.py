@@ -0,0 +1,10 @@
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """
+    Naive UTC, the form of the DateTime columns. Timestamps the application
+    compares itself (jobs, refresh tokens, archiving) come from here rather
+    than from the database clock.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
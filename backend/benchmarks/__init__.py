@@ -0,0 +1 @@
+# benchmark scripts; run from the backend directory, e.g. python -m benchmarks.kdf
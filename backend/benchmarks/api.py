@@ -0,0 +1,307 @@
+"""
+HTTP API benchmark against a database seeded by benchmarks.seed.
+
+    DB_URL=sqlite:///bench.db python -m benchmarks.api --driver asgi --output before.json
+    DB_URL=sqlite:///bench.db python -m benchmarks.api --driver uvicorn --workers 4
+
+Drives every route mounted by app.main (health, login, /users/me, the school
+list, detail and stats, school create and update) either in-process through
+an ASGI client, which runs the app's lifespan but no network, or over HTTP
+against real uvicorn workers started for the run. Each route gets a few
+warm-up requests, then --requests requests from --concurrency clients.
+
+The JSON report has throughput, p50/p95/p99 latency, status counts and SQL
+statements per request for each route, plus the commit and data size, so
+two runs can be diffed with benchmarks.compare. Statements are counted by
+an engine event in this process, so only the asgi driver reports them.
+
+The write routes add and modify schools; reseed before runs whose results
+must be strictly comparable, or leave them out with --routes.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+
+from benchmarks.seed import BENCH_ADMIN, BENCH_DISTRICT_ADMIN, BENCH_PASSWORD
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+WARM_UP = 5
+
+
+class StatementCounter:
+    """Counts statements sent by every engine in this process (sync and async)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self)
+
+
+class Context:
+    """Tokens and ids shared by the request builders."""
+
+    def __init__(self, first_id: int, last_id: int):
+        self.first_id = first_id
+        self.span = last_id - first_id + 1
+        self.run = int(time.time())
+        self.created = itertools.count()
+        self.admin = {}
+        self.district_admin = {}
+
+    def school_id(self, n: int) -> int:
+        # Spread over the seeded ids, same sequence on every run
+        return self.first_id + (n * 7919) % self.span
+
+
+def _health(ctx, n):
+    return "GET", "/", {}
+
+
+def _login(ctx, n):
+    return "POST", "/auth/login", {"json": {"username": BENCH_ADMIN, "password": BENCH_PASSWORD}}
+
+
+def _users_me(ctx, n):
+    return "GET", "/users/me", {"headers": ctx.admin}
+
+
+def _schools_list(ctx, n):
+    return "GET", "/schools/", {"params": {"limit": 50, "skip": (n % 20) * 50}, "headers": ctx.admin}
+
+
+def _schools_list_district(ctx, n):
+    return "GET", "/schools/", {"params": {"limit": 50}, "headers": ctx.district_admin}
+
+
+def _school_detail(ctx, n):
+    return "GET", f"/schools/{ctx.school_id(n)}", {"headers": ctx.admin}
+
+
+def _school_stats(ctx, n):
+    return "GET", "/schools/stats/", {"headers": ctx.admin}
+
+
+def _school_create(ctx, n):
+    number = next(ctx.created)
+    return "POST", "/schools/", {"headers": ctx.admin, "json": {
+        "name": f"Bench School {ctx.run}-{number}",
+        "district": "Rupandehi",
+        "municipality": "Butwal",
+        "ward_number": 1 + number % 19,
+        "phone_number": "071-540000",
+        "principal_name": "Ram Sharma",
+        "principal_contact": "9857000000",
+        "training_sessions": [
+            {"ncc_batch": "Batch 2080", "start_date": "2023-04-15", "division": "junior"},
+        ],
+    }}
+
+
+def _school_update(ctx, n):
+    return "PUT", f"/schools/{ctx.school_id(n)}", {
+        "headers": ctx.admin, "json": {"notes": f"benchmark run {ctx.run} request {n}"}
+    }
+
+
+ROUTES = {
+    "health": _health,
+    "login": _login,
+    "users_me": _users_me,
+    "schools_list": _schools_list,
+    "schools_list_district": _schools_list_district,
+    "school_detail": _school_detail,
+    "school_stats": _school_stats,
+    "school_create": _school_create,
+    "school_update": _school_update,
+}
+
+
+def _percentile(values, q: float) -> float:
+    return round(values[int(q * (len(values) - 1))] * 1000, 3)
+
+
+async def _run_route(client, ctx, build, requests: int, concurrency: int, counter) -> dict:
+    for n in range(WARM_UP):
+        method, url, kwargs = build(ctx, n)
+        await client.request(method, url, **kwargs)
+
+    numbers = iter(range(WARM_UP, WARM_UP + requests))
+    latencies = []
+    statuses = {}
+
+    async def client_loop():
+        for n in numbers:
+            method, url, kwargs = build(ctx, n)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    statements = counter.count if counter else 0
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "requests_per_sec": round(requests / elapsed, 2),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "sql_per_request": round((counter.count - statements) / requests, 2) if counter else None,
+    }
+
+
+async def _token(client, username: str) -> dict:
+    response = await client.post("/auth/login", json={"username": username, "password": BENCH_PASSWORD})
+    if response.status_code != 200:
+        raise SystemExit(f"login as {username} failed ({response.status_code}); run benchmarks.seed first")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _run_all(client, ctx, routes, requests: int, concurrency: int, counter) -> dict:
+    ctx.admin = await _token(client, BENCH_ADMIN)
+    ctx.district_admin = await _token(client, BENCH_DISTRICT_ADMIN)
+    results = {}
+    for name in routes:
+        results[name] = await _run_route(client, ctx, ROUTES[name], requests, concurrency, counter)
+    return results
+
+
+async def _asgi(ctx, routes, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    from app.main import app
+
+    with StatementCounter() as counter:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                return await _run_all(client, ctx, routes, requests, concurrency, counter)
+
+
+async def _wait_until_up(client, server, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {server.returncode}")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not become ready")
+
+
+async def _uvicorn(ctx, routes, requests: int, concurrency: int, workers: int, port: int) -> dict:
+    import httpx
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await _wait_until_up(client, server)
+            return await _run_all(client, ctx, routes, requests, concurrency, None)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _data_size(session) -> dict:
+    from app.models import School, TrainingSession, User
+
+    return {
+        "schools": session.scalar(select(func.count()).select_from(School)),
+        "training_sessions": session.scalar(select(func.count()).select_from(TrainingSession)),
+        "users": session.scalar(select(func.count()).select_from(User)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--driver", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="comma-separated subset of: " + ", ".join(ROUTES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765, help="uvicorn port")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    routes = [name.strip() for name in args.routes.split(",") if name.strip()]
+    unknown = [name for name in routes if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown route(s): {', '.join(unknown)}")
+
+    from app.core.config import settings
+    from app.core.database import SessionLocal, engine
+    from app.models import School
+
+    with SessionLocal() as session:
+        first_id, last_id = session.execute(select(func.min(School.id), func.max(School.id))).one()
+        if first_id is None:
+            raise SystemExit("no schools found; run benchmarks.seed first")
+        data = _data_size(session)
+    ctx = Context(first_id, last_id)
+
+    if args.driver == "asgi":
+        results = asyncio.run(_asgi(ctx, routes, args.requests, args.concurrency))
+    else:
+        results = asyncio.run(_uvicorn(ctx, routes, args.requests, args.concurrency, args.workers, args.port))
+
+    report = {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "driver": args.driver,
+        "workers": args.workers if args.driver == "uvicorn" else 1,
+        "database": engine.dialect.name,
+        "db_mode": settings.DB_MODE,
+        "data": data,
+        "requests_per_route": args.requests,
+        "concurrency": args.concurrency,
+        "routes": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
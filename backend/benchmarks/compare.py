@@ -0,0 +1,63 @@
+"""
+Compare two benchmarks.api reports.
+
+    python -m benchmarks.compare before.json after.json
+
+Prints, per route present in both, the old and new value of each metric
+and the relative change, as JSON. Exits with status 1 when --max-regression
+is given and any route's p95 latency grew by more than that percentage.
+"""
+import argparse
+import json
+from pathlib import Path
+
+METRICS = ["requests_per_sec", "p50_ms", "p95_ms", "p99_ms", "sql_per_request", "errors"]
+
+
+def _change(old, new):
+    if old is None or new is None:
+        return None
+    if old == 0:
+        return None if new == 0 else float("inf")
+    return round((new - old) / old * 100, 1)
+
+
+def compare(before: dict, after: dict) -> dict:
+    routes = {}
+    for name, old in before["routes"].items():
+        new = after["routes"].get(name)
+        if new is None:
+            continue
+        routes[name] = {
+            metric: {"before": old.get(metric), "after": new.get(metric),
+                     "change_pct": _change(old.get(metric), new.get(metric))}
+            for metric in METRICS
+        }
+    return {
+        "before": {key: before.get(key) for key in ("commit", "driver", "database", "data")},
+        "after": {key: after.get(key) for key in ("commit", "driver", "database", "data")},
+        "routes": routes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--max-regression", type=float, help="fail if a route's p95 grew by more than this percent")
+    args = parser.parse_args()
+
+    result = compare(json.loads(Path(args.before).read_text()), json.loads(Path(args.after).read_text()))
+    print(json.dumps(result, indent=2))
+
+    if args.max_regression is not None:
+        regressed = [
+            name for name, metrics in result["routes"].items()
+            if (metrics["p95_ms"]["change_pct"] or 0) > args.max_regression
+        ]
+        if regressed:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
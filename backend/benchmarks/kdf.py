@@ -0,0 +1,76 @@
+"""
+Password-hashing micro-benchmark.
+
+    python -m benchmarks.kdf --rounds 12 --seconds 5 --workers 4
+
+Measures bcrypt hashes/sec inline on one core and through the KDFPool used
+by the login/create_user handlers, and prints both as JSON (per core too).
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+
+def _inline(seconds: float) -> int:
+    from app.core.security import hash_password
+
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        hash_password("benchmark-password")
+        done += 1
+    return done
+
+
+async def _pooled(pool, seconds: float) -> int:
+    from app.core.security import hash_password
+
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await pool.run(hash_password, "benchmark-password")
+            done += 1
+
+    # Exclude worker start-up from the measurement
+    await asyncio.gather(*(pool.run(hash_password, "warm-up") for _ in range(pool.workers)))
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(worker() for _ in range(pool.workers)))
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    args = parser.parse_args()
+
+    # Settings are read at import time; spawned pool workers inherit the environment
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from app.core.security import KDFPool
+
+    inline = _inline(args.seconds)
+    pool = KDFPool(args.workers, max_pending=args.workers, kind=args.executor)
+    try:
+        pooled = asyncio.run(_pooled(pool, args.seconds))
+    finally:
+        pool.shutdown()
+
+    print(json.dumps({
+        "rounds": args.rounds,
+        "executor": args.executor,
+        "workers": args.workers,
+        "inline_hashes_per_sec": round(inline / args.seconds, 2),
+        "pool_hashes_per_sec": round(pooled / args.seconds, 2),
+        "pool_hashes_per_sec_per_core": round(pooled / args.seconds / args.workers, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Synthetic data for the API benchmarks.
+
+    DB_URL=sqlite:///bench.db python -m benchmarks.seed --scale 100k
+
+Migrates the database at DB_URL (SQLite or a local MySQL) to the Alembic
+head, then bulk-inserts districts' worth of schools, their training
+sessions and users. --scale is the number of schools (1k, 100k, 1M);
+sessions and users scale with it. The same arguments always produce the
+same rows, so runs on different commits measure the same data.
+
+Two users are always created for benchmarks.api to log in with:
+bench_admin (admin) and bench_district (district_admin of the first
+district), both with the password BENCH_PASSWORD.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select
+
+BENCH_PASSWORD = "bench-password"
+BENCH_ADMIN = "bench_admin"
+BENCH_DISTRICT_ADMIN = "bench_district"
+
+# Lumbini Province first; --districts beyond these get numbered names
+DISTRICTS = [
+    "Rupandehi", "Kapilvastu", "Nawalparasi West", "Palpa", "Arghakhanchi", "Gulmi",
+    "Dang", "Banke", "Bardiya", "Pyuthan", "Rolpa", "Eastern Rukum",
+]
+MUNICIPALITIES = ["Butwal", "Tilottama", "Siddharthanagar", "Tansen", "Ghorahi", "Tulsipur", "Nepalgunj"]
+AREAS = ["Traffic Chowk", "Golpark", "Devinagar", "Kalikanagar", "Milanchowk", "Buddhanagar"]
+GIVEN_NAMES = ["Ram", "Sita", "Hari", "Gita", "Krishna", "Laxmi", "Bishnu", "Sarita", "Dipak", "Anita"]
+FAMILY_NAMES = ["Sharma", "Poudel", "Thapa", "Gurung", "Tharu", "Khanal", "Adhikari", "Magar", "Yadav"]
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+
+def parse_scale(value: str) -> int:
+    if value in SCALES:
+        return SCALES[value]
+    return int(value)
+
+
+def district_names(count: int):
+    return DISTRICTS[:count] + [f"District {n}" for n in range(len(DISTRICTS) + 1, count + 1)]
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(GIVEN_NAMES)} {rng.choice(FAMILY_NAMES)}"
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _schools(rng: random.Random, count: int, districts):
+    for n in range(count):
+        yield {
+            "name": f"Shree {rng.choice(FAMILY_NAMES)} Secondary School {n}",
+            "district": districts[n % len(districts)],
+            "municipality": rng.choice(MUNICIPALITIES),
+            "ward_number": rng.randint(1, 20),
+            "area_name": rng.choice(AREAS),
+            "official_email": f"school{n}@example.edu.np",
+            "phone_number": f"071-{540000 + n % 100000:06d}",
+            "principal_name": _person(rng),
+            "principal_contact": f"98{rng.randint(10000000, 99999999)}",
+            "teacher_name": _person(rng),
+            "teacher_contact": f"98{rng.randint(10000000, 99999999)}",
+            "is_active": rng.random() < 0.9,
+        }
+
+
+def _sessions(rng: random.Random, school_ids, per_school: int):
+    for school_id in school_ids:
+        for n in range(per_school):
+            start = date(2015, 4, 15) + timedelta(days=365 * n + rng.randint(0, 30))
+            yield {
+                "school_id": school_id,
+                "ncc_batch": f"Batch {2072 + n}",
+                "start_date": start,
+                "passout_date": start + timedelta(days=730),
+                "division": "junior" if n % 2 else "senior",
+            }
+
+
+def _users(rng: random.Random, count: int, districts, password_hash: str):
+    roles = ["user"] * 6 + ["committee_member", "district_admin", "province_admin", "admin"]
+    yield {
+        "cadet_number": "BENCH00001", "username": BENCH_ADMIN, "email": "bench_admin@example.com",
+        "district": districts[0], "role": "admin", "password_hash": password_hash,
+    }
+    yield {
+        "cadet_number": "BENCH00002", "username": BENCH_DISTRICT_ADMIN, "email": "bench_district@example.com",
+        "district": districts[0], "role": "district_admin", "password_hash": password_hash,
+    }
+    for n in range(count):
+        yield {
+            "cadet_number": f"NCC{n:07d}",
+            "username": f"cadet{n:07d}",
+            "email": f"cadet{n}@example.com",
+            "contact_number": f"98{rng.randint(10000000, 99999999)}",
+            "district": districts[n % len(districts)],
+            "role": rng.choice(roles),
+            "password_hash": password_hash,
+        }
+
+
+def seed(session, schools: int, sessions_per_school: int, users: int, districts: int,
+         seed_value: int = 42, chunk_size: int = 5000) -> dict:
+    """Insert the synthetic rows into an empty, migrated database; returns row counts."""
+    from app.core.security import hash_password
+    from app.models import School, TrainingSession, User
+    from app.services import stats
+
+    if session.scalar(select(func.count()).select_from(School)):
+        raise SystemExit("schools table is not empty; seed a fresh database")
+
+    rng = random.Random(seed_value)
+    names = district_names(districts)
+    # One bcrypt hash for everyone: hashing per user would dominate seeding
+    password_hash = hash_password(BENCH_PASSWORD)
+
+    for chunk in _chunks(_schools(rng, schools, names), chunk_size):
+        session.execute(insert(School), chunk)
+    school_ids = session.scalars(select(School.id).order_by(School.id)).all()
+    for chunk in _chunks(_sessions(rng, school_ids, sessions_per_school), chunk_size):
+        session.execute(insert(TrainingSession), chunk)
+    for chunk in _chunks(_users(rng, users, names, password_hash), chunk_size):
+        session.execute(insert(User), chunk)
+    stats.rebuild(session)
+    session.commit()
+
+    return {
+        "districts": len(names),
+        "schools": len(school_ids),
+        "training_sessions": len(school_ids) * sessions_per_school,
+        "users": users + 2,
+    }
+
+
+def migrate() -> None:
+    from pathlib import Path
+
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(str(Path(__file__).resolve().parents[1] / "alembic.ini")), "head")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", default="1k", help="number of schools: 1k, 100k, 1M or an integer")
+    parser.add_argument("--sessions", type=int, default=3, help="training sessions per school")
+    parser.add_argument("--users", type=int, help="users to create (default: one per 10 schools)")
+    parser.add_argument("--districts", type=int, default=len(DISTRICTS))
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal, engine
+
+    schools = parse_scale(args.scale)
+    users = args.users if args.users is not None else max(schools // 10, 10)
+
+    started = time.perf_counter()
+    migrate()
+    with SessionLocal() as session:
+        counts = seed(session, schools, args.sessions, users, args.districts, args.seed)
+
+    print(json.dumps({
+        "database": engine.url.render_as_string(hide_password=True),
+        **counts,
+        "seconds": round(time.perf_counter() - started, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
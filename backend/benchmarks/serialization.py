@@ -0,0 +1,142 @@
+"""
+List-serialization benchmark for GET /schools pages.
+
+    python -m benchmarks.serialization --schools 2000 --sessions 3 --page 100
+
+Seeds an in-memory SQLite database, then times one page two ways:
+
+* model: ORM objects with joinedload sessions, validated through
+  SchoolListResponse (from_attributes) and dumped by Pydantic, which is what
+  FastAPI does for a handler returning ORM objects with a response_model;
+* tuples: column selects + one IN query for sessions (app.services.school_rows)
+  rendered by FastJSONResponse, the path get_schools now takes.
+
+Query and serialization time are reported separately, as JSON. Both paths
+are checked to produce the same document.
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.pool import StaticPool
+
+
+def _seed(session: Session, schools: int, sessions: int) -> None:
+    from app.models.school import School, TrainingSession
+
+    session.execute(insert(School), [{
+        "name": f"Shree Benchmark Secondary School {i}",
+        "district": ("Rupandehi", "Palpa", "Kapilvastu")[i % 3],
+        "municipality": "Butwal",
+        "ward_number": i % 20 + 1,
+        "area_name": "Traffic Chowk",
+        "official_email": f"school{i}@example.com",
+        "phone_number": "071-540000",
+        "principal_name": "Ram Prasad Sharma",
+        "principal_contact": "9857000000",
+        "notes": "Seeded by benchmarks.serialization",
+        "is_active": True,
+    } for i in range(schools)])
+    ids = session.scalars(select(School.id)).all()
+    session.execute(insert(TrainingSession), [{
+        "school_id": school_id,
+        "ncc_batch": f"Batch {n}",
+        "start_date": date(2020, 1, 1) + timedelta(days=30 * n),
+        "passout_date": date(2021, 1, 1) + timedelta(days=30 * n),
+        "division": "junior" if n % 2 else "senior",
+    } for school_id in ids for n in range(sessions)])
+    session.commit()
+
+
+def _model_path(session: Session, page: int, adapter: TypeAdapter):
+    from app.models.school import School
+
+    started = time.perf_counter()
+    schools = session.execute(
+        select(School).options(joinedload(School.training_sessions))
+        .order_by(School.id).limit(page)
+    ).unique().scalars().all()
+    queried = time.perf_counter()
+    body = adapter.dump_json(adapter.validate_python(
+        {"items": schools, "total": None, "total_is_estimate": False, "next_cursor": None}
+    ))
+    session.expunge_all()
+    return queried - started, time.perf_counter() - queried, body
+
+
+def _tuple_path(session: Session, page: int):
+    from app.core.responses import FastJSONResponse
+    from app.models.school import School
+    from app.services import school_rows
+
+    started = time.perf_counter()
+    schools = school_rows.school_dicts(session.execute(
+        select(*school_rows.SCHOOL_COLUMNS).order_by(School.id).limit(page)
+    ).all())
+    school_rows.attach_sessions(session, schools)
+    queried = time.perf_counter()
+    body = FastJSONResponse(
+        {"items": schools, "total": None, "total_is_estimate": False, "next_cursor": None}
+    ).body
+    return queried - started, time.perf_counter() - queried, body
+
+
+def _summary(samples) -> dict:
+    query = sorted(s[0] for s in samples)
+    serialize = sorted(s[1] for s in samples)
+    total = sorted(s[0] + s[1] for s in samples)
+    ms = lambda values, q: round(values[int(q * (len(values) - 1))] * 1000, 3)
+    return {
+        "query_ms_p50": ms(query, 0.5),
+        "serialize_ms_p50": ms(serialize, 0.5),
+        "total_ms_p50": ms(total, 0.5),
+        "total_ms_p95": ms(total, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schools", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=3, help="training sessions per school")
+    parser.add_argument("--page", type=int, default=100, help="items per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from app import models  # noqa: F401  (registers the tables on Base)
+    from app.core.database import Base
+    from app.core.responses import orjson
+    from app.schemas.school import SchoolListResponse
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    adapter = TypeAdapter(SchoolListResponse)
+
+    with Session(engine, expire_on_commit=False) as session:
+        _seed(session, args.schools, args.sessions)
+
+        model_body = _model_path(session, args.page, adapter)[2]
+        tuple_body = _tuple_path(session, args.page)[2]
+        if json.loads(model_body) != json.loads(tuple_body):
+            raise SystemExit("model and tuple paths produced different documents")
+
+        model = [_model_path(session, args.page, adapter)[:2] for _ in range(args.iterations)]
+        tuples = [_tuple_path(session, args.page)[:2] for _ in range(args.iterations)]
+
+    print(json.dumps({
+        "schools": args.schools,
+        "sessions_per_school": args.sessions,
+        "page": args.page,
+        "iterations": args.iterations,
+        "encoder": "orjson" if orjson is not None else "json",
+        "body_bytes": len(tuple_body),
+        "model": _summary(model),
+        "tuples": _summary(tuples),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Production serving profile. From the backend directory:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+gunicorn supervises WEB_CONCURRENCY uvicorn workers (default: one per CPU,
+since each worker is an event loop). Every worker imports the app after
+the fork, so each builds its own engines and pools; the lifespan in
+app.main then resets inherited pools, sizes the threadpool, pre-warms
+DB_POOL_PREWARM connections and disposes the pools on shutdown.
+
+Size the database side for all workers together: each may open up to
+DB_POOL_SIZE + DB_MAX_OVERFLOW connections (plus the same per replica),
+and each starts KDF_WORKERS password-hashing processes. The totals are
+logged when the server is ready.
+"""
+import logging
+import multiprocessing
+import os
+
+try:
+    import uvicorn_worker  # noqa: F401  (the worker's home since uvicorn 0.30)
+    worker_class = "uvicorn_worker.UvicornWorker"
+except ImportError:
+    worker_class = "uvicorn.workers.UvicornWorker"
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+
+# Import the app in each worker, after fork, rather than once in the master
+preload_app = False
+
+# A worker silent for this long is killed and replaced
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# Time for in-flight requests and the lifespan shutdown (job requeue, pool dispose)
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then, staggered so they do not restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+# Behind a reverse proxy, trust its X-Forwarded-* headers
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def when_ready(server):
+    from app.core.config import settings
+
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    logging.getLogger("gunicorn.error").info(
+        "%d workers x %d DB connections = %d max per database (%d replica(s)); "
+        "%d KDF processes in total",
+        workers, per_worker, workers * per_worker, len(settings.DB_READ_URLS),
+        workers * settings.KDF_WORKERS if settings.KDF_EXECUTOR == "process" else 0,
+    )
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands. Run from the backend directory:
+
+    python manage.py rebuild-stats
+    python manage.py sync-geo
+    python manage.py archive-schools [--older-than-days N]
+"""
+import argparse
+
+from app.core.database import SessionLocal
+
+
+def rebuild_stats(args):
+    from app.services import stats
+
+    with SessionLocal() as session:
+        districts = stats.rebuild(session)
+        session.commit()
+    print(f"school_stats rebuilt for {districts} district(s)")
+
+
+def sync_geo(args):
+    from app.services import geo, stats
+
+    with SessionLocal() as session:
+        renamed = geo.sync_reference(session)
+        # school_stats is keyed by district name
+        districts = stats.rebuild(session)
+        session.commit()
+    print(
+        "Canonical names applied to {schools} school(s), {users} user(s), {cadets} cadet(s)".format(**renamed)
+    )
+    print(f"school_stats rebuilt for {districts} district(s)")
+
+
+def archive_schools(args):
+    from app.core.config import settings
+    from app.services import archive
+
+    before = archive.cutoff(args.older_than_days)
+    schools = sessions = 0
+    with SessionLocal() as session:
+        while True:
+            batch = archive.candidates(session, before, settings.ARCHIVE_BATCH_SIZE)
+            if not batch:
+                break
+            moved, moved_sessions = archive.archive_batch(session, batch)
+            session.commit()
+            schools += moved
+            sessions += moved_sessions
+    # Caches in running servers expire on their own (RESULT_CACHE_TTL, GEO_TREE_TTL)
+    print(f"Archived {schools} school(s) and {sessions} training session(s) inactive since before {before:%Y-%m-%d}")
+
+
+def main():
+    from app.core.config import settings
+
+
+    parser = argparse.ArgumentParser(description="NCCAA backend maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "rebuild-stats", help="Recompute the school_stats summary table from schools/training_sessions"
+    ).set_defaults(func=rebuild_stats)
+
+    commands.add_parser(
+        "sync-geo", help="Normalize district/municipality names and register the places in use"
+    ).set_defaults(func=sync_geo)
+
+    archive = commands.add_parser(
+        "archive-schools", help="Move long soft-deleted schools and their sessions to the archive tables"
+    )
+    archive.add_argument(
+        "--older-than-days", type=int, default=settings.SCHOOL_ARCHIVE_AFTER_DAYS,
+        help="Days a school must have been inactive (default: SCHOOL_ARCHIVE_AFTER_DAYS)"
+    )
+    archive.set_defaults(func=archive_schools)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
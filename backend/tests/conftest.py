@@ -0,0 +1,55 @@
+"""
+Test settings. app.core.config reads the environment at import, so it is
+set here, before any test module imports the app: two SQLite files stand
+in for the primary and a read replica, and the result cache is off so
+every read reaches a database. The primary is migrated once per session;
+each test module seeds what it needs.
+"""
+import os
+import shutil
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="nccaa-tests-")
+PRIMARY_PATH = os.path.join(DATA_DIR, "primary.db")
+REPLICA_PATH = os.path.join(DATA_DIR, "replica.db")
+
+os.environ.update({
+    "DB_URL": f"sqlite:///{PRIMARY_PATH}",
+    # Read-only, and unable to open once the file is gone: a replica that can be taken down
+    "DB_READ_URLS": f"sqlite:///file:{REPLICA_PATH}?mode=ro&uri=true",
+    "DB_MODE": os.getenv("DB_MODE", "async"),
+    "RESULT_CACHE_BACKEND": "off",
+    "READ_YOUR_WRITES_SECONDS": "5",
+    "KDF_EXECUTOR": "thread",
+})
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+from app.core.read_your_writes import recent_writers  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def primary():
+    """The primary database at the migration head."""
+    command.upgrade(Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini")), "head")
+    yield PRIMARY_PATH
+    shutil.rmtree(DATA_DIR)
+
+
+@pytest.fixture
+async def client(databases):
+    """An HTTP client for the app, with its lifespan running; modules define `databases`."""
+    recent_writers.clear()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
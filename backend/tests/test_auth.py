@@ -0,0 +1,100 @@
+"""
+Refresh-token sessions (app.routers.auth, app.services.refresh_tokens):
+rotation, reuse detection, and revocation through the session denylist.
+Every test logs in afresh, so each works on sessions of its own.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import hash_password
+
+pytestmark = pytest.mark.anyio
+
+USERNAME = "authuser"
+PASSWORD = "secret1"
+
+
+@pytest.fixture(scope="module")
+def databases(primary):
+    engine = create_engine(f"sqlite:///{primary}")
+    with Session(engine) as session:
+        session.add(models.User(
+            id=10, cadet_number="C10", username=USERNAME, email=f"{USERNAME}@example.com",
+            role="admin", district="Palpa", password_hash=hash_password(PASSWORD),
+        ))
+        session.commit()
+    engine.dispose()
+
+
+async def _login(client) -> dict:
+    response = await client.post("/auth/login", json={"username": USERNAME, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _refresh(client, refresh_token: str):
+    return await client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+async def _me(client, tokens: dict):
+    return await client.get("/users/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+
+async def test_login_issues_refresh_token(client):
+    tokens = await _login(client)
+    assert tokens["refresh_token"]
+    assert tokens["expires_in"] > 0
+    assert (await _me(client, tokens)).json()["username"] == USERNAME
+
+
+async def test_refresh_rotates_token(client):
+    tokens = await _login(client)
+    response = await _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert (await _me(client, rotated)).status_code == 200
+
+    # The successor rotates in turn
+    assert (await _refresh(client, rotated["refresh_token"])).status_code == 200
+
+
+async def test_reused_refresh_token_revokes_session(client):
+    tokens = await _login(client)
+    rotated = (await _refresh(client, tokens["refresh_token"])).json()
+    assert (await _me(client, rotated)).status_code == 200  # cached from here on
+
+    # A spent token presented again can only be a replayed copy
+    assert (await _refresh(client, tokens["refresh_token"])).status_code == 401
+    # Every token of the session is dead, the successor and the access tokens too
+    assert (await _refresh(client, rotated["refresh_token"])).status_code == 401
+    for pair in (tokens, rotated):
+        response = await _me(client, pair)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Session has been revoked"
+
+    # Other sessions of the user are untouched
+    assert (await _me(client, await _login(client))).status_code == 200
+
+
+async def test_logout_revokes_current_session(client):
+    tokens, other = await _login(client), await _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.post("/auth/logout", headers=headers)).status_code == 204
+
+    assert (await _me(client, tokens)).status_code == 401
+    assert (await _refresh(client, tokens["refresh_token"])).status_code == 401
+    assert (await _me(client, other)).status_code == 200
+
+
+async def test_logout_all_sessions(client):
+    sessions = [await _login(client) for _ in range(2)]
+    headers = {"Authorization": f"Bearer {sessions[0]['access_token']}"}
+    response = await client.post("/auth/logout", json={"all_sessions": True}, headers=headers)
+    assert response.status_code == 204
+
+    for tokens in sessions:
+        assert (await _me(client, tokens)).json()["detail"] == "Session has been revoked"
+        assert (await _refresh(client, tokens["refresh_token"])).status_code == 401
@@ -0,0 +1,114 @@
+"""
+Read routing between the primary and a replica (app.core.database,
+app.core.read_your_writes), with the two SQLite files from conftest.
+Each file holds a differently named school, so a listing shows which
+database served it.
+"""
+import os
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.database import read_replicas
+from app.core.read_your_writes import recent_writers
+from app.core.security import create_access_token
+from tests.conftest import PRIMARY_PATH, REPLICA_PATH
+
+pytestmark = pytest.mark.anyio
+
+SCHOOL = {
+    "district": "Palpa", "municipality": "Tansen", "ward_number": 1,
+    "phone_number": "075520000", "principal_name": "Principal", "principal_contact": "9800000000",
+}
+
+
+def _rename_school(path: str, name: str) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        session.execute(update(models.School).values(name=name))
+        session.commit()
+    engine.dispose()
+
+
+def _headers(user_id: int) -> dict:
+    token = create_access_token(data={"sub": str(user_id), "role": "admin", "district": "Palpa"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _school_names(client, headers) -> set:
+    response = await client.get("/schools/", headers=headers)
+    assert response.status_code == 200
+    return {school["name"] for school in response.json()["items"]}
+
+
+@pytest.fixture(scope="module")
+def databases(primary):
+    # The replica starts as a copy of the seeded primary
+    engine = create_engine(f"sqlite:///{PRIMARY_PATH}")
+    with Session(engine) as session:
+        for user_id, username in ((1, "admin1"), (2, "admin2")):
+            session.add(models.User(
+                id=user_id, cadet_number=f"C{user_id}", username=username, email=f"{username}@example.com",
+                role="admin", district="Palpa", password_hash="-",
+            ))
+        session.add(models.School(name="Primary School", **SCHOOL))
+        session.commit()
+    engine.dispose()
+    shutil.copy(PRIMARY_PATH, REPLICA_PATH)
+    _rename_school(REPLICA_PATH, "Replica School")
+
+
+def _recheck_replicas():
+    # Probe again on the next pick instead of after DB_REPLICA_CHECK_INTERVAL
+    for replica in read_replicas.replicas:
+        replica.checked_at = 0.0
+
+
+async def _dispose_replicas():
+    for replica in read_replicas.replicas:
+        result = replica.engine.dispose()
+        if result is not None:
+            await result
+
+
+async def test_reads_go_to_replica(client):
+    assert await _school_names(client, _headers(1)) == {"Replica School"}
+
+
+async def test_reads_fall_back_to_primary_when_replica_is_down(client):
+    moved = REPLICA_PATH + ".down"
+    os.rename(REPLICA_PATH, moved)
+    try:
+        # Pooled connections still hold the old file open; new ones cannot open it
+        await _dispose_replicas()
+        _recheck_replicas()
+        assert await _school_names(client, _headers(1)) == {"Primary School"}
+        replicas = (await client.get("/health/replicas")).json()["replicas"]
+        assert [replica["healthy"] for replica in replicas] == [False]
+    finally:
+        os.rename(moved, REPLICA_PATH)
+        _recheck_replicas()
+
+    assert await _school_names(client, _headers(1)) == {"Replica School"}
+
+
+async def test_reads_stay_on_primary_after_write(client):
+    writer, other = _headers(1), _headers(2)
+    response = await client.post("/schools/", json={"name": "Written School", **SCHOOL}, headers=writer)
+    assert response.status_code == 200
+    cookie = response.cookies["db_primary_until"]
+    client.cookies.clear()
+
+    # The writer reads its own write from the primary; replica lag cannot hide it
+    assert await _school_names(client, writer) == {"Primary School", "Written School"}
+    # So does a browser that comes back with the cookie to a process that did not see the write
+    recent_writers.clear()
+    client.cookies.set("db_primary_until", cookie)
+    assert await _school_names(client, writer) == {"Primary School", "Written School"}
+    client.cookies.clear()
+
+    # Other clients keep reading from the replica
+    assert await _school_names(client, other) == {"Replica School"}